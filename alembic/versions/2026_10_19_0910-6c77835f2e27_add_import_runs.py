@@ -0,0 +1,63 @@
+"""Add import runs
+
+Revision ID: 6c77835f2e27
+Revises: 7ca9877d2017
+Create Date: 2026-10-19 09:10:42.118310
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "6c77835f2e27"
+down_revision: str | None = "7ca9877d2017"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("space_key", sa.String(), nullable=False),
+        sa.Column("space_name", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("import_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("pages_discovered", sa.Boolean(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_import_runs_space_key_status", "import_runs", ["space_key", "status"], unique=False)
+
+    op.create_table(
+        "import_run_pages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("import_run_id", sa.Integer(), nullable=False),
+        sa.Column("page_id", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["import_run_id"], ["import_runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("import_run_id", "page_id"),
+    )
+    op.create_index(
+        "ix_import_run_pages_import_run_id_status",
+        "import_run_pages",
+        ["import_run_id", "status"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_import_run_pages_import_run_id_status", table_name="import_run_pages")
+    op.drop_table("import_run_pages")
+    op.drop_index("ix_import_runs_space_key_status", table_name="import_runs")
+    op.drop_table("import_runs")
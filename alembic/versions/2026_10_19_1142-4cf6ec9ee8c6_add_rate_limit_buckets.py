@@ -0,0 +1,38 @@
+"""Add rate limit buckets
+
+Revision ID: 4cf6ec9ee8c6
+Revises: 6c77835f2e27
+Create Date: 2026-10-19 11:42:17.503921
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4cf6ec9ee8c6"
+down_revision: str | None = "6c77835f2e27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rate_limit_buckets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("bucket_key", sa.String(), nullable=False),
+        sa.Column("tokens", sa.Float(), nullable=False),
+        sa.Column("refilled_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("paused_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("bucket_key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rate_limit_buckets")
@@ -0,0 +1,29 @@
+"""Add space pages check
+
+Revision ID: b3e1d5a0c7f4
+Revises: 4cf6ec9ee8c6
+Create Date: 2026-10-19 13:05:31.274618
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3e1d5a0c7f4"
+down_revision: str | None = "4cf6ec9ee8c6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("spaces", sa.Column("pages_checked_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("spaces", sa.Column("pages_count", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("spaces", "pages_count")
+    op.drop_column("spaces", "pages_checked_at")
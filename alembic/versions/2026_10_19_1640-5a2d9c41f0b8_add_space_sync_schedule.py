@@ -0,0 +1,33 @@
+"""Add space sync schedule
+
+Revision ID: 5a2d9c41f0b8
+Revises: e81f0a93d2c6
+Create Date: 2026-10-19 16:40:52.908136
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a2d9c41f0b8"
+down_revision: str | None = "e81f0a93d2c6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("spaces", sa.Column("sync_interval_minutes", sa.Integer(), nullable=True))
+    op.add_column("spaces", sa.Column("next_sync_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("spaces", sa.Column("last_sync_changed_pages", sa.Integer(), nullable=True))
+    op.add_column("spaces", sa.Column("last_sync_duration_seconds", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("spaces", "last_sync_duration_seconds")
+    op.drop_column("spaces", "last_sync_changed_pages")
+    op.drop_column("spaces", "next_sync_at")
+    op.drop_column("spaces", "sync_interval_minutes")
@@ -0,0 +1,30 @@
+"""Add page llm text
+
+Revision ID: 0c4f7d2e9a13
+Revises: 5a2d9c41f0b8
+Create Date: 2026-10-19 17:50:14.302517
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0c4f7d2e9a13"
+down_revision: str | None = "5a2d9c41f0b8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Filled when pages are imported or updated next, the text is formatted on read until then
+    op.add_column("page_data", sa.Column("llm_text", sa.String(), nullable=True))
+    op.add_column("page_data", sa.Column("llm_token_count", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("page_data", "llm_token_count")
+    op.drop_column("page_data", "llm_text")
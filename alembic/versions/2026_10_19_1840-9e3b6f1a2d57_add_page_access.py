@@ -0,0 +1,39 @@
+"""Add page access
+
+Revision ID: 9e3b6f1a2d57
+Revises: 0c4f7d2e9a13
+Create Date: 2026-10-19 18:40:37.519024
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e3b6f1a2d57"
+down_revision: str | None = "0c4f7d2e9a13"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "page_access",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("slack_user_id", sa.String(), nullable=False),
+        sa.Column("page_id", sa.String(), nullable=False),
+        sa.Column("allowed", sa.Boolean(), nullable=False),
+        sa.Column("checked_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_page_access_slack_user_id_page_id", "page_access", ["slack_user_id", "page_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_page_access_slack_user_id_page_id", table_name="page_access")
+    op.drop_table("page_access")
@@ -0,0 +1,43 @@
+"""Add assistant thread pages
+
+Revision ID: 7b2e5d9f4c61
+Revises: 4d81a6c3e2f0
+Create Date: 2026-10-19 20:10:42.517302
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2e5d9f4c61"
+down_revision: str | None = "4d81a6c3e2f0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "assistant_thread_pages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("assistant_thread_id", sa.String(), nullable=False),
+        sa.Column("page_id", sa.String(), nullable=False),
+        sa.Column("page_version", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_assistant_thread_pages_thread_id_page_id",
+        "assistant_thread_pages",
+        ["assistant_thread_id", "page_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assistant_thread_pages_thread_id_page_id", table_name="assistant_thread_pages")
+    op.drop_table("assistant_thread_pages")
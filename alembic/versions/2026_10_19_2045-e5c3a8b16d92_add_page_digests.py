@@ -0,0 +1,30 @@
+"""Add page digests
+
+Revision ID: e5c3a8b16d92
+Revises: 7b2e5d9f4c61
+Create Date: 2026-10-19 20:45:19.604127
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c3a8b16d92"
+down_revision: str | None = "7b2e5d9f4c61"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Filled by the digest stage of the import when enabled, pages without a digest are sent in full text
+    op.add_column("page_data", sa.Column("digest", sa.String(), nullable=True))
+    op.add_column("page_data", sa.Column("digest_content_hash", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("page_data", "digest_content_hash")
+    op.drop_column("page_data", "digest")
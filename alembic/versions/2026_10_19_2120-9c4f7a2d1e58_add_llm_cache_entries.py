@@ -0,0 +1,39 @@
+"""Add LLM cache entries
+
+Revision ID: 9c4f7a2d1e58
+Revises: e5c3a8b16d92
+Create Date: 2026-10-19 21:20:37.846215
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4f7a2d1e58"
+down_revision: str | None = "e5c3a8b16d92"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_cache_entries",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("value", sa.String(), nullable=False),
+        sa.Column("stored_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("key"),
+    )
+    op.create_index("ix_llm_cache_entries_stored_at", "llm_cache_entries", ["stored_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_cache_entries_stored_at", table_name="llm_cache_entries")
+    op.drop_table("llm_cache_entries")
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+import pytest
+
+import top_assist.database.jobs as db_jobs
+from top_assist.database.database import Session
+from top_assist.models import JobORM
+from top_assist.models.job import JobStatus
+
+
+@pytest.mark.usefixtures("db_session")
+def test_enqueue_deduplicates_queued_jobs() -> None:
+    first_id = db_jobs.enqueue("import_space", {"space_key": "KEY"}, dedupe_key="import_space:KEY", max_attempts=3)
+    second_id = db_jobs.enqueue("import_space", {"space_key": "KEY"}, dedupe_key="import_space:KEY", max_attempts=3)
+
+    assert first_id is not None
+    assert second_id is None
+
+
+@pytest.mark.usefixtures("db_session")
+def test_enqueue_replaces_the_queued_job_with_the_latest_one() -> None:
+    first_id = db_jobs.enqueue("refresh_page", {"page_id": "1"}, dedupe_key="page:1", max_attempts=3)
+    second_id = db_jobs.enqueue(
+        "remove_page", {"page_id": "1"}, dedupe_key="page:1", max_attempts=3, replace_queued=True
+    )
+
+    job = db_jobs.claim_next("worker")
+    assert second_id == first_id
+    assert job is not None
+    assert job.kind == "remove_page"
+    assert db_jobs.claim_next("worker") is None
+
+
+@pytest.mark.usefixtures("db_session")
+def test_claim_next_skips_jobs_with_running_dedupe_key() -> None:
+    # Given a job is running and another one with the same key is queued
+    db_jobs.enqueue("refresh_page", {"page_id": "1"}, dedupe_key="refresh_page:1", max_attempts=3)
+    running_job = db_jobs.claim_next("worker-1")
+    assert running_job is not None
+
+    db_jobs.enqueue("refresh_page", {"page_id": "1"}, dedupe_key="refresh_page:1", max_attempts=3)
+    other_job_id = db_jobs.enqueue("refresh_page", {"page_id": "2"}, dedupe_key="refresh_page:2", max_attempts=3)
+
+    # When
+    claimed_job = db_jobs.claim_next("worker-2")
+
+    # Then
+    assert claimed_job is not None
+    assert claimed_job.id == other_job_id
+    assert db_jobs.claim_next("worker-2") is None
+
+
+def test_fail_attempt_retries_until_no_attempts_left(db_session: Session) -> None:
+    db_jobs.enqueue("pull_updates", {}, dedupe_key="pull_updates:all", max_attempts=2)
+
+    job = db_jobs.claim_next("worker")
+    assert job is not None
+    db_jobs.fail_attempt(job, "error", retry_after=timedelta(0))
+    record = db_session.get(JobORM, job.id)
+    assert record is not None
+    assert record.status == JobStatus.queued.value
+
+    job = db_jobs.claim_next("worker")
+    assert job is not None
+    assert job.attempts == 2
+    db_jobs.fail_attempt(job, "error", retry_after=timedelta(0))
+    record = db_session.get(JobORM, job.id)
+    assert record is not None
+    assert record.status == JobStatus.failed.value
+
+
+def test_requeue_stale_running_jobs(db_session: Session) -> None:
+    db_jobs.enqueue("import_space", {"space_key": "KEY"}, dedupe_key="import_space:KEY", max_attempts=3)
+    job = db_jobs.claim_next("killed-worker")
+    assert job is not None
+
+    assert db_jobs.requeue_stale(timedelta(minutes=5)) == 0
+    assert db_jobs.requeue_stale(timedelta(seconds=-1)) == 1
+    record = db_session.get(JobORM, job.id)
+    assert record is not None
+    assert record.status == JobStatus.queued.value
@@ -0,0 +1,85 @@
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from top_assist.database.database import Session
+from top_assist.knowledge_base.importer import import_confluence_space
+from top_assist.models import ImportRunORM, ImportRunPageORM, PageDataORM, SpaceORM
+from top_assist.models.import_run import ImportRunPageStatus, ImportRunStatus
+from top_assist.models.page_data import PageDataDTO
+
+_SPACE_KEY = "space_key"
+_SPACE_NAME = "space_name"
+
+
+def _page(page_id: str) -> PageDataDTO:
+    return PageDataDTO(
+        page_id=page_id,
+        space_key=_SPACE_KEY,
+        title=f"title {page_id}",
+        author="author",
+        content="content",
+        comments="comments",
+        created_date=datetime.now(UTC),
+        last_updated=datetime.now(UTC),
+        content_length=len("content"),
+    )
+
+
+def retrieve_pages_side_effect(space_key: str, page_ids: list[str]) -> list:  # noqa: ARG001
+    return [_page(page_id) for page_id in page_ids]
+
+
+class EmbeddingOutageError(Exception):
+    pass
+
+
+@pytest.mark.usefixtures("db_session")
+@patch("top_assist.knowledge_base.importer.import_batch_size", 2)
+@patch("top_assist.knowledge_base.importer.db_pages.embed_many", autospec=True)
+@patch("top_assist.knowledge_base.importer.retrieve_pages", autospec=True)
+@patch("top_assist.knowledge_base.importer.get_space_page_ids", autospec=True)
+@patch("top_assist.knowledge_base.importer.get_space_page_ids_by_label", autospec=True)
+def test_import_confluence_space_resumes_remaining_work(
+    mock_get_space_page_ids_by_label: MagicMock,
+    mock_get_space_page_ids: MagicMock,
+    mock_retrieve_pages: MagicMock,
+    mock_embed_many: MagicMock,
+    db_session: Session,
+) -> None:
+    # Given the first run fails to embed the second batch
+    mock_get_space_page_ids_by_label.return_value = ["4"]
+    mock_get_space_page_ids.return_value = ["1", "2", "3", "4"]
+    mock_retrieve_pages.side_effect = retrieve_pages_side_effect
+    mock_embed_many.side_effect = [None, EmbeddingOutageError()]
+
+    with pytest.raises(EmbeddingOutageError):
+        import_confluence_space(space_key=_SPACE_KEY, space_name=_SPACE_NAME)
+
+    run = db_session.query(ImportRunORM).one()
+    assert run.status == ImportRunStatus.failed.value
+    statuses = {page.page_id: page.status for page in db_session.query(ImportRunPageORM).all()}
+    assert statuses == {
+        "1": ImportRunPageStatus.embedded.value,
+        "2": ImportRunPageStatus.embedded.value,
+        "3": ImportRunPageStatus.stored.value,
+    }
+
+    # When the import is restarted
+    mock_embed_many.side_effect = None
+    mock_retrieve_pages.reset_mock()
+    mock_get_space_page_ids.reset_mock()
+
+    import_confluence_space(space_key=_SPACE_KEY, space_name=_SPACE_NAME)
+
+    # Then only the remaining work is done
+    mock_get_space_page_ids.assert_not_called()
+    mock_retrieve_pages.assert_not_called()
+    assert [page.page_id for page in mock_embed_many.call_args.args[0]] == ["3"]
+
+    db_session.refresh(run)
+    assert run.status == ImportRunStatus.completed.value
+    assert db_session.query(PageDataORM).count() == 3
+    space = db_session.query(SpaceORM).one()
+    assert space.last_import_date == run.import_date
@@ -1,6 +1,7 @@
 from collections.abc import Callable
 
 from top_assist.confluence.policy import PageAccessPolicy
+from top_assist.semantic_router.speculation import SpeculativeRetrieval
 from top_assist.semantic_router.types import RouterState
 
 
@@ -12,6 +13,9 @@ def create_state(
     policy: PageAccessPolicy | None = None,
     assistant_thread_id: str | None = None,
     text_formatter: Callable = lambda x: x,
+    on_partial_answer: Callable | None = None,
+    question_embedding: list[float] | None = None,
+    speculative_retrieval: SpeculativeRetrieval | None = None,
 ) -> RouterState:
     return RouterState(
         prepared_question=prepared_question,
@@ -20,5 +24,8 @@ def create_state(
         policy=policy,
         assistant_thread_id=assistant_thread_id,
         text_formatter=text_formatter,
+        on_partial_answer=on_partial_answer,
+        question_embedding=question_embedding,
+        speculative_retrieval=speculative_retrieval,
         messages=messages or [],
     )
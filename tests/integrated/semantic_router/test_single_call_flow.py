@@ -0,0 +1,154 @@
+"""The single call flow prepares the same questions and chooses the same tools as the question generator
+followed by the tool choice agent, given the same answers of the model.
+
+The model answers are canned, so the flows are compared by what they send to the model: the same conversation
+and the same tools to choose from, in fewer calls. The quality of the answers of a single call is not checked.
+"""
+
+import typing
+from dataclasses import dataclass
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import BaseMessage, SystemMessage
+from pydantic import BaseModel
+
+from tests.integrated.semantic_router.factory import create_state
+from top_assist.semantic_router.nodes.question_generator import (
+    PreparedQuestion,
+    PreparedQuestionWithTool,
+    ToolName,
+    run_question_generator,
+    run_question_generator_with_tool_choice,
+)
+from top_assist.semantic_router.nodes.tool_choice_agent import run_tool_choice_agent
+from top_assist.semantic_router.tool_classifier import ToolClassification
+from top_assist.semantic_router.tools import tools
+from top_assist.semantic_router.types import HistoryEntry, RouterState
+
+_FIRST_QUESTION = [HistoryEntry(role="user", content="What is Ubuntu?")]
+_FOLLOW_UP = [
+    *_FIRST_QUESTION,
+    HistoryEntry(role="assistant", content="Ubuntu is a Linux distribution based on Debian."),
+    HistoryEntry(role="user", content="How do I install it?"),
+]
+
+
+@dataclass
+class _ModelCalls:
+    """What a flow sent to the model.
+
+    Attr:
+        count: int - The number of the model calls
+        conversations: list[list[BaseMessage]] - The messages after the system prompt of the question preparation
+        tool_names: set[str] - The tools offered to choose from, bound to the model or listed in the system prompt
+    """
+
+    count: int
+    conversations: list[list[BaseMessage]]
+    tool_names: set[str]
+
+
+class _Model:
+    """Answers the structured output and tool calls of both flows alike, recording the model calls."""
+
+    def __init__(self, question_generator_llms: list[MagicMock], tool_choice_llm: MagicMock) -> None:
+        self.question_generator_llms = question_generator_llms
+        self.tool_choice_llm = tool_choice_llm
+        self.structured_invoke = MagicMock()
+
+    def answer(self, prepared_question: str, tool_name: str | None) -> None:
+        answers = {
+            PreparedQuestion: PreparedQuestion(prepared_question=prepared_question),
+            PreparedQuestionWithTool: PreparedQuestionWithTool(
+                prepared_question=prepared_question, tool_name=tool_name
+            ),
+        }
+
+        def with_structured_output(*, method: str, schema: type[BaseModel]) -> MagicMock:  # noqa: ARG001
+            self.structured_invoke.side_effect = lambda _prompt: answers[schema]
+            return MagicMock(invoke=self.structured_invoke)
+
+        for question_generator_llm in self.question_generator_llms:
+            question_generator_llm.with_structured_output.side_effect = with_structured_output
+        self.tool_choice_llm.bind_tools.return_value = self.tool_choice_llm
+        tool_calls = [{"name": tool_name, "args": {}, "id": "call_1", "type": "tool_call"}] if tool_name else []
+        self.tool_choice_llm.invoke.return_value = MagicMock(tool_calls=tool_calls)
+
+    def take_calls(self) -> _ModelCalls:
+        """The calls since the previous take."""
+        prompts = [call.args[0].to_messages() for call in self.structured_invoke.call_args_list]
+        tool_names = {tool.name for call in self.tool_choice_llm.bind_tools.call_args_list for tool in call.args[0]}
+        for messages in prompts:
+            system_prompt = messages[0]
+            assert isinstance(system_prompt, SystemMessage)
+            tool_names.update(tool.name for tool in tools if f"- {tool.name}: " in str(system_prompt.content))
+
+        calls = _ModelCalls(
+            count=self.structured_invoke.call_count + self.tool_choice_llm.invoke.call_count,
+            conversations=[messages[1:] for messages in prompts],
+            tool_names=tool_names,
+        )
+        self.structured_invoke.reset_mock()
+        self.tool_choice_llm.bind_tools.reset_mock()
+        self.tool_choice_llm.invoke.reset_mock()
+        return calls
+
+
+@pytest.fixture()
+def model() -> typing.Generator[_Model, None, None]:
+    not_confident = ToolClassification(tool_name=None, method="embedding", confidence=0.0)
+    with (
+        patch("top_assist.semantic_router.nodes.question_generator.llm", autospec=True) as question_generator_llm,
+        patch(
+            "top_assist.semantic_router.nodes.question_generator.llm_with_tool_choice", autospec=True
+        ) as question_generator_with_tool_choice_llm,
+        patch("top_assist.semantic_router.nodes.tool_choice_agent.llm", autospec=True) as tool_choice_llm,
+        patch("top_assist.semantic_router.nodes.tool_choice_agent.classify_tool", return_value=not_confident),
+    ):
+        yield _Model([question_generator_llm, question_generator_with_tool_choice_llm], tool_choice_llm)
+
+
+def _run_two_nodes(state: RouterState) -> tuple[str | None, str | None]:
+    state = RouterState(**{**state, **run_question_generator(state)})
+    tool_call = run_tool_choice_agent(state)["tool_call"]
+    return state["prepared_question"], tool_call["name"] if tool_call else None
+
+
+def _run_single_call(state: RouterState) -> tuple[str | None, str | None]:
+    result = run_question_generator_with_tool_choice(state)
+    return result["prepared_question"], result["tool_call"]["name"] if result["tool_call"] else None
+
+
+@pytest.mark.parametrize(
+    ("history", "prepared_question", "tool_name", "saved_calls"),
+    [
+        (_FIRST_QUESTION, "What is Ubuntu?", "query_knowledge_base", 0),
+        (_FIRST_QUESTION, "What is Ubuntu?", None, 0),
+        (_FOLLOW_UP, "How do I install Ubuntu?", "query_knowledge_base", 1),
+        (_FOLLOW_UP, "How do I install Ubuntu?", "web_search", 1),
+        (_FOLLOW_UP, "How do I install Ubuntu?", None, 1),
+    ],
+)
+def test_single_call_flow_is_equivalent_to_two_nodes(
+    model: _Model, history: list[HistoryEntry], prepared_question: str, tool_name: str | None, saved_calls: int
+) -> None:
+    # Given
+    model.answer(prepared_question, tool_name)
+
+    # When
+    two_nodes_result = _run_two_nodes(create_state(history=history, prepared_question=""))
+    two_nodes_calls = model.take_calls()
+    single_call_result = _run_single_call(create_state(history=history, prepared_question=""))
+    single_call_calls = model.take_calls()
+
+    # Then
+    assert two_nodes_result == (prepared_question, tool_name)
+    assert single_call_result == two_nodes_result
+    assert single_call_calls.count == two_nodes_calls.count - saved_calls
+    assert single_call_calls.conversations == two_nodes_calls.conversations
+    assert single_call_calls.tool_names == two_nodes_calls.tool_names == {tool.name for tool in tools}
+
+
+def test_single_call_flow_chooses_only_from_the_tools() -> None:
+    assert set(typing.get_args(ToolName)) == {tool.name for tool in tools}
@@ -2,16 +2,21 @@ from unittest.mock import MagicMock, patch
 
 from tests.integrated.semantic_router.factory import create_state
 from top_assist.semantic_router.nodes.tool_choice_agent import run_tool_choice_agent
+from top_assist.semantic_router.speculation import SpeculativeRetrieval
+from top_assist.semantic_router.tool_classifier import ToolClassification
 from top_assist.semantic_router.types import HistoryEntry
 
+_NOT_CONFIDENT = ToolClassification(tool_name=None, method="embedding", confidence=0.01, question_embedding=[0.1, 0.2])
 
+
+@patch("top_assist.semantic_router.nodes.tool_choice_agent.classify_tool", new=MagicMock(return_value=_NOT_CONFIDENT))
 @patch("top_assist.semantic_router.nodes.tool_choice_agent.llm", autospec=True)
 def test_run_tool_choice_agent(mock_llm: MagicMock) -> None:
     # Given
     state = create_state(
         history=[HistoryEntry(role="user", content="Some init question.")], prepared_question="Some prepared question."
     )
-    chosen_tool = MagicMock()
+    chosen_tool = {"name": "web_search", "args": {}, "id": "call_1", "type": "tool_call"}
     llm_response = MagicMock(tool_calls=[chosen_tool])
 
     mock_llm.bind_tools.return_value = mock_llm
@@ -23,9 +28,10 @@ def test_run_tool_choice_agent(mock_llm: MagicMock) -> None:
     # Then
     assert mock_llm.bind_tools.called
     assert mock_llm.invoke.called
-    assert res == {"messages": [llm_response], "tool_call": chosen_tool}
+    assert res == {"messages": [llm_response], "tool_call": chosen_tool, "question_embedding": [0.1, 0.2]}
 
 
+@patch("top_assist.semantic_router.nodes.tool_choice_agent.classify_tool", new=MagicMock(return_value=_NOT_CONFIDENT))
 @patch("top_assist.semantic_router.nodes.tool_choice_agent.llm", autospec=True)
 def test_run_tool_choice_agent_return_none(mock_llm: MagicMock) -> None:
     # Given
@@ -44,4 +50,65 @@ def test_run_tool_choice_agent_return_none(mock_llm: MagicMock) -> None:
     # Then
     assert mock_llm.bind_tools.called
     assert mock_llm.invoke.called
-    assert res == {"messages": [llm_response], "tool_call": None}
+    assert res == {"messages": [llm_response], "tool_call": None, "question_embedding": [0.1, 0.2]}
+
+
+@patch("top_assist.semantic_router.nodes.tool_choice_agent.classify_tool", autospec=True)
+@patch("top_assist.semantic_router.nodes.tool_choice_agent.llm", autospec=True)
+def test_run_tool_choice_agent_skips_the_model_when_the_classifier_is_confident(
+    mock_llm: MagicMock, mock_classify_tool: MagicMock
+) -> None:
+    # Given
+    state = create_state(prepared_question="How do I request vacation days?")
+    mock_classify_tool.return_value = ToolClassification(
+        tool_name="query_knowledge_base", method="embedding", confidence=0.2, question_embedding=[0.1, 0.2]
+    )
+
+    # When
+    res = run_tool_choice_agent(state=state)
+
+    # Then
+    mock_llm.invoke.assert_not_called()
+    assert res["tool_call"]["name"] == "query_knowledge_base"
+    assert res["question_embedding"] == [0.1, 0.2]
+
+
+@patch(
+    "top_assist.semantic_router.nodes.tool_choice_agent.classify_tool",
+    new=MagicMock(side_effect=RuntimeError("API error")),
+)
+@patch("top_assist.semantic_router.nodes.tool_choice_agent.llm", autospec=True)
+def test_run_tool_choice_agent_asks_the_model_when_the_classifier_fails(mock_llm: MagicMock) -> None:
+    # Given
+    state = create_state(prepared_question="Some prepared question.")
+    llm_response = MagicMock(tool_calls=[{"name": "web_search", "args": {}, "id": "call_1", "type": "tool_call"}])
+    mock_llm.bind_tools.return_value = mock_llm
+    mock_llm.invoke.return_value = llm_response
+
+    # When
+    res = run_tool_choice_agent(state=state)
+
+    # Then
+    assert res["tool_call"]["name"] == "web_search"
+    assert res["question_embedding"] is None
+
+
+@patch(
+    "top_assist.semantic_router.nodes.tool_choice_agent.classify_tool",
+    new=MagicMock(side_effect=RuntimeError("API error")),
+)
+@patch("top_assist.semantic_router.nodes.tool_choice_agent.llm", autospec=True)
+def test_run_tool_choice_agent_keeps_the_speculative_embedding_when_the_classifier_fails(mock_llm: MagicMock) -> None:
+    # Given
+    speculative_retrieval = MagicMock(spec=SpeculativeRetrieval)
+    speculative_retrieval.embedding.return_value = [0.3, 0.4]
+    state = create_state(prepared_question="Some prepared question.", speculative_retrieval=speculative_retrieval)
+    mock_llm.bind_tools.return_value = mock_llm
+    mock_llm.invoke.return_value = MagicMock(tool_calls=[])
+
+    # When
+    res = run_tool_choice_agent(state=state)
+
+    # Then
+    speculative_retrieval.embedding.assert_called_once_with("Some prepared question.")
+    assert res["question_embedding"] == [0.3, 0.4]
@@ -22,7 +22,7 @@ def test_query_chatgpt(
 
     # Then
     mock_query_chatgpt_with_openai.assert_called_once_with(
-        question=state["prepared_question"], text_formatter=state["text_formatter"]
+        question=state["prepared_question"], text_formatter=state["text_formatter"], history=[]
     )
     assert isinstance(result, AIMessage)
     assert result.content == expected_answer
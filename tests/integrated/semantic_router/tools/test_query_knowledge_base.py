@@ -11,7 +11,12 @@ def test_query_knowledge_base(
     mock_query_confluence_knowledge_base: MagicMock,
 ) -> None:
     # Given
-    state = create_state(text_formatter=lambda text: text.upper())
+    first_question = {"role": "user", "content": "First question"}
+    first_answer = {"role": "assistant", "content": "First answer"}
+    state = create_state(
+        history=[first_question, first_answer, {"role": "user", "content": "Some question"}],
+        text_formatter=lambda text: text.upper(),
+    )
     expected_answer = "Knowledge base answer"
     mock_query_confluence_knowledge_base.return_value = MagicMock(
         message=expected_answer, assistant_thread_id="assistant_thread_id"
@@ -26,6 +31,10 @@ def test_query_knowledge_base(
         thread_id=state["assistant_thread_id"],
         access_policy=state["policy"],
         text_formatter=state["text_formatter"],
+        on_partial_answer=state["on_partial_answer"],
+        question_embedding=state["question_embedding"],
+        retrieved_context=None,
+        history=[first_question, first_answer],
     )
     assert isinstance(result, AIMessage)
     assert result.content == expected_answer.upper()
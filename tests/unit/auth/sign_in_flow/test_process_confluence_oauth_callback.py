@@ -120,6 +120,12 @@ def mocked_user_without_auth_record() -> Generator[None, None, None]:
         yield value
 
 
+@pytest.fixture(autouse=True)
+def mock_invalidate_page_access() -> Generator[MagicMock, None, None]:
+    with patch("top_assist.auth.sign_in_flow.invalidate_page_access", autospec=True) as mock:
+        yield mock
+
+
 @patch("top_assist.auth.sign_in_flow.db_user_auth.complete_request", autospec=True)
 @patch("top_assist.auth.sign_in_flow.delete_message", autospec=True)
 def test_process_confluence_oauth_callback_success(
@@ -128,6 +134,7 @@ def test_process_confluence_oauth_callback_success(
     mocked_user_with_sign_in_request: UserWithSignInRequest,
     mocked_confluence_email: MagicMock,  # noqa: ARG001
     mocked_slack_email: MagicMock,  # noqa: ARG001
+    mock_invalidate_page_access: MagicMock,
 ) -> None:
     # Given
     mock_complete_request.return_value = Mock(RequestCompletionResult, old_auth_message_id="old_auth_message_id")
@@ -155,6 +162,7 @@ def test_process_confluence_oauth_callback_success(
         refresh_token="fake_encrypted_refresh_token_from_oauth_code",
         expires_in=timedelta(seconds=3600),
     )
+    mock_invalidate_page_access.assert_called_once_with("U123456")
     mock_delete_message.assert_called_once_with(channel="U123456", ts="old_auth_message_id")
 
 
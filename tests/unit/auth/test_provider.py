@@ -171,11 +171,13 @@ def test_authorize_for_unathenticated_user(
     mock_start_sign_in_flow.assert_called_once_with(mocked_sign_in_context)
 
 
+@patch("top_assist.auth.provider.invalidate_page_access", autospec=True)
 @patch("top_assist.auth.provider.db_user_auth.delete_by_slack_id", autospec=True)
 @patch("top_assist.auth.provider.start_sign_in_flow", autospec=True)
 def test_authorize_for_with_authorized_user_having_invalid_token(
     mock_start_sign_in_flow: MagicMock,
     mock_delete_by_slack_id: MagicMock,
+    mock_invalidate_page_access: MagicMock,
     mocked_authenticated_user: UserAuthDTO,  # noqa: ARG001
     mocked_sign_in_context: SignInContext,
 ) -> None:
@@ -193,6 +195,7 @@ def test_authorize_for_with_authorized_user_having_invalid_token(
     assert policy.confluence_access_token == "test_access_token"
     assert exc_info.value.args == ("Invalid Auth for broken_user_id",)
     mock_delete_by_slack_id.assert_called_once_with("authenticated_user_id")
+    mock_invalidate_page_access.assert_called_once_with("authenticated_user_id")
     mock_start_sign_in_flow.assert_called_once_with(mocked_sign_in_context)
 
 
@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+from top_assist.confluence._client import ConfluenceClient, _SessionPool
+
+
+def test_service_account_session_is_reused() -> None:
+    pool = _SessionPool()
+
+    assert pool.service_account_session() is pool.service_account_session()
+
+
+@patch("top_assist.confluence._client.confluence_user_sessions_cache_size", 2)
+def test_user_sessions_are_reused_per_token_and_least_recently_used_are_dropped() -> None:
+    # Given
+    pool = _SessionPool()
+    first = pool.user_session("token-1")
+    second = pool.user_session("token-2")
+
+    # When
+    assert pool.user_session("token-1") is first
+    pool.user_session("token-3")
+
+    # Then
+    assert pool.user_session("token-1") is first
+    assert pool.user_session("token-2") is not second
+    assert first.headers["Authorization"] == "Bearer token-1"
+
+
+def test_with_access_token_shares_the_user_session() -> None:
+    first = ConfluenceClient.with_access_token("token")
+    second = ConfluenceClient.with_access_token("token")
+
+    assert first.confluence.session is second.confluence.session
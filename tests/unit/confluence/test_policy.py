@@ -0,0 +1,62 @@
+import typing
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from top_assist.confluence.policy import accessible_page_ids
+from top_assist.utils.page_access_cache import (
+    _LocalPageAccessCacheStorage,
+    configure_page_access_cache,
+    invalidate_page_access,
+)
+
+
+@pytest.fixture()
+def mock_cql_fetcher() -> typing.Generator[MagicMock, None, None]:
+    configure_page_access_cache(_LocalPageAccessCacheStorage())
+    with patch("top_assist.confluence.policy.ConfluenceClient", autospec=True) as mock_client_class:
+        yield mock_client_class.with_access_token.return_value.cql_paginated_fetcher
+
+
+def _search_results(*chunks: list[str]) -> typing.Callable[..., typing.Iterator[list[dict]]]:
+    return lambda *_args, **_kwargs: iter([[{"content": {"id": page_id}} for page_id in chunk] for chunk in chunks])
+
+
+def test_only_pages_missing_in_cache_are_checked_in_confluence(mock_cql_fetcher: MagicMock) -> None:
+    # Given
+    mock_cql_fetcher.side_effect = _search_results(["1"])
+    accessible_page_ids(["1", "2"], slack_user_id="U1", user_confluence_access_token="token")
+    mock_cql_fetcher.reset_mock()
+    mock_cql_fetcher.side_effect = _search_results(["3"])
+
+    # When
+    allowed = accessible_page_ids(["1", "2", "3"], slack_user_id="U1", user_confluence_access_token="token")
+
+    # Then both allowed and denied pages are served from the cache
+    assert allowed == {"1", "3"}
+    mock_cql_fetcher.assert_called_once_with("id in (3)", limit=1)
+
+
+def test_pages_from_all_result_chunks_are_allowed(mock_cql_fetcher: MagicMock) -> None:
+    # Given
+    mock_cql_fetcher.side_effect = _search_results(["1", "2"], ["3"])
+
+    # When
+    allowed = accessible_page_ids(["1", "2", "3", "4"], slack_user_id="U1", user_confluence_access_token="token")
+
+    # Then
+    assert allowed == {"1", "2", "3"}
+    mock_cql_fetcher.assert_called_once_with("id in (1,2,3,4)", limit=4)
+
+
+def test_invalidated_user_access_is_checked_again(mock_cql_fetcher: MagicMock) -> None:
+    # Given
+    mock_cql_fetcher.side_effect = _search_results(["1"])
+    accessible_page_ids(["1"], slack_user_id="U1", user_confluence_access_token="token")
+
+    # When
+    invalidate_page_access("U1")
+    accessible_page_ids(["1"], slack_user_id="U1", user_confluence_access_token="token")
+
+    # Then
+    assert mock_cql_fetcher.call_count == 2
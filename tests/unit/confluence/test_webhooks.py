@@ -0,0 +1,65 @@
+import hashlib
+import hmac
+import json
+from unittest.mock import patch
+
+from top_assist.confluence.webhooks import (
+    WebhookAction,
+    WebhookEvent,
+    _RecentEvents,
+    is_valid_signature,
+)
+
+_SECRET = "webhook-secret"
+
+
+def _event(event: str, **payload: object) -> WebhookEvent:
+    return WebhookEvent.model_validate_json(json.dumps({"webhookEvent": event, "timestamp": 1700000000000, **payload}))
+
+
+@patch("top_assist.confluence.webhooks.confluence_webhook_secret", _SECRET)
+def test_is_valid_signature() -> None:
+    body = b'{"webhookEvent": "page_updated"}'
+    signature = hmac.new(_SECRET.encode(), body, hashlib.sha256).hexdigest()
+
+    assert is_valid_signature(body, f"sha256={signature}")
+    assert not is_valid_signature(body + b" ", f"sha256={signature}")
+    assert not is_valid_signature(body, None)
+
+
+def test_webhook_event_action() -> None:
+    page = {"id": 123, "spaceKey": "SPACE", "version": 2}
+
+    updated = _event("page_updated", page=page)
+    assert updated.action == WebhookAction.refresh_page
+    assert updated.page is not None
+    assert updated.page.id == "123"
+    assert updated.dedupe_key == "page_updated:123:2"
+
+    assert _event("page_trashed", page=page).action == WebhookAction.remove_page
+    assert _event("space_archived", space={"key": "SPACE"}).action == WebhookAction.remove_space
+    assert _event("blog_created", page=page).action is None
+
+
+def test_label_event_action() -> None:
+    labeled_page = {"id": 123, "spaceKey": "SPACE", "contentType": "page"}
+    labeled_blog_post = {"id": 456, "spaceKey": "SPACE", "contentType": "blogpost"}
+
+    label_added = _event("label_added", label={"name": "ignore"}, labeled=labeled_page)
+    assert label_added.action == WebhookAction.refresh_page
+    assert label_added.page is not None
+    assert label_added.page.id == "123"
+
+    assert _event("label_removed", labeled=labeled_page).action == WebhookAction.refresh_page
+    assert _event("label_added", labeled=labeled_blog_post).action is None
+
+
+def test_recent_events_are_seen_once_added_until_they_expire() -> None:
+    recent_events = _RecentEvents(ttl_seconds=60, max_size=10)
+
+    with patch("top_assist.confluence.webhooks.time.monotonic", side_effect=[0, 10, 20, 30, 81]):
+        assert not recent_events.seen("key")
+        assert not recent_events.seen("key")
+        recent_events.add("key")
+        assert recent_events.seen("key")
+        assert not recent_events.seen("key")
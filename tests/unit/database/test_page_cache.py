@@ -0,0 +1,57 @@
+import zlib
+from datetime import timedelta
+
+from tests.unit.knowledge_base.factory import create_page_dto
+from top_assist.database._page_cache import _PageCache
+
+
+def test_page_cache_misses_updated_pages() -> None:
+    # Given
+    cache = _PageCache(max_bytes=1024 * 1024)
+    page = create_page_dto()
+    cache.put(page, (page.last_updated, None))
+
+    # When / Then
+    assert cache.get(page.page_id, (page.last_updated, None)) == page
+    assert cache.get(page.page_id, (page.last_updated + timedelta(minutes=1), None)) is None
+
+
+def test_page_cache_misses_pages_digested_since_cached() -> None:
+    # Given
+    cache = _PageCache(max_bytes=1024 * 1024)
+    page = create_page_dto()
+    cache.put(page, (page.last_updated, None))
+
+    # When / Then
+    assert cache.get(page.page_id, (page.last_updated, page.content_hash())) is None
+
+
+def test_page_cache_evicts_least_recently_used_pages_over_the_size_limit() -> None:
+    # Given the cache fits two pages
+    page1, page2, page3 = create_page_dto(), create_page_dto(), create_page_dto()
+    page_size = len(zlib.compress(page1.model_dump_json().encode()))
+    cache = _PageCache(max_bytes=page_size * 2 + page_size // 2)
+    cache.put(page1, (page1.last_updated, None))
+    cache.put(page2, (page2.last_updated, None))
+
+    # When page1 is used again before page3 is added
+    cache.get(page1.page_id, (page1.last_updated, None))
+    cache.put(page3, (page3.last_updated, None))
+
+    # Then
+    assert cache.get(page1.page_id, (page1.last_updated, None)) == page1
+    assert cache.get(page2.page_id, (page2.last_updated, None)) is None
+    assert cache.get(page3.page_id, (page3.last_updated, None)) == page3
+
+
+def test_page_cache_invalidate() -> None:
+    # Given
+    cache = _PageCache(max_bytes=1024 * 1024)
+    page = create_page_dto()
+    cache.put(page, (page.last_updated, None))
+
+    # When
+    cache.invalidate([page.page_id])
+
+    # Then
+    assert cache.get(page.page_id, (page.last_updated, None)) is None
@@ -0,0 +1,18 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from top_assist.database._vector.engine import CollectionDoesNotExistError, retrieve_neighbour_ids_by_embedding
+
+
+@patch(
+    "top_assist.database._vector.engine._retrieve_neighbour_ids",
+    new=MagicMock(side_effect=CollectionDoesNotExistError("answers")),
+)
+def test_missing_collection_has_no_neighbours_when_allowed() -> None:
+    assert (
+        retrieve_neighbour_ids_by_embedding([0.1], collection_name="answers", count=1, missing_collection_ok=True) == []
+    )
+
+    with pytest.raises(CollectionDoesNotExistError):
+        retrieve_neighbour_ids_by_embedding([0.1], collection_name="answers", count=1)
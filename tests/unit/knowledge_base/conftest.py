@@ -0,0 +1,29 @@
+import re
+import typing
+from unittest.mock import patch
+
+import pytest
+
+
+def _count_words(text: str) -> int:
+    return len(text.split())
+
+
+def _truncate_to_words(text: str, max_words: int) -> str:
+    word_ends = [match.end() for match in re.finditer(r"\S+", text)]
+    if len(word_ends) <= max_words:
+        return text
+
+    return text[: word_ends[max_words - 1]] if max_words > 0 else ""
+
+
+@pytest.fixture(autouse=True)
+def _word_tokenizer() -> typing.Generator:
+    """Counts words instead of tokens, the model tokenizer downloads its encoding on first use."""
+    with (
+        patch("top_assist.models.page_data.count_tokens", _count_words),
+        patch("top_assist.knowledge_base.context.count_tokens", _count_words),
+        patch("top_assist.knowledge_base.context.truncate_to_tokens", _truncate_to_words),
+        patch("top_assist.knowledge_base.digests.truncate_to_tokens", _truncate_to_words),
+    ):
+        yield
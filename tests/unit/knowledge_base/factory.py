@@ -16,6 +16,7 @@ def create_page_dto(
     space_key: str | None = None,
     created_date: datetime | None = None,
     last_updated: datetime | None = None,
+    digest: str | None = None,
 ) -> PageDataDTO:
     sequence_id = next(page_id_counter)
     now = datetime.now(UTC)
@@ -30,4 +31,5 @@ def create_page_dto(
         content_length=len(content or f"content{sequence_id}"),
         created_date=created_date or now,
         last_updated=last_updated or now,
+        digest=digest,
     )
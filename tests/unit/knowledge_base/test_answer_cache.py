@@ -0,0 +1,124 @@
+import typing
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, create_autospec, patch
+
+import pytest
+
+from tests.unit.knowledge_base.factory import create_page_dto
+from top_assist.confluence.policy import InvalidAuthError, PageAccessPolicy
+from top_assist.knowledge_base.answer_cache import ReusableAnswer, find_reusable_answer
+from top_assist.models.cached_answer import CachedAnswerDTO
+from top_assist.models.page_data import PageDataDTO
+
+_EMBEDDING = [0.1, 0.2]
+
+
+@pytest.fixture()
+def page() -> PageDataDTO:
+    return create_page_dto()
+
+
+@pytest.fixture()
+def answer(page: PageDataDTO) -> CachedAnswerDTO:
+    return CachedAnswerDTO(
+        id=1,
+        question="How do I request VPN access?",
+        response='{"summary": "Ask IT."}',
+        page_versions={page.page_id: page.last_updated.isoformat()},
+        answer_seconds=20,
+        created_at=datetime.now(UTC),
+    )
+
+
+@pytest.fixture()
+def access_policy() -> MagicMock:
+    return create_autospec(PageAccessPolicy, instance=True)
+
+
+@pytest.fixture()
+def mock_db_answers() -> typing.Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.answer_cache.db_answers", autospec=True) as mock:
+        yield mock
+
+
+@pytest.fixture()
+def mock_find_many_by_ids() -> typing.Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.answer_cache.db_pages.find_many_by_ids", autospec=True) as mock:
+        yield mock
+
+
+def test_answer_is_reused_when_pages_are_unchanged_and_accessible(
+    mock_db_answers: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+    access_policy: MagicMock,
+    answer: CachedAnswerDTO,
+    page: PageDataDTO,
+) -> None:
+    # Given
+    mock_db_answers.find_similar.return_value = answer
+    mock_find_many_by_ids.return_value = [page]
+    access_policy.accessible_pages.return_value = {page.page_id}
+
+    # When
+    reusable = find_reusable_answer(_EMBEDDING, access_policy)
+
+    # Then
+    assert reusable == ReusableAnswer(answer=answer, pages=[page])
+    mock_db_answers.delete.assert_not_called()
+
+
+def test_answer_is_deleted_when_a_page_changed(
+    mock_db_answers: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+    access_policy: MagicMock,
+    answer: CachedAnswerDTO,
+    page: PageDataDTO,
+) -> None:
+    # Given
+    mock_db_answers.find_similar.return_value = answer
+    mock_find_many_by_ids.return_value = [page.model_copy(update={"last_updated": page.last_updated + timedelta(1)})]
+
+    # When
+    reusable = find_reusable_answer(_EMBEDDING, access_policy)
+
+    # Then
+    assert reusable is None
+    mock_db_answers.delete.assert_called_once_with(answer)
+    access_policy.accessible_pages.assert_not_called()
+
+
+def test_answer_is_not_reused_when_a_page_is_not_accessible(
+    mock_db_answers: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+    access_policy: MagicMock,
+    answer: CachedAnswerDTO,
+    page: PageDataDTO,
+) -> None:
+    # Given
+    mock_db_answers.find_similar.return_value = answer
+    mock_find_many_by_ids.return_value = [page]
+    access_policy.accessible_pages.return_value = set()
+
+    # When
+    reusable = find_reusable_answer(_EMBEDDING, access_policy)
+
+    # Then the answer stays cached for other users
+    assert reusable is None
+    mock_db_answers.delete.assert_not_called()
+
+
+def test_invalid_auth_is_not_treated_as_a_miss(
+    mock_db_answers: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+    access_policy: MagicMock,
+    answer: CachedAnswerDTO,
+    page: PageDataDTO,
+) -> None:
+    # Given
+    mock_db_answers.find_similar.return_value = answer
+    mock_find_many_by_ids.return_value = [page]
+    access_policy.accessible_pages.side_effect = InvalidAuthError("U1")
+
+    # When / Then
+    with pytest.raises(InvalidAuthError):
+        find_reusable_answer(_EMBEDDING, access_policy)
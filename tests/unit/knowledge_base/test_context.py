@@ -0,0 +1,87 @@
+from unittest.mock import patch
+
+from tests.unit.knowledge_base.factory import create_page_dto
+from top_assist.knowledge_base.context import pack_pages_context
+
+
+def test_pages_within_budget_are_packed_whole() -> None:
+    # Given
+    page1 = create_page_dto(title="One", content="Short page.")
+    page2 = create_page_dto(title="Two", content="Another short page.")
+
+    # When
+    context = pack_pages_context([page1, page2], token_budget=1000)
+
+    # Then
+    assert context.text == (
+        f"Document Title: One\nSpace Key: {page1.space_key}\n\n{page1.format_for_llm()}\n"
+        f"Document Title: Two\nSpace Key: {page2.space_key}\n\n{page2.format_for_llm()}"
+    )
+    assert context.token_count == 6 + page1.token_count() + 6 + page2.token_count()
+
+
+def test_long_page_gets_the_budget_left_by_short_pages() -> None:
+    # Given
+    short_page = create_page_dto(title="Short", content="Short page.")
+    long_page = create_page_dto(title="Long", content=" ".join(["This is a sentence."] * 100))
+
+    # When
+    context = pack_pages_context([long_page, short_page], token_budget=200)
+
+    # Then the short page is whole and the long page is truncated at a sentence end
+    assert short_page.format_for_llm() in context.text
+    long_section = context.text.split("\nDocument Title: Short")[0]
+    assert long_section.endswith("This is a sentence. [Content truncated due to size limit.]")
+    assert context.token_count <= 200
+    assert context.full_text_page_ids == [short_page.page_id]
+
+
+def _count_words_and_line_breaks(text: str) -> int:
+    return len(text.split()) + text.count("\n")
+
+
+@patch("top_assist.models.page_data.count_tokens", new=_count_words_and_line_breaks)
+@patch("top_assist.knowledge_base.context.count_tokens", new=_count_words_and_line_breaks)
+def test_section_separators_count_against_the_budget() -> None:
+    # Given
+    pages = [create_page_dto(content="Short page.") for _ in range(3)]
+
+    # When
+    context = pack_pages_context(pages, token_budget=1000)
+    exact_context = pack_pages_context(pages, token_budget=context.token_count)
+
+    # Then
+    assert context.token_count == _count_words_and_line_breaks(context.text)
+    assert exact_context.text == context.text
+
+
+def test_page_is_left_out_when_its_share_is_too_small() -> None:
+    # Given
+    pages = [create_page_dto(content=" ".join(["Word."] * 500)) for _ in range(3)]
+
+    # When
+    context = pack_pages_context(pages, token_budget=90)
+
+    # Then
+    assert context.text == ""
+    assert context.token_count == 0
+
+
+def test_less_relevant_pages_are_packed_as_digests() -> None:
+    # Given
+    top_page = create_page_dto(title="Top", content="Top page.", digest="Top digest.")
+    digested_page = create_page_dto(title="Next", content=" ".join(["Long page."] * 100), digest="Next digest.")
+    undigested_page = create_page_dto(title="Last", content="Last page.")
+
+    # When
+    context = pack_pages_context([top_page, digested_page, undigested_page], token_budget=1000, full_text_pages=1)
+
+    # Then
+    assert top_page.format_for_llm() in context.text
+    assert "Long page." not in context.text
+    digest_text = digested_page.format_digest_for_llm()
+    assert digest_text is not None
+    assert digest_text in context.text
+    assert undigested_page.format_for_llm() in context.text
+    assert context.full_text_page_ids == [top_page.page_id, undigested_page.page_id]
+    assert context.token_count < 100
@@ -0,0 +1,53 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from tests.unit.knowledge_base.factory import create_page_dto
+from top_assist.knowledge_base.digests import generate_digests
+
+
+@patch("top_assist.knowledge_base.digests.openai_client", autospec=True)
+@patch("top_assist.database.pages.store_digest", autospec=True)
+@patch("top_assist.database.pages.find_digest_hashes", autospec=True)
+def test_generate_digests_skips_pages_with_a_digest_of_their_content(
+    mock_find_digest_hashes: MagicMock, mock_store_digest: MagicMock, mock_openai_client: MagicMock
+) -> None:
+    # Given
+    unchanged_page = create_page_dto(content="Unchanged page.")
+    changed_page = create_page_dto(content="Changed page.")
+    new_page = create_page_dto(content="New page.")
+    mock_find_digest_hashes.return_value = {
+        unchanged_page.page_id: unchanged_page.content_hash(),
+        changed_page.page_id: "outdated",
+        new_page.page_id: None,
+    }
+    response = {"digest": "A page.", "sections": [{"heading": "Intro", "summary": "Introduces the page."}]}
+    mock_create = mock_openai_client.return_value.chat.completions.create
+    mock_create.return_value = MagicMock(choices=[MagicMock(message=MagicMock(content=json.dumps(response)))])
+
+    # When
+    generated_count = generate_digests([unchanged_page, changed_page, new_page])
+
+    # Then
+    assert generated_count == 2
+    assert mock_create.call_count == 2
+    assert [call.args[0] for call in mock_store_digest.call_args_list] == [changed_page, new_page]
+    assert mock_store_digest.call_args.args[1] == "A page.\nSections:\n- Intro: Introduces the page."
+
+
+@patch("top_assist.knowledge_base.digests.openai_client", autospec=True)
+@patch("top_assist.database.pages.store_digest", autospec=True)
+@patch("top_assist.database.pages.find_digest_hashes", autospec=True)
+def test_generate_digests_leaves_page_without_digest_when_generation_fails(
+    mock_find_digest_hashes: MagicMock, mock_store_digest: MagicMock, mock_openai_client: MagicMock
+) -> None:
+    # Given
+    page = create_page_dto()
+    mock_find_digest_hashes.return_value = {}
+    mock_openai_client.return_value.chat.completions.create.side_effect = RuntimeError("API error")
+
+    # When
+    generated_count = generate_digests([page])
+
+    # Then
+    assert generated_count == 0
+    mock_store_digest.assert_not_called()
@@ -0,0 +1,176 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, call, patch
+
+from tests.unit.knowledge_base.factory import create_page_dto
+from top_assist.confluence.retriever import InaccessiblePage
+from top_assist.knowledge_base.importer import pull_updates, update_space
+from top_assist.models.space import SpaceDTO
+
+
+def _space(space_id: int, key: str, last_import_date: datetime | None) -> SpaceDTO:
+    return SpaceDTO(id=space_id, key=key, name=f"{key} name", last_import_date=last_import_date)
+
+
+@patch("top_assist.knowledge_base.importer.sync_spaces_workers_num", 1)
+@patch("top_assist.knowledge_base.importer.__schedule_next_sync", autospec=True)
+@patch("top_assist.knowledge_base.importer.sentry_notify_exception", autospec=True)
+@patch("top_assist.knowledge_base.importer.update_space", autospec=True)
+@patch("top_assist.knowledge_base.importer.__remove_non_relevant_pages", autospec=True)
+@patch("top_assist.knowledge_base.importer.retrieve_space_list", autospec=True, return_value=[])
+@patch("top_assist.knowledge_base.importer.db_spaces.all_spaces", autospec=True)
+def test_pull_updates_processes_stalest_spaces_first_and_isolates_failures(
+    mock_all_spaces: MagicMock,
+    mock_retrieve_space_list: MagicMock,
+    mock_remove_non_relevant_pages: MagicMock,
+    mock_update_space: MagicMock,
+    mock_sentry_notify_exception: MagicMock,
+    mock_schedule_next_sync: MagicMock,
+) -> None:
+    # Given
+    now = datetime.now(UTC)
+    fresh = _space(1, "FRESH", now - timedelta(hours=1))
+    stale = _space(2, "STALE", now - timedelta(days=3))
+    broken = _space(3, "BROKEN", now - timedelta(days=2))
+    mock_all_spaces.return_value = [fresh, stale, broken]
+
+    error = RuntimeError("Confluence is down")
+
+    def remove_non_relevant_pages_side_effect(space: SpaceDTO) -> None:
+        if space == broken:
+            raise error
+
+    mock_remove_non_relevant_pages.side_effect = remove_non_relevant_pages_side_effect
+
+    # When
+    pull_updates()
+
+    # Then
+    mock_retrieve_space_list.assert_called_once_with(status="archived")
+    assert mock_remove_non_relevant_pages.call_args_list == [call(stale), call(broken), call(fresh)]
+    assert mock_update_space.call_args_list == [call(stale), call(fresh)]
+    mock_sentry_notify_exception.assert_called_once_with(error, extra={"space_key": "BROKEN"})
+    assert [c.args[0] for c in mock_schedule_next_sync.call_args_list] == [stale, fresh]
+
+
+@patch("top_assist.knowledge_base.importer.sync_spaces_workers_num", 1)
+@patch("top_assist.knowledge_base.importer.space_pages_full_diff_interval_minutes", 60)
+@patch("top_assist.knowledge_base.importer.__schedule_next_sync", autospec=True)
+@patch("top_assist.knowledge_base.importer.update_space", autospec=True, return_value=0)
+@patch("top_assist.knowledge_base.importer.db_spaces.mark_pages_checked", autospec=True)
+@patch("top_assist.knowledge_base.importer.db_pages.delete_by_page_ids", autospec=True)
+@patch("top_assist.knowledge_base.importer.db_pages.all_ids_by_space", autospec=True, return_value=["1", "2"])
+@patch("top_assist.knowledge_base.importer.get_space_page_ids", autospec=True, return_value=["1"])
+@patch("top_assist.knowledge_base.importer.get_space_page_ids_by_label", autospec=True, return_value=[])
+@patch("top_assist.knowledge_base.importer.count_space_pages", autospec=True)
+@patch("top_assist.knowledge_base.importer.retrieve_space_list", autospec=True, return_value=[])
+@patch("top_assist.knowledge_base.importer.db_spaces.all_spaces", autospec=True)
+def test_pull_updates_lists_all_page_ids_only_when_the_space_changed(
+    mock_all_spaces: MagicMock,
+    mock_retrieve_space_list: MagicMock,
+    mock_count_space_pages: MagicMock,
+    mock_get_space_page_ids_by_label: MagicMock,
+    mock_get_space_page_ids: MagicMock,
+    mock_all_ids_by_space: MagicMock,
+    mock_delete_by_page_ids: MagicMock,
+    mock_mark_pages_checked: MagicMock,
+    mock_update_space: MagicMock,
+    mock_schedule_next_sync: MagicMock,
+) -> None:
+    # Given
+    now = datetime.now(UTC)
+    unchanged = _space(1, "UNCHANGED", now).model_copy(update={"pages_checked_at": now, "pages_count": 1})
+    changed = _space(2, "CHANGED", now).model_copy(update={"pages_checked_at": now, "pages_count": 2})
+    mock_all_spaces.return_value = [unchanged, changed]
+    mock_count_space_pages.side_effect = lambda space_key: {"UNCHANGED": 1, "CHANGED": 1}[space_key]
+
+    # When
+    pull_updates()
+
+    # Then
+    mock_get_space_page_ids.assert_called_once_with("CHANGED", status="current")
+    mock_delete_by_page_ids.assert_called_once_with(["2"])
+    mock_mark_pages_checked.assert_called_once()
+    assert mock_mark_pages_checked.call_args.args == (changed,)
+    assert mock_mark_pages_checked.call_args.kwargs["pages_count"] == 1
+    mock_retrieve_space_list.assert_called_once_with(status="archived")
+    mock_get_space_page_ids_by_label.assert_called_once()
+    assert mock_get_space_page_ids_by_label.call_args.args[0] == "CHANGED"
+    mock_all_ids_by_space.assert_called_once_with(changed)
+    assert mock_update_space.call_count == 2
+    assert mock_schedule_next_sync.call_count == 2
+
+
+@patch("top_assist.knowledge_base.importer.sync_spaces_workers_num", 1)
+@patch("top_assist.knowledge_base.importer.space_sync_min_interval_minutes", 15)
+@patch("top_assist.knowledge_base.importer.space_sync_max_interval_minutes", 120)
+@patch("top_assist.knowledge_base.importer.db_spaces.record_sync", autospec=True)
+@patch("top_assist.knowledge_base.importer.update_space", autospec=True)
+@patch("top_assist.knowledge_base.importer.__remove_non_relevant_pages", autospec=True, return_value=0)
+@patch("top_assist.knowledge_base.importer.retrieve_space_list", autospec=True, return_value=[])
+@patch("top_assist.knowledge_base.importer.db_spaces.all_spaces", autospec=True)
+def test_pull_updates_adapts_sync_interval_to_changes(
+    mock_all_spaces: MagicMock,
+    mock_retrieve_space_list: MagicMock,
+    mock_remove_non_relevant_pages: MagicMock,
+    mock_update_space: MagicMock,
+    mock_record_sync: MagicMock,
+) -> None:
+    # Given
+    now = datetime.now(UTC)
+    busy = _space(1, "BUSY", now).model_copy(update={"sync_interval_minutes": 60, "next_sync_at": now})
+    dormant = _space(2, "DORMANT", now).model_copy(update={"sync_interval_minutes": 100})
+    not_due = _space(3, "NOT_DUE", now).model_copy(update={"next_sync_at": now + timedelta(hours=1)})
+    mock_all_spaces.return_value = [busy, dormant, not_due]
+    mock_update_space.side_effect = lambda space: {"BUSY": 3, "DORMANT": 0}[space.key]
+
+    # When
+    pull_updates()
+
+    # Then
+    mock_retrieve_space_list.assert_called_once_with(status="archived")
+    assert mock_remove_non_relevant_pages.call_count == 2
+    intervals = {c.args[0].key: c.kwargs["sync_interval_minutes"] for c in mock_record_sync.call_args_list}
+    assert intervals == {"BUSY": 30, "DORMANT": 120}
+    busy_call = next(c for c in mock_record_sync.call_args_list if c.args[0].key == "BUSY")
+    assert busy_call.kwargs["changed_pages"] == 3
+
+
+@patch("top_assist.knowledge_base.importer.page_digests_enabled", new=False)
+@patch("top_assist.knowledge_base.importer.db_spaces.mark_imported", autospec=True)
+@patch("top_assist.knowledge_base.importer.db_pages.delete_by_page_ids", autospec=True)
+@patch("top_assist.knowledge_base.importer.db_pages.upsert_many", autospec=True)
+@patch("top_assist.knowledge_base.importer.db_pages.find_last_updated", autospec=True)
+@patch("top_assist.knowledge_base.importer.retrieve_space_with_date", autospec=True)
+def test_update_space_counts_only_pages_changed_since_stored(
+    mock_retrieve_space_with_date: MagicMock,
+    mock_find_last_updated: MagicMock,
+    mock_upsert_many: MagicMock,
+    mock_delete_by_page_ids: MagicMock,
+    mock_mark_imported: MagicMock,  # noqa: ARG001
+) -> None:
+    # Given pages pulled again because of the overlap with the last import, and pages changed since then
+    now = datetime.now(UTC)
+    space = _space(1, "KEY", now)
+    unchanged = create_page_dto(page_id="1", last_updated=now - timedelta(minutes=5))
+    updated = create_page_dto(page_id="2", last_updated=now)
+    new = create_page_dto(page_id="3", last_updated=now)
+    mock_retrieve_space_with_date.return_value = [
+        unchanged,
+        updated,
+        new,
+        InaccessiblePage(space_key="KEY", page_id="4"),
+        InaccessiblePage(space_key="KEY", page_id="5"),
+    ]
+    mock_find_last_updated.return_value = {
+        "1": unchanged.last_updated,
+        "2": now - timedelta(minutes=5),
+        "4": now - timedelta(minutes=5),
+    }
+
+    # When
+    changed_pages = update_space(space)
+
+    # Then
+    assert changed_pages == 3
+    mock_upsert_many.assert_called_once_with(space, [unchanged, updated, new])
+    mock_delete_by_page_ids.assert_called_once_with(["4", "5"])
@@ -1,15 +1,83 @@
 import json
+from collections.abc import Callable, Generator
+from typing import TYPE_CHECKING
 from unittest.mock import MagicMock, create_autospec, patch
 
 import pytest
 
 from tests.unit.knowledge_base.factory import create_page_dto
-from top_assist.configuration import confluence_base_url, qa_assistant_id, question_context_pages_count
+from top_assist.configuration import (
+    confluence_base_url,
+    qa_assistant_id,
+    question_context_overfetch_factor,
+    question_context_pages_count,
+)
 from top_assist.confluence.policy import PageAccessPolicy
-from top_assist.knowledge_base.query import FAILED_TO_ANSWER_MSG, KnowledgeBaseAnswer, query_knowledge_base
+from top_assist.knowledge_base.answer_cache import ReusableAnswer
+from top_assist.knowledge_base.query import (
+    FAILED_TO_ANSWER_MSG,
+    KnowledgeBaseAnswer,
+    RetrievedContext,
+    query_knowledge_base,
+)
+from top_assist.models.cached_answer import CachedAnswerDTO
 from top_assist.models.page_data import PageDataDTO
 from top_assist.open_ai.assistants.threads import ThreadCompletion
 
+if TYPE_CHECKING:
+    from top_assist.open_ai.chat import ChatMessage
+
+_NEW_THREAD_ID = "thread_new"
+
+
+@pytest.fixture(autouse=True)
+def mock_create_thread() -> Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.query.create_thread", autospec=True) as mock:
+        mock.return_value = _NEW_THREAD_ID
+        yield mock
+
+
+_QUESTION_EMBEDDING = [0.1, 0.2]
+
+
+@pytest.fixture(autouse=True)
+def mock_embed_text() -> Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.query.embed_text", autospec=True) as mock:
+        mock.return_value = _QUESTION_EMBEDDING
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_find_reusable_answer() -> Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.query.find_reusable_answer", autospec=True) as mock:
+        mock.return_value = None
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_cache_answer() -> Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.query.cache_answer", autospec=True) as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_find_assistant_thread_pages() -> Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.query.db_interactions.find_assistant_thread_pages", autospec=True) as mock:
+        mock.return_value = {}
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_add_assistant_thread_pages() -> Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.query.db_interactions.add_assistant_thread_pages", autospec=True) as mock:
+        yield mock
+
+
+@pytest.fixture()
+def mock_find_many_by_ids() -> Generator[MagicMock, None, None]:
+    with patch("top_assist.knowledge_base.query.db_pages.find_many_by_ids", autospec=True) as mock:
+        yield mock
+
 
 @pytest.fixture()
 def page1() -> PageDataDTO:
@@ -33,15 +101,17 @@ def mock_access_policy(mock_access_policy_class: MagicMock) -> MagicMock:
     return mock_access_policy
 
 
-@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant", autospec=True)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
 @patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
 @patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
 def test_query_knowledge_base(
     mock_add_user_message_and_complete: MagicMock,
     mock_access_policy: MagicMock,
-    mock_retrieve_relevant: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
     page1: PageDataDTO,
     page2: PageDataDTO,
+    mock_cache_answer: MagicMock,
 ) -> None:
     # Given
     question = "That is my question"
@@ -59,7 +129,8 @@ def test_query_knowledge_base(
         f"  •  <{confluence_base_url}wiki/spaces/{page2.space_key}/pages/{page2.page_id}|{page2.title}>\n"
     )
 
-    mock_retrieve_relevant.return_value = [page1, page2]
+    mock_retrieve_relevant_ids.return_value = [page1.page_id, page2.page_id]
+    mock_find_many_by_ids.return_value = [page1, page2]
     mock_access_policy.accessible_pages.return_value = [page1.page_id, page2.page_id]
     mock_add_user_message_and_complete.return_value = ThreadCompletion(
         message=ai_response, thread_id=expected_thread_id
@@ -69,7 +140,9 @@ def test_query_knowledge_base(
     res = query_knowledge_base(question=question, thread_id=None, access_policy=mock_access_policy)
 
     # Then
-    mock_retrieve_relevant.assert_called_with(question, count=question_context_pages_count)
+    mock_retrieve_relevant_ids.assert_called_with(
+        _QUESTION_EMBEDDING, count=question_context_pages_count * question_context_overfetch_factor
+    )
     mock_access_policy.accessible_pages.assert_called_with([page1.page_id, page2.page_id])
     mock_add_user_message_and_complete.assert_called_with(
         f"Here is the question and the context\n\n{question}\n\n"
@@ -80,23 +153,28 @@ def test_query_knowledge_base(
         f"pageId: {page2.page_id}\ntitle: {page2.title}\nauthor: {page2.author}\ncreated_date: {page2.created_date.isoformat()}\n"
         f"last_updated: {page2.last_updated.isoformat()}\ncontent: {page2.content}\ncomments: {page2.comments}",
         assistant_id=qa_assistant_id,
-        thread_id=None,
+        thread_id=_NEW_THREAD_ID,
         response_format={"type": "json_object"},
+        on_text_delta=None,
     )
 
     assert res == KnowledgeBaseAnswer(
         message=expected_response,
         assistant_thread_id=expected_thread_id,
     )
+    mock_cache_answer.assert_called_once()
+    assert mock_cache_answer.call_args.kwargs["response"] == ai_response
+    assert mock_cache_answer.call_args.kwargs["pages"] == [page1, page2]
 
 
-@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant", autospec=True)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
 @patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
 @patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
 def test_query_knowledge_base_when_only_one_page_used(
     mock_add_user_message_and_complete: MagicMock,
     mock_access_policy: MagicMock,
-    mock_retrieve_relevant: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
     page1: PageDataDTO,
     page2: PageDataDTO,
 ) -> None:
@@ -115,7 +193,8 @@ def test_query_knowledge_base_when_only_one_page_used(
         f"  •  <{confluence_base_url}wiki/spaces/{page1.space_key}/pages/{page1.page_id}|{page1.title}>\n"
     )
 
-    mock_retrieve_relevant.return_value = [page1, page2]
+    mock_retrieve_relevant_ids.return_value = [page1.page_id, page2.page_id]
+    mock_find_many_by_ids.return_value = [page1, page2]
     mock_access_policy.accessible_pages.return_value = [page1.page_id, page2.page_id]
     mock_add_user_message_and_complete.return_value = ThreadCompletion(
         message=ai_response, thread_id=expected_thread_id
@@ -125,7 +204,9 @@ def test_query_knowledge_base_when_only_one_page_used(
     res = query_knowledge_base(question=question, thread_id=None, access_policy=mock_access_policy)
 
     # Then
-    mock_retrieve_relevant.assert_called_with(question, count=question_context_pages_count)
+    mock_retrieve_relevant_ids.assert_called_with(
+        _QUESTION_EMBEDDING, count=question_context_pages_count * question_context_overfetch_factor
+    )
     mock_access_policy.accessible_pages.assert_called_with([page1.page_id, page2.page_id])
     mock_add_user_message_and_complete.assert_called_with(
         f"Here is the question and the context\n\n{question}\n\n"
@@ -136,8 +217,9 @@ def test_query_knowledge_base_when_only_one_page_used(
         f"pageId: {page2.page_id}\ntitle: {page2.title}\nauthor: {page2.author}\ncreated_date: {page2.created_date.isoformat()}\n"
         f"last_updated: {page2.last_updated.isoformat()}\ncontent: {page2.content}\ncomments: {page2.comments}",
         assistant_id=qa_assistant_id,
-        thread_id=None,
+        thread_id=_NEW_THREAD_ID,
         response_format={"type": "json_object"},
+        on_text_delta=None,
     )
 
     assert res == KnowledgeBaseAnswer(
@@ -146,13 +228,14 @@ def test_query_knowledge_base_when_only_one_page_used(
     )
 
 
-@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant", autospec=True)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
 @patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
 @patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
 def test_query_knowledge_base_with_wrong_json(
     mock_add_user_message_and_complete: MagicMock,
     mock_access_policy: MagicMock,
-    mock_retrieve_relevant: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
     page1: PageDataDTO,
     page2: PageDataDTO,
 ) -> None:
@@ -162,7 +245,8 @@ def test_query_knowledge_base_with_wrong_json(
     ai_response = '{"incorrect_json": "Some random text"}'
     expected_response = "Sorry, AI assistant failed to generate an answer. Please try again."
 
-    mock_retrieve_relevant.return_value = [page1, page2]
+    mock_retrieve_relevant_ids.return_value = [page1.page_id, page2.page_id]
+    mock_find_many_by_ids.return_value = [page1, page2]
     mock_access_policy.accessible_pages.return_value = [page1.page_id, page2.page_id]
     mock_add_user_message_and_complete.return_value = ThreadCompletion(
         message=ai_response, thread_id=expected_thread_id
@@ -172,7 +256,9 @@ def test_query_knowledge_base_with_wrong_json(
     res = query_knowledge_base(question=question, thread_id=None, access_policy=mock_access_policy)
 
     # Then
-    mock_retrieve_relevant.assert_called_with(question, count=question_context_pages_count)
+    mock_retrieve_relevant_ids.assert_called_with(
+        _QUESTION_EMBEDDING, count=question_context_pages_count * question_context_overfetch_factor
+    )
     mock_access_policy.accessible_pages.assert_called_with([page1.page_id, page2.page_id])
     mock_add_user_message_and_complete.assert_called_once()
 
@@ -182,13 +268,14 @@ def test_query_knowledge_base_with_wrong_json(
     )
 
 
-@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant", autospec=True)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
 @patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
 @patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
 def test_query_knowledge_base_with_only_one_page_accessible(
     mock_add_user_message_and_complete: MagicMock,
     mock_access_policy: MagicMock,
-    mock_retrieve_relevant: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
     page1: PageDataDTO,
     page2: PageDataDTO,
     page3: PageDataDTO,
@@ -209,7 +296,8 @@ def test_query_knowledge_base_with_only_one_page_accessible(
         f"  •  <{confluence_base_url}wiki/spaces/{page2.space_key}/pages/{page2.page_id}|{page2.title}>\n"
     )
 
-    mock_retrieve_relevant.return_value = [page1, page2, page3]
+    mock_retrieve_relevant_ids.return_value = [page1.page_id, page2.page_id, page3.page_id]
+    mock_find_many_by_ids.return_value = [page1, page2, page3]
     mock_access_policy.accessible_pages.return_value = [page1.page_id, page2.page_id]
     mock_add_user_message_and_complete.return_value = ThreadCompletion(
         message=ai_response, thread_id=expected_thread_id
@@ -219,7 +307,9 @@ def test_query_knowledge_base_with_only_one_page_accessible(
     res = query_knowledge_base(question=question, thread_id=None, access_policy=mock_access_policy)
 
     # Then
-    mock_retrieve_relevant.assert_called_with(question, count=question_context_pages_count)
+    mock_retrieve_relevant_ids.assert_called_with(
+        _QUESTION_EMBEDDING, count=question_context_pages_count * question_context_overfetch_factor
+    )
     mock_access_policy.accessible_pages.assert_called_with([page1.page_id, page2.page_id, page3.page_id])
     mock_add_user_message_and_complete.assert_called_once()
 
@@ -229,15 +319,17 @@ def test_query_knowledge_base_with_only_one_page_accessible(
     )
 
 
-@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant", autospec=True)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
 @patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
 @patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
 def test_query_knowledge_base_when_question_in_thread(
     mock_add_user_message_and_complete: MagicMock,
     mock_access_policy: MagicMock,
-    mock_retrieve_relevant: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
     page1: PageDataDTO,
     page2: PageDataDTO,
+    mock_create_thread: MagicMock,
 ) -> None:
     # Given
     question = "That is my question in the thread"
@@ -249,7 +341,8 @@ def test_query_knowledge_base_when_question_in_thread(
         "page_ids": [page1.page_id, page2.page_id],
     })
 
-    mock_retrieve_relevant.return_value = [page1, page2]
+    mock_retrieve_relevant_ids.return_value = [page1.page_id, page2.page_id]
+    mock_find_many_by_ids.return_value = [page1, page2]
     mock_access_policy.accessible_pages.return_value = [page1.page_id, page2.page_id]
     mock_add_user_message_and_complete.return_value = ThreadCompletion(
         message=ai_response, thread_id=expected_thread_id
@@ -259,7 +352,9 @@ def test_query_knowledge_base_when_question_in_thread(
     res = query_knowledge_base(question=question, thread_id=expected_thread_id, access_policy=mock_access_policy)
 
     # Then
-    mock_retrieve_relevant.assert_called_with(question, count=question_context_pages_count)
+    mock_retrieve_relevant_ids.assert_called_with(
+        _QUESTION_EMBEDDING, count=question_context_pages_count * question_context_overfetch_factor
+    )
     mock_access_policy.accessible_pages.assert_called_with([page1.page_id, page2.page_id])
     mock_add_user_message_and_complete.assert_called_with(
         f"Here is the question and the context\n\n{question}\n\n"
@@ -272,7 +367,9 @@ def test_query_knowledge_base_when_question_in_thread(
         assistant_id=qa_assistant_id,
         thread_id=expected_thread_id,
         response_format={"type": "json_object"},
+        on_text_delta=None,
     )
+    mock_create_thread.assert_not_called()
 
     assert res == KnowledgeBaseAnswer(
         message=expected_response,
@@ -281,14 +378,15 @@ def test_query_knowledge_base_when_question_in_thread(
 
 
 @patch("top_assist.knowledge_base.query.logging", autospec=True)
-@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant", autospec=True)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
 @patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
 @patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
 def test_query_knowledge_base_when_invalid_json(
     mock_add_user_message_and_complete: MagicMock,
     mock_access_policy: MagicMock,
-    mock_retrieve_relevant: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
     mock_logging: MagicMock,
+    mock_find_many_by_ids: MagicMock,
     page1: PageDataDTO,
     page2: PageDataDTO,
 ) -> None:
@@ -298,7 +396,8 @@ def test_query_knowledge_base_when_invalid_json(
     ai_response = "I'm a string, not a JSON"
     expected_response = FAILED_TO_ANSWER_MSG
 
-    mock_retrieve_relevant.return_value = [page1, page2]
+    mock_retrieve_relevant_ids.return_value = [page1.page_id, page2.page_id]
+    mock_find_many_by_ids.return_value = [page1, page2]
     mock_access_policy.accessible_pages.return_value = [page1.page_id, page2.page_id]
     mock_add_user_message_and_complete.return_value = ThreadCompletion(
         message=ai_response, thread_id=expected_thread_id
@@ -308,7 +407,9 @@ def test_query_knowledge_base_when_invalid_json(
     res = query_knowledge_base(question=question, thread_id=None, access_policy=mock_access_policy)
 
     # Then
-    mock_retrieve_relevant.assert_called_with(question, count=question_context_pages_count)
+    mock_retrieve_relevant_ids.assert_called_with(
+        _QUESTION_EMBEDDING, count=question_context_pages_count * question_context_overfetch_factor
+    )
     mock_access_policy.accessible_pages.assert_called_with([page1.page_id, page2.page_id])
     mock_add_user_message_and_complete.assert_called_once()
     mock_logging.exception.assert_called_with("Assistant response is not a valid JSON", extra={"response": ai_response})
@@ -317,3 +418,284 @@ def test_query_knowledge_base_when_invalid_json(
         message=expected_response,
         assistant_thread_id=expected_thread_id,
     )
+
+
+@patch("top_assist.knowledge_base.query.question_context_pages_count", 2)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
+@patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
+@patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
+def test_query_knowledge_base_replaces_inaccessible_pages_with_next_candidates(
+    mock_add_user_message_and_complete: MagicMock,
+    mock_access_policy: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+) -> None:
+    # Given (the most relevant page is not accessible for the user)
+    pages = [create_page_dto() for _ in range(4)]
+    mock_retrieve_relevant_ids.return_value = [page.page_id for page in pages]
+    mock_find_many_by_ids.return_value = pages
+    mock_access_policy.accessible_pages.return_value = [page.page_id for page in pages[1:]]
+    mock_add_user_message_and_complete.return_value = ThreadCompletion(
+        message=json.dumps({"summary": "AI summary.", "page_ids": []}), thread_id="thread_123456"
+    )
+
+    # When
+    query_knowledge_base(question="That is my question", thread_id=None, access_policy=mock_access_policy)
+
+    # Then the context is filled with the next two accessible candidates in the order of relevance
+    mock_retrieve_relevant_ids.assert_called_with(_QUESTION_EMBEDDING, count=2 * question_context_overfetch_factor)
+    mock_access_policy.accessible_pages.assert_called_with([page.page_id for page in pages])
+    prompt = mock_add_user_message_and_complete.call_args.args[0]
+    assert pages[0].format_for_llm() not in prompt
+    assert pages[1].format_for_llm() in prompt
+    assert pages[2].format_for_llm() in prompt
+    assert pages[3].format_for_llm() not in prompt
+
+
+@patch("top_assist.knowledge_base.query.create_answered_thread", autospec=True)
+@patch("top_assist.knowledge_base.query.record_reuse", autospec=True)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
+@patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
+@patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
+def test_query_knowledge_base_reuses_cached_answer(
+    mock_add_user_message_and_complete: MagicMock,
+    mock_access_policy: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_record_reuse: MagicMock,
+    mock_create_answered_thread: MagicMock,
+    mock_find_reusable_answer: MagicMock,
+    page1: PageDataDTO,
+) -> None:
+    # Given
+    response = json.dumps({"summary": "AI summary.", "page_ids": [page1.page_id]})
+    reusable = ReusableAnswer(
+        answer=CachedAnswerDTO(
+            id=1,
+            question="Similar question",
+            response=response,
+            page_versions={page1.page_id: page1.last_updated.isoformat()},
+            answer_seconds=20,
+            created_at=page1.last_updated,
+        ),
+        pages=[page1],
+    )
+    mock_find_reusable_answer.return_value = reusable
+    mock_create_answered_thread.return_value = "thread_answered"
+
+    # When
+    res = query_knowledge_base(question="That is my question", thread_id=None, access_policy=mock_access_policy)
+
+    # Then
+    mock_find_reusable_answer.assert_called_once_with(_QUESTION_EMBEDDING, mock_access_policy)
+    mock_retrieve_relevant_ids.assert_not_called()
+    mock_add_user_message_and_complete.assert_not_called()
+    mock_record_reuse.assert_called_once()
+    assert mock_create_answered_thread.call_args.args[1] == response
+    assert res == KnowledgeBaseAnswer(
+        message=(
+            "*Summary*\nAI summary.\n\n\n*Documents in context*\n\n"
+            f"  •  <{confluence_base_url}wiki/spaces/{page1.space_key}/pages/{page1.page_id}|{page1.title}>\n"
+        ),
+        assistant_thread_id="thread_answered",
+    )
+
+
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
+@patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
+@patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
+def test_query_knowledge_base_streams_partial_answer(
+    mock_add_user_message_and_complete: MagicMock,
+    mock_access_policy: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+    page1: PageDataDTO,
+) -> None:
+    # Given the response is streamed in chunks cutting the fields and an escape sequence
+    ai_response = json.dumps({
+        "summary": "AI summary.",
+        "comprehensive_answer": "This is\nan AI answer.",
+        "page_ids": [page1.page_id],
+    })
+    text_deltas = [
+        '{"summary": "AI sum',
+        'mary.", "comprehensive_answer": "This is\\',
+        'nan AI answer."',
+        ai_response[-30:],
+    ]
+
+    def complete(*_args: object, on_text_delta: Callable[[str], None], **_kwargs: object) -> ThreadCompletion:
+        for text_delta in text_deltas:
+            on_text_delta(text_delta)
+        return ThreadCompletion(message=ai_response, thread_id="thread_123456")
+
+    mock_retrieve_relevant_ids.return_value = [page1.page_id]
+    mock_find_many_by_ids.return_value = [page1]
+    mock_access_policy.accessible_pages.return_value = [page1.page_id]
+    mock_add_user_message_and_complete.side_effect = complete
+    on_partial_answer = MagicMock()
+
+    # When
+    query_knowledge_base(
+        question="That is my question",
+        thread_id=None,
+        access_policy=mock_access_policy,
+        on_partial_answer=on_partial_answer,
+    )
+
+    # Then
+    assert [call.args[0] for call in on_partial_answer.call_args_list[:3]] == [
+        "*Summary*\nAI sum\n\n",
+        "*Summary*\nAI summary.\n\n*Comprehensive Answer*\nThis is",
+        "*Summary*\nAI summary.\n\n*Comprehensive Answer*\nThis is\nan AI answer.",
+    ]
+
+
+@patch("top_assist.knowledge_base.query.knowledge_base_completion_backend", "chat")
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
+@patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
+@patch("top_assist.knowledge_base.query.complete_chat", autospec=True)
+def test_query_knowledge_base_with_chat_backend(
+    mock_complete_chat: MagicMock,
+    mock_access_policy: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+    page1: PageDataDTO,
+    mock_create_thread: MagicMock,
+) -> None:
+    # Given a follow-up question in a conversation stored by Top Assist
+    thread_id = "chat_123456"
+    history: list[ChatMessage] = [
+        {"role": "user", "content": "First question"},
+        {"role": "assistant", "content": "First answer"},
+    ]
+    ai_response = json.dumps({
+        "comprehensive_answer": "This is an AI answer.",
+        "summary": "AI summary.",
+        "page_ids": [page1.page_id],
+    })
+
+    mock_retrieve_relevant_ids.return_value = [page1.page_id]
+    mock_find_many_by_ids.return_value = [page1]
+    mock_access_policy.accessible_pages.return_value = [page1.page_id]
+    mock_complete_chat.return_value = ThreadCompletion(message=ai_response, thread_id=thread_id)
+
+    # When
+    res = query_knowledge_base(
+        question="That is my question in the thread",
+        thread_id=thread_id,
+        access_policy=mock_access_policy,
+        history=history,
+    )
+
+    # Then the question is answered with a single chat completion, no assistant thread is used
+    mock_complete_chat.assert_called_once()
+    assert mock_complete_chat.call_args.kwargs["history"] == history
+    assert mock_complete_chat.call_args.kwargs["thread_id"] == thread_id
+    assert mock_complete_chat.call_args.kwargs["response_format"] == "json_object"
+    mock_create_thread.assert_not_called()
+
+    assert res == KnowledgeBaseAnswer(message="This is an AI answer.", assistant_thread_id=thread_id)
+
+
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
+@patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
+@patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
+def test_query_knowledge_base_when_question_in_thread_skips_pages_already_in_thread(
+    mock_add_user_message_and_complete: MagicMock,
+    mock_access_policy: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+    page1: PageDataDTO,
+    page2: PageDataDTO,
+    mock_find_assistant_thread_pages: MagicMock,
+    mock_add_assistant_thread_pages: MagicMock,
+) -> None:
+    # Given page1 was sent to the thread with a previous question
+    question = "That is my question in the thread"
+    thread_id = "thread_123456"
+    ai_response = json.dumps({"comprehensive_answer": "This is an AI answer.", "page_ids": [page1.page_id]})
+
+    mock_retrieve_relevant_ids.return_value = [page1.page_id, page2.page_id]
+    mock_find_many_by_ids.return_value = [page1, page2]
+    mock_access_policy.accessible_pages.return_value = [page1.page_id, page2.page_id]
+    mock_find_assistant_thread_pages.return_value = {page1.page_id: page1.last_updated.isoformat()}
+    mock_add_user_message_and_complete.return_value = ThreadCompletion(message=ai_response, thread_id=thread_id)
+
+    # When
+    query_knowledge_base(question=question, thread_id=thread_id, access_policy=mock_access_policy)
+
+    # Then only page2 is sent, page1 is referenced
+    mock_find_assistant_thread_pages.assert_called_once_with(thread_id)
+    user_message = mock_add_user_message_and_complete.call_args.args[0]
+    assert f"pageId: {page2.page_id}\ntitle: {page2.title}" in user_message
+    assert f"content: {page1.content}" not in user_message
+    assert user_message.endswith(
+        "Documents given in the context of the previous questions, also relevant:\n"
+        f"pageId: {page1.page_id}, title: {page1.title}"
+    )
+    mock_add_assistant_thread_pages.assert_called_once_with(thread_id, {page2.page_id: page2.last_updated.isoformat()})
+
+
+@patch("top_assist.knowledge_base.query.question_context_token_budget", 100)
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
+@patch("top_assist.knowledge_base.query.PageAccessPolicy", autospec=True)
+@patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
+def test_query_knowledge_base_when_question_in_thread_sends_truncated_pages_again(
+    mock_add_user_message_and_complete: MagicMock,
+    mock_access_policy: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_find_many_by_ids: MagicMock,
+    mock_find_assistant_thread_pages: MagicMock,
+    mock_add_assistant_thread_pages: MagicMock,
+) -> None:
+    # Given a page over the context budget
+    thread_id = "thread_123456"
+    long_page = create_page_dto(content=" ".join(["This is a sentence."] * 200))
+    ai_response = json.dumps({"comprehensive_answer": "This is an AI answer.", "page_ids": [long_page.page_id]})
+
+    mock_retrieve_relevant_ids.return_value = [long_page.page_id]
+    mock_find_many_by_ids.return_value = [long_page]
+    mock_access_policy.accessible_pages.return_value = [long_page.page_id]
+    mock_add_user_message_and_complete.return_value = ThreadCompletion(message=ai_response, thread_id=thread_id)
+    thread_pages: dict[str, str] = {}
+    mock_find_assistant_thread_pages.side_effect = lambda _thread_id: dict(thread_pages)
+    mock_add_assistant_thread_pages.side_effect = lambda _thread_id, page_versions: thread_pages.update(page_versions)
+
+    # When the page is truncated for a question and a follow-up is asked about it
+    query_knowledge_base(question="First question", thread_id=thread_id, access_policy=mock_access_policy)
+    query_knowledge_base(question="Follow-up question", thread_id=thread_id, access_policy=mock_access_policy)
+
+    # Then the thread did not get its full text, the excerpt is sent again instead of a reference
+    assert thread_pages == {}
+    follow_up_message = mock_add_user_message_and_complete.call_args.args[0]
+    assert "This is a sentence. [Content truncated due to size limit.]" in follow_up_message
+    assert "Documents given in the context of the previous questions" not in follow_up_message
+
+
+@patch("top_assist.knowledge_base.query.db_pages.retrieve_relevant_ids", autospec=True)
+@patch("top_assist.knowledge_base.query.add_user_message_and_complete", autospec=True)
+def test_query_knowledge_base_with_retrieved_context_skips_retrieval(
+    mock_add_user_message_and_complete: MagicMock,
+    mock_retrieve_relevant_ids: MagicMock,
+    mock_embed_text: MagicMock,
+    mock_find_reusable_answer: MagicMock,
+    page1: PageDataDTO,
+) -> None:
+    # Given the context retrieved speculatively while the question was routed
+    question = "That is my question"
+    access_policy = create_autospec(PageAccessPolicy)
+    retrieved_context = RetrievedContext(
+        question=question, question_embedding=[0.3, 0.4], candidate_ids=[page1.page_id], allowed_pages=[page1]
+    )
+    ai_response = json.dumps({"comprehensive_answer": "This is an AI answer.", "page_ids": [page1.page_id]})
+    mock_add_user_message_and_complete.return_value = ThreadCompletion(message=ai_response, thread_id=_NEW_THREAD_ID)
+
+    # When
+    query_knowledge_base(question=question, access_policy=access_policy, retrieved_context=retrieved_context)
+
+    # Then
+    mock_embed_text.assert_not_called()
+    mock_retrieve_relevant_ids.assert_not_called()
+    access_policy.accessible_pages.assert_not_called()
+    mock_find_reusable_answer.assert_called_once_with([0.3, 0.4], access_policy)
+    assert f"content: {page1.content}" in mock_add_user_message_and_complete.call_args.args[0]
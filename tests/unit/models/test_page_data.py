@@ -0,0 +1,33 @@
+from unittest.mock import MagicMock, patch
+
+from tests.unit.knowledge_base.factory import create_page_dto
+
+
+@patch("top_assist.models.page_data.count_tokens", return_value=7)
+def test_format_for_llm_and_token_count_are_computed_once(mock_count_tokens: MagicMock) -> None:
+    # Given
+    page = create_page_dto(title="Onboarding", content="Welcome")
+
+    # When
+    text = page.format_for_llm()
+    page.format_for_llm()
+    page.token_count()
+    count = page.token_count()
+
+    # Then
+    assert "title: Onboarding" in text
+    assert "content: Welcome" in text
+    assert page.llm_text == text
+    assert count == 7
+    mock_count_tokens.assert_called_once_with(text)
+
+
+@patch("top_assist.models.page_data.count_tokens")
+def test_stored_llm_text_and_token_count_are_reused(mock_count_tokens: MagicMock) -> None:
+    # Given
+    page = create_page_dto().model_copy(update={"llm_text": "stored text", "llm_token_count": 3})
+
+    # When / Then
+    assert page.format_for_llm() == "stored text"
+    assert page.token_count() == 3
+    mock_count_tokens.assert_not_called()
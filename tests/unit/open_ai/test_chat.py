@@ -0,0 +1,42 @@
+from unittest.mock import MagicMock, patch
+
+from top_assist.open_ai.assistants.templates import AssistantTemplate
+from top_assist.open_ai.chat import CHAT_THREAD_ID_PREFIX, complete_chat
+from top_assist.utils.service_cooldown import _DummyServiceCooldownStorage
+
+_TEMPLATE = AssistantTemplate(model="gpt-test", name="Test", instructions="Answer briefly", description="Test")
+
+
+def _chunk(content: str | None) -> MagicMock:
+    return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+
+# The cooldown storage configured on import is the database one
+@patch("top_assist.utils.service_cooldown._config.storage", new=_DummyServiceCooldownStorage())
+@patch("top_assist.open_ai.chat.openai_client", autospec=True)
+def test_complete_chat_streams_the_answer_to_the_conversation(mock_openai_client: MagicMock) -> None:
+    # Given
+    mock_create = mock_openai_client.return_value.chat.completions.create
+    mock_create.return_value = iter([_chunk("Ubuntu is "), _chunk(None), _chunk("a Linux distribution.")])
+    on_text_delta = MagicMock()
+
+    # When
+    completion = complete_chat(
+        "What is Ubuntu?",
+        template=_TEMPLATE,
+        history=[{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello!"}],
+        on_text_delta=on_text_delta,
+    )
+
+    # Then
+    assert mock_create.call_args.kwargs["model"] == "gpt-test"
+    assert mock_create.call_args.kwargs["messages"] == [
+        {"role": "system", "content": "Answer briefly"},
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello!"},
+        {"role": "user", "content": "What is Ubuntu?"},
+    ]
+    assert mock_create.call_args.kwargs["stream"] is True
+    assert [call.args[0] for call in on_text_delta.call_args_list] == ["Ubuntu is ", "a Linux distribution."]
+    assert completion.message == "Ubuntu is a Linux distribution."
+    assert completion.thread_id.startswith(CHAT_THREAD_ID_PREFIX)
@@ -0,0 +1,66 @@
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from top_assist.open_ai.assistants.threads import RunTimeoutError, _Run
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.current = 0.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.current
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.current += seconds
+
+
+def test_run_wait_backs_off_and_cancels_the_run_after_timeout() -> None:
+    # Given
+    clock = _FakeClock()
+    client = MagicMock()
+    client.beta.threads.runs.retrieve.return_value = MagicMock(status="in_progress")
+    run = _Run(client, "assistant_123", "thread_123", "run_123")
+
+    # When
+    with (
+        patch("top_assist.open_ai.assistants.threads.time.monotonic", clock.monotonic),
+        patch("top_assist.open_ai.assistants.threads.time.sleep", clock.sleep),
+        pytest.raises(RunTimeoutError),
+    ):
+        run.wait(timeout_seconds=3)
+
+    # Then the intervals grow and the last one is cut by the deadline
+    assert clock.slept == [0.25, 0.375, 0.5625, 0.84375, 0.96875]
+    client.beta.threads.runs.cancel.assert_called_once_with(thread_id="thread_123", run_id="run_123")
+
+
+def test_run_stream_cancels_the_run_after_timeout() -> None:
+    # Given
+    clock = _FakeClock()
+    client = MagicMock()
+    stream = client.beta.threads.runs.stream.return_value.__enter__.return_value
+    stream.current_run.id = "run_123"
+
+    def text_deltas() -> Iterator[str]:
+        for text_delta in ["Partial", " answer", " never sent"]:
+            clock.current += 2
+            yield text_delta
+
+    stream.text_deltas = text_deltas()
+    on_text_delta = MagicMock()
+
+    # When
+    with (
+        patch("top_assist.open_ai.assistants.threads.time.monotonic", clock.monotonic),
+        pytest.raises(RunTimeoutError),
+    ):
+        _Run.stream(client, "assistant_123", "thread_123", "auto", on_text_delta, timeout_seconds=3)
+
+    # Then
+    assert [call.args[0] for call in on_text_delta.call_args_list] == ["Partial", " answer"]
+    client.beta.threads.runs.cancel.assert_called_once_with(thread_id="thread_123", run_id="run_123")
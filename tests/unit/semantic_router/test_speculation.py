@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock, create_autospec, patch
+
+from top_assist.confluence.policy import PageAccessPolicy
+from top_assist.knowledge_base.query import RetrievedContext
+from top_assist.semantic_router.speculation import SpeculativeRetrieval
+
+_QUESTION = "What is Ubuntu?"
+_QUESTION_EMBEDDING = [0.1, 0.2]
+
+
+@patch("top_assist.semantic_router.speculation.retrieve_context", autospec=True)
+@patch("top_assist.semantic_router.speculation.embed_text", new=MagicMock(return_value=_QUESTION_EMBEDDING))
+def test_speculative_retrieval_is_taken_for_the_speculated_question(mock_retrieve_context: MagicMock) -> None:
+    # Given
+    policy = create_autospec(PageAccessPolicy)
+    context = RetrievedContext(
+        question=_QUESTION, question_embedding=_QUESTION_EMBEDDING, candidate_ids=[], allowed_pages=[]
+    )
+    mock_retrieve_context.return_value = context
+
+    # When
+    speculative_retrieval = SpeculativeRetrieval(_QUESTION, policy)
+    embedding = speculative_retrieval.embedding(_QUESTION)
+    taken_context = speculative_retrieval.take(_QUESTION)
+    speculative_retrieval.finish()
+
+    # Then
+    assert embedding == _QUESTION_EMBEDDING
+    assert taken_context == context
+    mock_retrieve_context.assert_called_once_with(
+        _QUESTION, question_embedding=_QUESTION_EMBEDDING, access_policy=policy
+    )
+
+
+@patch("top_assist.semantic_router.speculation.retrieve_context", new=MagicMock())
+@patch("top_assist.semantic_router.speculation.embed_text", new=MagicMock(return_value=_QUESTION_EMBEDDING))
+def test_speculative_retrieval_is_not_taken_for_another_question() -> None:
+    # When
+    speculative_retrieval = SpeculativeRetrieval(_QUESTION, create_autospec(PageAccessPolicy))
+    taken_context = speculative_retrieval.take("What is Debian?")
+    speculative_retrieval.finish()
+
+    # Then
+    assert taken_context is None
+
+
+@patch("top_assist.semantic_router.speculation.retrieve_context", autospec=True)
+@patch("top_assist.semantic_router.speculation.embed_text", new=MagicMock(side_effect=RuntimeError("API error")))
+def test_failed_speculative_retrieval_is_not_taken(mock_retrieve_context: MagicMock) -> None:
+    # When
+    speculative_retrieval = SpeculativeRetrieval(_QUESTION, create_autospec(PageAccessPolicy))
+    embedding = speculative_retrieval.embedding(_QUESTION)
+    taken_context = speculative_retrieval.take(_QUESTION)
+    speculative_retrieval.finish()
+
+    # Then
+    assert embedding is None
+    assert taken_context is None
+    mock_retrieve_context.assert_not_called()
@@ -0,0 +1,87 @@
+import typing
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from top_assist.semantic_router import tool_classifier
+from top_assist.semantic_router.tool_classifier import _TOOL_EXAMPLES, classify_tool
+
+_TOOL_NAMES = list(_TOOL_EXAMPLES)
+
+
+def _embed_examples(texts: list[str], model: str) -> list[list[float]]:  # noqa: ARG001
+    """Examples of every tool are embedded along their own axis."""
+    return [
+        [1.0 if tool_index == _TOOL_NAMES.index(tool_name) else 0.0 for tool_index in range(len(_TOOL_NAMES))]
+        for text in texts
+        for tool_name, examples in _TOOL_EXAMPLES.items()
+        if text in examples
+    ]
+
+
+@pytest.fixture(autouse=True)
+def _mock_example_embeddings() -> typing.Generator:
+    getattr(tool_classifier, "__example_embeddings").cache_clear()
+    with patch("top_assist.semantic_router.tool_classifier.embed_texts", side_effect=_embed_examples):
+        yield
+
+
+@patch("top_assist.semantic_router.tool_classifier.embed_text", autospec=True)
+def test_explicit_trigger_chooses_the_tool_without_embedding(mock_embed_text: MagicMock) -> None:
+    # When
+    classification = classify_tool("ChatGPT: write a poem about the sea")
+
+    # Then
+    assert classification.tool_name == "query_chatgpt"
+    assert classification.method == "keyword"
+    mock_embed_text.assert_not_called()
+
+
+@patch("top_assist.semantic_router.tool_classifier.embed_text", autospec=True)
+def test_question_similar_to_examples_of_one_tool_chooses_it(mock_embed_text: MagicMock) -> None:
+    # Given
+    mock_embed_text.return_value = [0.9, 0.1, 0.0, 0.0]
+
+    # When
+    classification = classify_tool("How do I book a meeting room?")
+
+    # Then
+    assert classification.tool_name == _TOOL_NAMES[0]
+    assert classification.method == "embedding"
+    assert classification.confidence == pytest.approx(0.8)
+    assert classification.question_embedding == [0.9, 0.1, 0.0, 0.0]
+
+
+@patch("top_assist.semantic_router.tool_classifier.embed_text", autospec=True)
+def test_question_similar_to_examples_of_several_tools_is_left_to_the_model(mock_embed_text: MagicMock) -> None:
+    # Given
+    mock_embed_text.return_value = [0.5, 0.5, 0.0, 0.0]
+
+    # When
+    classification = classify_tool("Tell me about our search engine")
+
+    # Then
+    assert classification.tool_name is None
+    assert classification.confidence == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize(
+    "question",
+    [
+        "What is our contract with OpenAI?",
+        "How do we integrate with GPT in the billing service?",
+        "Who owns the web search feature?",
+        "How to improve the prompt quality in our LLM guidelines?",
+    ],
+)
+@patch("top_assist.semantic_router.tool_classifier.embed_text", autospec=True)
+def test_trigger_words_within_the_question_are_not_keyword_matches(mock_embed_text: MagicMock, question: str) -> None:
+    # Given
+    mock_embed_text.return_value = [0.9, 0.1, 0.0, 0.0]
+
+    # When
+    classification = classify_tool(question)
+
+    # Then
+    assert classification.tool_name == _TOOL_NAMES[0]
+    assert classification.method == "embedding"
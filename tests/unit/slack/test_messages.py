@@ -0,0 +1,45 @@
+from unittest.mock import MagicMock, patch
+
+from top_assist.configuration import slack_stream_update_interval_seconds
+from top_assist.slack._client import PostedSlackMessage
+from top_assist.slack.messages import StreamedAnswer
+
+
+@patch("top_assist.slack.messages.time.monotonic", autospec=True)
+@patch("top_assist.slack.messages.WebClient", autospec=True)
+def test_streamed_answer_throttles_updates(mock_web_client_class: MagicMock, mock_monotonic: MagicMock) -> None:
+    # Given
+    mock_web_client = mock_web_client_class.default.return_value
+    mock_web_client.post_message.return_value = PostedSlackMessage(ts="123.456")
+    mock_monotonic.return_value = 0
+    streamed_answer = StreamedAnswer.start(channel="C123", thread_ts="100.000")
+
+    # When
+    mock_monotonic.return_value = slack_stream_update_interval_seconds
+    streamed_answer.update("Partial")
+    streamed_answer.update("Partial answer")
+    message = streamed_answer.finish("Final answer")
+
+    # Then the second update is skipped as too early, the final answer is always posted
+    mock_web_client.post_message.assert_called_once_with(
+        channel="C123", text=StreamedAnswer.PLACEHOLDER, thread_ts="100.000"
+    )
+    assert [call.kwargs["text"] for call in mock_web_client.update_message.call_args_list] == [
+        "Partial",
+        "Final answer",
+    ]
+    assert message == PostedSlackMessage(ts="123.456")
+
+
+@patch("top_assist.slack.messages.WebClient", autospec=True)
+def test_streamed_answer_deletes_the_placeholder_on_discard(mock_web_client_class: MagicMock) -> None:
+    # Given
+    mock_web_client = mock_web_client_class.default.return_value
+    mock_web_client.post_message.return_value = PostedSlackMessage(ts="123.456")
+    streamed_answer = StreamedAnswer.start(channel="C123", thread_ts="100.000")
+
+    # When
+    streamed_answer.discard()
+
+    # Then
+    mock_web_client.delete_message.assert_called_once_with(channel="C123", ts="123.456")
@@ -0,0 +1,74 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from top_assist.utils.llm_cache import LLMResponseCache, _LocalLLMCacheStorage, configure_llm_cache
+
+_LLM_STRING = (
+    '{"model_name": "gpt-4o-mini", "http_client": "<httpx.Client object at 0x7f3a2c1b9d90>"}---[("stop", None)]'
+)
+_PROMPT = '[{"type": "human", "content": "What is Ubuntu?"}]'
+
+
+@pytest.fixture(autouse=True)
+def _local_storage() -> None:
+    configure_llm_cache(_LocalLLMCacheStorage())
+
+
+def _generations() -> list[ChatGeneration]:
+    message = AIMessage(
+        content="", tool_calls=[{"name": "query_knowledge_base", "args": {}, "id": "call_1", "type": "tool_call"}]
+    )
+    return [ChatGeneration(message=message)]
+
+
+def test_cached_response_is_returned_for_the_same_model_and_prompt() -> None:
+    # Given
+    cache = LLMResponseCache(node="tool_choice_agent")
+    cache.update(_PROMPT, _LLM_STRING, _generations())
+
+    # When the model is configured the same in another process
+    cached = cache.lookup(_PROMPT, _LLM_STRING.replace("0x7f3a2c1b9d90", "0x7f11aa00bb22"))
+
+    # Then
+    assert cached == _generations()
+
+
+@pytest.mark.parametrize(
+    ("prompt", "llm_string"),
+    [
+        ('[{"type": "human", "content": "What is Debian?"}]', _LLM_STRING),
+        (_PROMPT, _LLM_STRING.replace("gpt-4o-mini", "gpt-4o")),
+        (
+            _PROMPT,
+            _LLM_STRING.replace('("stop", None)', '("response_format", {"type": "json_schema"}), ("stop", None)'),
+        ),
+    ],
+)
+def test_cached_response_is_not_returned_for_another_model_or_prompt(prompt: str, llm_string: str) -> None:
+    # Given
+    cache = LLMResponseCache(node="tool_choice_agent")
+    cache.update(_PROMPT, _LLM_STRING, _generations())
+
+    # When
+    cached = cache.lookup(prompt, llm_string)
+
+    # Then
+    assert cached is None
+
+
+def test_cached_response_expires_after_ttl() -> None:
+    # Given
+    cache = LLMResponseCache(node="question_generator")
+    cache.update(_PROMPT, _LLM_STRING, _generations())
+
+    # When looked up after the default TTL of a day
+    later = datetime.now(UTC) + timedelta(days=2)
+    with patch("top_assist.utils.llm_cache.datetime", MagicMock(now=lambda _tz: later)):
+        cached = cache.lookup(_PROMPT, _LLM_STRING)
+
+    # Then
+    assert cached is None
@@ -0,0 +1,96 @@
+import typing
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from top_assist.utils.rate_limiter import (
+    RateLimit,
+    RateLimitPriority,
+    _LocalRateLimitStorage,
+    acquire_rate_limit,
+    configure_rate_limiter,
+    pause_rate_limit,
+)
+
+_LIMIT = RateLimit(per_second=1, burst=2, interactive_reserve=1)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.current = datetime(2024, 1, 1, tzinfo=UTC)
+        self.slept: list[float] = []
+
+    def now(self, _tz: typing.Any) -> datetime:  # noqa: ANN401
+        return self.current
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.current += timedelta(seconds=seconds)
+
+
+@pytest.fixture()
+def clock() -> typing.Generator[_FakeClock, None, None]:
+    configure_rate_limiter(_LocalRateLimitStorage())
+    fake_clock = _FakeClock()
+    with (
+        patch("top_assist.utils.rate_limiter.datetime", MagicMock(now=fake_clock.now)),
+        patch("top_assist.utils.rate_limiter.time.sleep", fake_clock.sleep),
+    ):
+        yield fake_clock
+
+
+def test_bulk_requests_leave_the_interactive_reserve(clock: _FakeClock) -> None:
+    # When
+    acquire_rate_limit("service", _LIMIT, RateLimitPriority.bulk)
+    acquire_rate_limit("service", _LIMIT, RateLimitPriority.interactive)
+
+    # Then the reserved token is taken by the interactive request without waiting
+    assert clock.slept == []
+
+    # When
+    acquire_rate_limit("service", _LIMIT, RateLimitPriority.bulk)
+
+    # Then the bulk request waits for the reserve to be refilled plus one token
+    assert clock.slept == [2]
+
+
+def test_pause_delays_all_requests(clock: _FakeClock) -> None:
+    # When
+    pause_rate_limit("service", _LIMIT, 30)
+    acquire_rate_limit("service", _LIMIT, RateLimitPriority.interactive)
+
+    # Then the request waits for the pause and for a token to be refilled after it
+    assert clock.slept == [30, 1]
+
+
+def test_bulk_requests_take_tokens_from_the_shared_bucket_in_batches(clock: _FakeClock) -> None:
+    # Given
+    limit = RateLimit(per_second=1, burst=10, interactive_reserve=1, batch_size=3)
+    storage = _LocalRateLimitStorage()
+    configure_rate_limiter(storage)
+
+    # When
+    with patch.object(storage, "update", wraps=storage.update) as mock_update:
+        for _ in range(4):
+            acquire_rate_limit("batched", limit, RateLimitPriority.bulk)
+
+    # Then the first request takes 3 tokens, the next two use the lease, the fourth takes the next batch
+    assert mock_update.call_count == 2
+    assert clock.slept == []
+
+
+def test_leased_tokens_expire(clock: _FakeClock) -> None:
+    # Given
+    limit = RateLimit(per_second=1, burst=10, batch_size=3)
+    storage = _LocalRateLimitStorage()
+    configure_rate_limiter(storage)
+
+    # When
+    with patch.object(storage, "update", wraps=storage.update) as mock_update:
+        acquire_rate_limit("expiring", limit, RateLimitPriority.bulk)
+        clock.current += timedelta(seconds=2)
+        acquire_rate_limit("expiring", limit, RateLimitPriority.bulk)
+
+    # Then
+    assert mock_update.call_count == 2
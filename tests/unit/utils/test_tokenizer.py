@@ -0,0 +1,38 @@
+import typing
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from top_assist.utils import tokenizer
+from top_assist.utils.tokenizer import count_tokens, truncate_to_tokens
+
+
+@pytest.fixture(autouse=True)
+def _clear_encoding_cache() -> typing.Generator:
+    getattr(tokenizer, "__encoding").cache_clear()
+    yield
+    getattr(tokenizer, "__encoding").cache_clear()
+
+
+def test_truncated_text_fits_the_token_limit() -> None:
+    # Given
+    text = "Top Assist answers questions about the company with the pages of its Confluence spaces. " * 10
+
+    # When
+    truncated = truncate_to_tokens(text, 20)
+
+    # Then
+    assert count_tokens(text) > 20
+    assert count_tokens(truncated) <= 20
+    assert text.startswith(truncated)
+    assert truncate_to_tokens("Short text", 20) == "Short text"
+
+
+def test_special_tokens_are_counted_as_plain_text() -> None:
+    assert count_tokens("<|endoftext|>") > 1
+
+
+@patch("top_assist.utils.tokenizer.tiktoken.encoding_for_model", new=MagicMock(side_effect=OSError("No network")))
+def test_tokens_are_estimated_when_the_tokenizer_cannot_be_loaded() -> None:
+    assert count_tokens("a" * 10) == 3
+    assert truncate_to_tokens("a" * 10, 2) == "a" * 8
@@ -5,7 +5,16 @@ from top_assist.utils.sentry_notifier import configure_sentry
 configure_logging()
 configure_sentry()
 
+from top_assist.database.llm_cache import LLMCacheDatabaseStorage  # noqa: E402
+from top_assist.database.page_access import PageAccessCacheDatabaseStorage  # noqa: E402
+from top_assist.database.rate_limits import RateLimitDatabaseStorage  # noqa: E402
 from top_assist.database.service_cooldowns import ServiceCooldownDatabaseStorage  # noqa: E402
+from top_assist.utils.llm_cache import configure_llm_cache  # noqa: E402
+from top_assist.utils.page_access_cache import configure_page_access_cache  # noqa: E402
+from top_assist.utils.rate_limiter import configure_rate_limiter  # noqa: E402
 from top_assist.utils.service_cooldown import configure_service_cooldown  # noqa: E402
 
 configure_service_cooldown(ServiceCooldownDatabaseStorage())
+configure_rate_limiter(RateLimitDatabaseStorage())
+configure_page_access_cache(PageAccessCacheDatabaseStorage())
+configure_llm_cache(LLMCacheDatabaseStorage())
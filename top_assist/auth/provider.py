@@ -12,6 +12,7 @@ from top_assist.configuration import (
 from top_assist.confluence.oauth import tokens_with_refresh_token
 from top_assist.confluence.policy import InvalidAuthError, PageAccessPolicy
 from top_assist.utils.cypher import Cypher
+from top_assist.utils.page_access_cache import invalidate_page_access
 
 from ._sign_in_context import sign_in_context_from_operation
 from ._sign_in_context import validate_operation_class as _validate_operation_class
@@ -40,6 +41,7 @@ def authorize_for(slack_user_id: str, operation: BaseModel) -> Generator[PageAcc
 
     except InvalidAuthError:
         db_user_auth.delete_by_slack_id(slack_user_id)
+        invalidate_page_access(slack_user_id)
         start_sign_in_flow(sign_in_context_from_operation(slack_user_id, operation))
         raise
 
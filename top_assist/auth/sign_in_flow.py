@@ -12,6 +12,7 @@ from top_assist.database import user_auth as db_user_auth
 from top_assist.slack.messages import delete_message, send_confluence_auth_link
 from top_assist.slack.profile import fetch_slack_email
 from top_assist.utils.cypher import Cypher
+from top_assist.utils.page_access_cache import invalidate_page_access
 from top_assist.utils.sentry_notifier import sentry_notify_issue
 
 from ._sign_in_context import (
@@ -130,6 +131,8 @@ def process_confluence_oauth_callback(
         refresh_token=_cypher.encrypt(tokens.refresh_token),
         expires_in=timedelta(seconds=tokens.expires_in),
     )
+    # The new token may see a different set of pages
+    invalidate_page_access(state.slack_user_id)
     delete_message(channel=state.slack_user_id, ts=result.old_auth_message_id)
 
     return SignInCompleted(pending_operation=state.resume_operation)
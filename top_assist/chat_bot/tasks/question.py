@@ -6,12 +6,13 @@ from pydantic import BaseModel
 
 import top_assist.database.interactions as db_interactions
 from top_assist.auth.provider import UnauthenticatedUserError, authorize_for
-from top_assist.configuration import slack_reply_questions_in_channels
+from top_assist.configuration import slack_reply_questions_in_channels, slack_stream_answers
 from top_assist.confluence.policy import PageAccessPolicy
 from top_assist.models.qa_interaction import QAInteractionDTO
 from top_assist.semantic_router.router import route as route_with_semantic_router
 from top_assist.semantic_router.types import HistoryEntry, SemanticRouterResponse
 from top_assist.slack.messages import (
+    StreamedAnswer,
     ask_for_feedback,
     mark_message_as_acknowledged,
     post_answer_on_slack,
@@ -85,10 +86,18 @@ def __process_question(question: QuestionEvent, policy: PageAccessPolicy) -> Non
     __send_question_asked_metric(question)
 
     interaction = __upsert_interaction(question)
-    completion = __process_query(interaction, policy)
+    streamed_answer = __start_streamed_answer(question) if slack_stream_answers else None
+    try:
+        completion = __process_query(interaction, policy, streamed_answer)
+
+        __store_answer(question, interaction, completion)
+        __post_answer_on_slack(question, completion.message, streamed_answer)
+    except Exception:
+        # The placeholder must not be left in the thread as if the answer was still being generated
+        if streamed_answer:
+            __discard_streamed_answer(streamed_answer)
+        raise
 
-    __store_answer(question, interaction, completion)
-    __post_answer_on_slack(question, completion.message)
     __track_answer_latency(question, latency_checkpoint_ts)
 
     __mark_answer_posted_on_slack(question, interaction)
@@ -122,11 +131,13 @@ def __upsert_interaction(question: QuestionEvent) -> QAInteractionDTO:
 def __process_query(
     interaction: QAInteractionDTO,
     policy: PageAccessPolicy,
+    streamed_answer: StreamedAnswer | None,
 ) -> SemanticRouterResponse:
     return route_with_semantic_router(
         history=__restore_thread_history(interaction),
         policy=policy,
         assistant_thread_id=interaction.assistant_thread_id,
+        on_partial_answer=streamed_answer.update if streamed_answer else None,
     )
 
 
@@ -143,12 +154,27 @@ def __store_answer(question: QuestionEvent, interaction: QAInteractionDTO, compl
         )
 
 
-def __post_answer_on_slack(question: QuestionEvent, response_text: str) -> None:
-    post_answer_on_slack(
-        response_text,
-        channel=question.channel,
-        thread_ts=question.thread_ts or question.ts,
-    )
+def __start_streamed_answer(question: QuestionEvent) -> StreamedAnswer:
+    return StreamedAnswer.start(channel=question.channel, thread_ts=question.thread_ts or question.ts)
+
+
+def __discard_streamed_answer(streamed_answer: StreamedAnswer) -> None:
+    # The error of answering is the one to report, it is re-raised after the placeholder is deleted
+    try:
+        streamed_answer.discard()
+    except Exception:
+        logging.exception("Failed to delete the streamed answer placeholder")
+
+
+def __post_answer_on_slack(question: QuestionEvent, response_text: str, streamed_answer: StreamedAnswer | None) -> None:
+    if streamed_answer:
+        streamed_answer.finish(response_text)
+    else:
+        post_answer_on_slack(
+            response_text,
+            channel=question.channel,
+            thread_ts=question.thread_ts or question.ts,
+        )
     logging.info("Answer posted on Slack thread", extra={"ts": question.ts})
 
 
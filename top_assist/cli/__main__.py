@@ -2,6 +2,8 @@ import argparse
 
 from top_assist.utils.tracer import ServiceNames, tracer
 
+from .benchmark_context import add_command as add_benchmark_context_command
+from .generate_digests import add_command as add_generate_digests_command
 from .import_spaces import add_command as add_import_spaces_command
 from .list_spaces import add_command as add_list_spaces_command
 from .update_pages import add_command as add_update_pages_command
@@ -15,6 +17,8 @@ def run() -> None:
     )
     subparsers = parser.add_subparsers(required=True)
 
+    add_benchmark_context_command(subparsers)
+    add_generate_digests_command(subparsers)
     add_import_spaces_command(subparsers)
     add_list_spaces_command(subparsers)
     add_update_pages_command(subparsers)
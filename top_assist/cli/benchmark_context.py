@@ -0,0 +1,40 @@
+import argparse
+
+import top_assist.database.pages as db_pages
+from top_assist.configuration import (
+    question_context_full_text_pages,
+    question_context_pages_count,
+    question_context_token_budget,
+)
+from top_assist.knowledge_base.context import pack_pages_context
+
+
+def add_command(parser: argparse._SubParsersAction) -> None:
+    description = "Compare the tokens of question contexts built from full page texts and from page digests"
+    command = parser.add_parser("benchmark_context", help=description, description=description)
+    command.add_argument("questions", help="Questions to build the contexts for", nargs="+")
+    command.set_defaults(func=__exec)
+
+
+def __exec(args: argparse.Namespace) -> None:
+    full_text_tokens = 0
+    digest_tokens = 0
+    for question in args.questions:
+        pages = db_pages.retrieve_relevant(question, count=question_context_pages_count)
+        full_text = pack_pages_context(pages, token_budget=question_context_token_budget)
+        digests = pack_pages_context(
+            pages, token_budget=question_context_token_budget, full_text_pages=question_context_full_text_pages
+        )
+        with_digest_count = sum(1 for page in pages[question_context_full_text_pages:] if page.digest)
+        print(
+            f"{question}: {full_text.token_count} tokens in full text, {digests.token_count} tokens with digests "
+            f"({with_digest_count} of {len(pages)} pages digested)"
+        )
+        full_text_tokens += full_text.token_count
+        digest_tokens += digests.token_count
+
+    questions_count = len(args.questions)
+    print(
+        f"Average per question: {full_text_tokens / questions_count:.0f} tokens in full text, "
+        f"{digest_tokens / questions_count:.0f} tokens with digests"
+    )
@@ -0,0 +1,25 @@
+import argparse
+
+import top_assist.database.pages as db_pages
+import top_assist.database.spaces as db_spaces
+from top_assist.configuration import import_batch_size
+from top_assist.knowledge_base.digests import generate_digests
+
+
+def add_command(parser: argparse._SubParsersAction) -> None:
+    description = "Generate the digests of imported pages which have no digest of their current content"
+    command = parser.add_parser("generate_digests", help=description, description=description)
+    command.add_argument("--space", help="Key of the space, all imported spaces by default", action="append")
+    command.set_defaults(func=__exec)
+
+
+def __exec(args: argparse.Namespace) -> None:
+    spaces = [space for space in db_spaces.all_spaces() if not args.space or space.key in args.space]
+    for space in spaces:
+        page_ids = db_pages.all_ids_by_space(space)
+        print(f"Generating digests of {len(page_ids)} pages of the space {space.key}...")
+        generated_count = 0
+        for start in range(0, len(page_ids), import_batch_size):
+            pages = db_pages.find_many_by_ids(page_ids[start : start + import_batch_size])
+            generated_count += generate_digests(pages)
+        print(f"Generated {generated_count} digests")
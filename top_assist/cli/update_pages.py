@@ -8,12 +8,15 @@ def add_command(parser: argparse._SubParsersAction) -> None:
     description = "Update Confluence pages from imported spaces"
     command = parser.add_parser("update_pages", help=description, description=description)
     command.add_argument("--export-stats", help="Export spaces stats to Confluence", action="store_true")
+    command.add_argument(
+        "--force", help="Update all spaces, also the ones which are not due for a sync yet", action="store_true"
+    )
     command.set_defaults(func=__exec)
 
 
 def __exec(args: argparse.Namespace) -> None:
     print("Updating pages...")
-    pull_updates()
+    pull_updates(force=args.force)
 
     if args.export_stats:
         print("Exporting spaces stats to Confluence...")
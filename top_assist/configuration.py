@@ -53,6 +53,42 @@ confluence_ignore_labels = [
     f'"{label}"' for label in os.environ.get("CONFLUENCE_IGNORE_LABELS", "top-assist-ignore").split(",") if label
 ]
 
+# Concurrency of Confluence API calls: total in-flight requests per process and page retrieval workers per space
+confluence_max_concurrent_requests = int(os.environ.get("TOP_ASSIST_CONFLUENCE_MAX_CONCURRENT_REQUESTS", "20"))
+confluence_space_workers_num = int(os.environ.get("TOP_ASSIST_CONFLUENCE_SPACE_WORKERS_NUM", "10"))
+# Number of per-user HTTP sessions (OAuth tokens) kept alive for Confluence access checks
+confluence_user_sessions_cache_size = int(os.environ.get("TOP_ASSIST_CONFLUENCE_USER_SESSIONS_CACHE_SIZE", "32"))
+# How long the result of a user's page access check is reused before asking Confluence again, 0 disables the cache
+page_access_cache_ttl_seconds = int(os.environ.get("TOP_ASSIST_PAGE_ACCESS_CACHE_TTL_SECONDS", "300"))
+
+# Token bucket shared by all processes for Confluence API calls. Bulk traffic (imports, updates) can not take
+# the last `interactive_reserve` tokens, so user-facing access checks keep flowing while an import is running.
+confluence_rate_limit_per_second = float(os.environ.get("TOP_ASSIST_CONFLUENCE_RATE_LIMIT_PER_SECOND", "10"))
+confluence_rate_limit_burst = float(os.environ.get("TOP_ASSIST_CONFLUENCE_RATE_LIMIT_BURST", "20"))
+confluence_rate_limit_interactive_reserve = float(
+    os.environ.get("TOP_ASSIST_CONFLUENCE_RATE_LIMIT_INTERACTIVE_RESERVE", "5")
+)
+# Bulk requests take this many tokens from the shared bucket at once, so that the processes do not contend for it
+# on every request
+confluence_rate_limit_batch_size = int(os.environ.get("TOP_ASSIST_CONFLUENCE_RATE_LIMIT_BATCH_SIZE", "5"))
+confluence_rate_limit_max_attempts = int(os.environ.get("TOP_ASSIST_CONFLUENCE_RATE_LIMIT_MAX_ATTEMPTS", "3"))
+
+# Number of spaces processed concurrently while pulling updates
+sync_spaces_workers_num = int(os.environ.get("TOP_ASSIST_SYNC_SPACES_WORKERS_NUM", "4"))
+
+# Bounds of the per-space sync interval: it shrinks while the space keeps changing and grows while it does not,
+# pulling updates skips spaces which are not due yet (unless forced)
+space_sync_min_interval_minutes = int(os.environ.get("TOP_ASSIST_SPACE_SYNC_MIN_INTERVAL_MINUTES", "15"))
+space_sync_max_interval_minutes = int(os.environ.get("TOP_ASSIST_SPACE_SYNC_MAX_INTERVAL_MINUTES", "1440"))
+
+# Maximum delay before deleted, archived or ignored by label pages are removed from a space whose page count
+# did not change (a changed count triggers the removal on the next pull of updates)
+space_pages_full_diff_interval_minutes = int(os.environ.get("TOP_ASSIST_SPACE_PAGES_FULL_DIFF_INTERVAL_MINUTES", "360"))
+
+# Shared secret of the Confluence webhooks (HMAC-SHA256 signature), the webhook endpoint is disabled without it
+confluence_webhook_secret = os.environ.get("CONFLUENCE_WEBHOOK_SECRET", "")
+confluence_webhook_dedupe_seconds = int(os.environ.get("TOP_ASSIST_CONFLUENCE_WEBHOOK_DEDUPE_SECONDS", "300"))
+
 # Initial URL to start the OAuth flow with Top assist on Confluence, useful if you have frontpage/proxy and need to access Top Assist before the Conflunce OAuth page
 confluence_oauth_top_assist_redirect_url_template = os.environ["CONFLUENCE_OAUTH_TOP_ASSIST_REDIRECT_URL_TEMPLATE"]
 
@@ -83,10 +119,25 @@ slack_allow_enterprise_id = os.environ["SLACK_ALLOW_ENTERPRISE_ID"]
 slack_allow_team_id = os.environ["SLACK_ALLOW_TEAM_ID"]
 slack_reply_questions_in_channels = __bool_env("SLACK_REPLY_QUESTIONS_IN_CHANNELS", default="false")
 slack_listener_workers_num = int(os.environ.get("TOP_ASSIST_SLACK_LISTENER_WORKERS_NUM", "4"))
+# Post the answer while it is generated, editing the message at most once per interval (chat.update is rate limited)
+slack_stream_answers = __bool_env("TOP_ASSIST_SLACK_STREAM_ANSWERS", default="true")
+slack_stream_update_interval_seconds = float(os.environ.get("TOP_ASSIST_SLACK_STREAM_UPDATE_INTERVAL_SECONDS", "1.5"))
 
 # OpenAI configuration
 open_ai_api_key = os.environ["OPENAI_API_KEY"]
 
+# Connections to OpenAI are kept alive and shared by all requests of a process
+open_ai_max_connections = int(os.environ.get("TOP_ASSIST_OPENAI_MAX_CONNECTIONS", "20"))
+open_ai_keepalive_expiry_seconds = float(os.environ.get("TOP_ASSIST_OPENAI_KEEPALIVE_EXPIRY_SECONDS", "120"))
+# Assistant runs not finished before the timeout are cancelled
+open_ai_run_timeout_seconds = float(os.environ.get("TOP_ASSIST_OPENAI_RUN_TIMEOUT_SECONDS", "120"))
+
+# Completion backend of the tools, see top_assist.open_ai.chat.CompletionBackend:
+# "assistants" keeps the conversation in OpenAI Assistants threads,
+# "chat" sends the conversation stored by Top Assist in a single Chat Completions request
+knowledge_base_completion_backend = os.environ.get("TOP_ASSIST_KNOWLEDGE_BASE_COMPLETION_BACKEND", "assistants")
+chatgpt_completion_backend = os.environ.get("TOP_ASSIST_CHATGPT_COMPLETION_BACKEND", "assistants")
+
 # Assistant IDs
 qa_assistant_id = os.environ["OPENAI_ASSISTANT_ID_QA"]
 base_assistant_id = os.environ["OPENAI_ASSISTANT_ID_BASE"]
@@ -103,9 +154,56 @@ embedding_workers_num = int(os.environ.get("TOP_ASSIST_EMBEDDING_WORKERS_NUM", "
 embedding_chunk_size = int(os.environ.get("TOP_ASSIST_EMBEDDING_CHUNK_SIZE", "500"))
 embedding_chunk_sleep_seconds = int(os.environ.get("TOP_ASSIST_EMBEDDING_CHUNK_SLEEP_SECONDS", "10"))
 
+# Space imports are fetched, stored and embedded in batches of pages, progress is checkpointed after each batch
+import_batch_size = int(os.environ.get("TOP_ASSIST_IMPORT_BATCH_SIZE", "100"))
+# Page digests: dense summaries generated on import, sent as context instead of the full text of lower-ranked pages
+page_digests_enabled = __bool_env("TOP_ASSIST_PAGE_DIGESTS_ENABLED", default="false")
+page_digest_workers_num = int(os.environ.get("TOP_ASSIST_PAGE_DIGEST_WORKERS_NUM", "4"))
+
+# Background jobs worker (bin/worker): imports, updates and webhook page refreshes
+worker_concurrency = int(os.environ.get("TOP_ASSIST_WORKER_CONCURRENCY", "2"))
+worker_poll_seconds = float(os.environ.get("TOP_ASSIST_WORKER_POLL_SECONDS", "5"))
+job_max_attempts = int(os.environ.get("TOP_ASSIST_JOB_MAX_ATTEMPTS", "3"))
+# Delay before the first retry of a failed job, doubled on each next attempt
+job_retry_backoff_seconds = float(os.environ.get("TOP_ASSIST_JOB_RETRY_BACKOFF_SECONDS", "60"))
+# Running jobs without a heartbeat for this long are considered abandoned by a killed worker and queued again
+job_stale_seconds = float(os.environ.get("TOP_ASSIST_JOB_STALE_SECONDS", "300"))
+
 # page retrieval for answering questions
 # document count is recommended from 3 to 15 where 3 is minimum cost and 15 is maximum comprehensive answer
 question_context_pages_count = 5
+# Candidates retrieved per context page, pages the user cannot access are replaced by the next relevant candidates
+question_context_overfetch_factor = int(os.environ.get("TOP_ASSIST_QUESTION_CONTEXT_OVERFETCH_FACTOR", "3"))
+# Tokens of the pages sent along with a question, keeps the prompt size (and with it latency and cost) predictable
+question_context_token_budget = int(os.environ.get("TOP_ASSIST_QUESTION_CONTEXT_TOKEN_BUDGET", "8000"))
+# With page digests enabled, the most relevant pages of a question context are sent in full text and the others as digests
+question_context_full_text_pages = int(os.environ.get("TOP_ASSIST_QUESTION_CONTEXT_FULL_TEXT_PAGES", "1"))
+# Size of the process-local cache of frequently used pages (compressed), saves loading their content for every question
+page_cache_max_bytes = int(os.environ.get("TOP_ASSIST_PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Fast tool routing: questions are routed by the explicit triggers of the tools or by their similarity to examples
+# of the tools, the tool choice model is only asked when the best tool is not ahead of the next one by the margin
+tool_router_enabled = __bool_env("TOP_ASSIST_TOOL_ROUTER_ENABLED", default="true")
+tool_router_min_margin = float(os.environ.get("TOP_ASSIST_TOOL_ROUTER_MIN_MARGIN", "0.1"))
+# Responses of the routing model calls reused for identical prompts (e.g. retried or duplicate questions),
+# 0 disables the cache
+llm_cache_ttl_seconds = int(os.environ.get("TOP_ASSIST_LLM_CACHE_TTL_SECONDS", "86400"))
+llm_cache_question_generator_enabled = __bool_env("TOP_ASSIST_LLM_CACHE_QUESTION_GENERATOR_ENABLED", default="true")
+llm_cache_tool_choice_enabled = __bool_env("TOP_ASSIST_LLM_CACHE_TOOL_CHOICE_ENABLED", default="true")
+llm_cache_question_generator_with_tool_choice_enabled = __bool_env(
+    "TOP_ASSIST_LLM_CACHE_QUESTION_GENERATOR_WITH_TOOL_CHOICE_ENABLED", default="true"
+)
+llm_cache_prompt_optimizer_enabled = __bool_env("TOP_ASSIST_LLM_CACHE_PROMPT_OPTIMIZER_ENABLED", default="true")
+# Start the knowledge base retrieval of first questions while their tool is being chosen
+speculative_retrieval_enabled = __bool_env("TOP_ASSIST_SPECULATIVE_RETRIEVAL_ENABLED", default="true")
+# Prepare follow-up questions and choose their tool with a single model call instead of one call for each
+router_single_call_enabled = __bool_env("TOP_ASSIST_ROUTER_SINGLE_CALL_ENABLED", default="false")
+
+# Semantic answer cache: first questions similar to an answered one reuse its answer while its pages are unchanged
+answer_cache_enabled = __bool_env("TOP_ASSIST_ANSWER_CACHE_ENABLED", default="true")
+# Minimal similarity (certainty/score of the vector database) of the questions for an answer to be reused
+answer_cache_certainty_threshold = float(os.environ.get("TOP_ASSIST_ANSWER_CACHE_CERTAINTY_THRESHOLD", "0.95"))
+answer_cache_max_age_hours = int(os.environ.get("TOP_ASSIST_ANSWER_CACHE_MAX_AGE_HOURS", "168"))
 
 # Logs
 logs_file = os.environ.get("TOP_ASSIST_LOGS_FILE")
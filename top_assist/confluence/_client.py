@@ -1,18 +1,156 @@
+import hashlib
 import logging
+import os
+import threading
 import time
 import typing
+from collections import OrderedDict
 from collections.abc import Generator
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
 
+import requests
 from atlassian import Confluence
-from requests import Session
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
 
-from top_assist.configuration import confluence_api_token, confluence_base_url, confluence_cloud_id, confluence_username
+from top_assist.configuration import (
+    confluence_api_token,
+    confluence_base_url,
+    confluence_cloud_id,
+    confluence_max_concurrent_requests,
+    confluence_rate_limit_batch_size,
+    confluence_rate_limit_burst,
+    confluence_rate_limit_interactive_reserve,
+    confluence_rate_limit_max_attempts,
+    confluence_rate_limit_per_second,
+    confluence_user_sessions_cache_size,
+    confluence_username,
+)
+from top_assist.utils.metrics import RATE_LIMITED_RESPONSES_METRIC
+from top_assist.utils.rate_limiter import RateLimit, RateLimitPriority, acquire_rate_limit, pause_rate_limit
 
 
 class InvalidAccessTokenError(Exception):
     pass
 
 
+class _ThrottledSession(Session):
+    """HTTP session sharing the Confluence rate limit of all processes and the in-flight requests budget of a process.
+
+    Responses rejected with HTTP 429 pause the shared rate limit for the Retry-After time and are retried.
+    """
+
+    def __init__(self, priority: RateLimitPriority) -> None:
+        super().__init__()
+        self.priority = priority
+
+    def request(self, *args: typing.Any, **kwargs: typing.Any) -> Response:  # noqa: ANN401
+        attempt = 1
+        while True:
+            acquire_rate_limit(_RATE_LIMIT_BUCKET_KEY, _rate_limit, self.priority)
+            with _requests_budget:
+                response = super().request(*args, **kwargs)
+
+            if response.status_code != requests.codes.too_many_requests:
+                return response
+
+            RATE_LIMITED_RESPONSES_METRIC.labels(bucket=_RATE_LIMIT_BUCKET_KEY).inc()
+            if attempt >= confluence_rate_limit_max_attempts:
+                logging.error("Confluence rate limit give up", extra={"url": response.url, "attempts": attempt})
+                return response
+
+            pause_rate_limit(_RATE_LIMIT_BUCKET_KEY, _rate_limit, self._retry_after_seconds(response))
+            attempt += 1
+
+    @staticmethod
+    def _retry_after_seconds(response: Response) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return _DEFAULT_RETRY_AFTER_SECONDS
+
+        if retry_after.isdigit():
+            return float(retry_after)
+
+        try:
+            return max((parsedate_to_datetime(retry_after) - datetime.now(UTC)).total_seconds(), 0)
+        except (TypeError, ValueError):
+            return _DEFAULT_RETRY_AFTER_SECONDS
+
+
+_RATE_LIMIT_BUCKET_KEY = "confluence"
+_DEFAULT_RETRY_AFTER_SECONDS = 5.0
+_rate_limit = RateLimit(
+    per_second=confluence_rate_limit_per_second,
+    burst=confluence_rate_limit_burst,
+    interactive_reserve=confluence_rate_limit_interactive_reserve,
+    batch_size=confluence_rate_limit_batch_size,
+)
+_requests_budget = threading.BoundedSemaphore(confluence_max_concurrent_requests)
+
+
+class _SessionPool:
+    """Process-wide HTTP sessions, so that Confluence calls reuse kept-alive connections instead of opening new ones.
+
+    The service account has a single session with a connection pool sized to the in-flight requests budget.
+    OAuth calls get a session per user, the least recently used ones are dropped when the pool is full.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._service_account_session: _ThrottledSession | None = None
+        self._user_sessions: OrderedDict[str, _ThrottledSession] = OrderedDict()
+
+    def service_account_session(self) -> _ThrottledSession:
+        with self._lock:
+            if self._service_account_session is None:
+                self._service_account_session = self._new_session(
+                    RateLimitPriority.bulk, pool_maxsize=confluence_max_concurrent_requests
+                )
+
+            return self._service_account_session
+
+    def user_session(self, access_token: str) -> _ThrottledSession:
+        # Tokens are kept out of the keys, so that they do not stay in memory after the session is dropped
+        key = hashlib.sha256(access_token.encode()).hexdigest()
+        with self._lock:
+            session = self._user_sessions.get(key)
+            if session:
+                self._user_sessions.move_to_end(key)
+                return session
+
+            # User tokens are used for interactive requests only (access checks), so they go ahead of bulk imports
+            session = self._new_session(RateLimitPriority.interactive)
+            session.headers["Authorization"] = f"Bearer {access_token}"
+            self._user_sessions[key] = session
+            if len(self._user_sessions) > confluence_user_sessions_cache_size:
+                # Not closed explicitly, another thread may still use it; connections are released with the session
+                self._user_sessions.popitem(last=False)
+
+            return session
+
+    @staticmethod
+    def _new_session(priority: RateLimitPriority, *, pool_maxsize: int = 10) -> _ThrottledSession:
+        session = _ThrottledSession(priority)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+
+_session_pool = _SessionPool()
+
+
+def __reset_after_fork() -> None:
+    """Connections and semaphore state inherited from the parent must not be shared by a forked worker process."""
+    global _session_pool, _requests_budget  # noqa: PLW0603
+    _session_pool = _SessionPool()
+    _requests_budget = threading.BoundedSemaphore(confluence_max_concurrent_requests)
+
+
+os.register_at_fork(after_in_child=__reset_after_fork)
+
+
 class ConfluenceClient:
     """A class to handle interactions with the Confluence API."""
 
@@ -21,10 +159,10 @@ class ConfluenceClient:
         if not access_token:
             raise InvalidAccessTokenError
 
-        session = Session()
-        session.headers["Authorization"] = f"Bearer {access_token}"
-
-        sdk_client = Confluence(url=f"https://api.atlassian.com/ex/confluence/{confluence_cloud_id}/", session=session)
+        sdk_client = Confluence(
+            url=f"https://api.atlassian.com/ex/confluence/{confluence_cloud_id}/",
+            session=_session_pool.user_session(access_token),
+        )
 
         return cls(sdk_client)
 
@@ -41,6 +179,7 @@ class ConfluenceClient:
                 url=confluence_base_url,
                 username=confluence_username,
                 password=confluence_api_token,
+                session=_session_pool.service_account_session(),
             )
 
     def page_exists(self, space_key: str, title: str) -> bool:
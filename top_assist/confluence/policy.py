@@ -2,6 +2,8 @@ import logging
 
 import requests
 
+from top_assist.utils.page_access_cache import cache_page_access, cached_page_access
+
 from ._client import ConfluenceClient
 
 
@@ -28,6 +30,8 @@ class PageAccessPolicy:
 def accessible_page_ids(page_ids: list[str], *, slack_user_id: str, user_confluence_access_token: str) -> set[str]:
     """Filter out pages that the user does not have access to.
 
+    Access checked within the cache TTL is reused, only the other pages are checked in Confluence.
+
     Args:
         page_ids: List of page IDs to check access for.
         slack_user_id: Slack user ID.
@@ -39,12 +43,38 @@ def accessible_page_ids(page_ids: list[str], *, slack_user_id: str, user_conflue
     if not page_ids:
         return set()
 
+    cached_access = cached_page_access(slack_user_id, page_ids)
+    allowed_page_ids = {page_id for page_id, allowed in cached_access.items() if allowed}
+    unchecked_page_ids = [page_id for page_id in page_ids if page_id not in cached_access]
+    logging.debug(
+        "Page access cache",
+        extra={
+            "slack_user_id": slack_user_id,
+            "cached_count": len(cached_access),
+            "unchecked_count": len(unchecked_page_ids),
+        },
+    )
+    if not unchecked_page_ids:
+        return allowed_page_ids
+
+    checked_page_ids = __check_page_access(
+        unchecked_page_ids, slack_user_id=slack_user_id, user_confluence_access_token=user_confluence_access_token
+    )
+    cache_page_access(slack_user_id, {page_id: page_id in checked_page_ids for page_id in unchecked_page_ids})
+    return allowed_page_ids | checked_page_ids
+
+
+def __check_page_access(page_ids: list[str], *, slack_user_id: str, user_confluence_access_token: str) -> set[str]:
     client = ConfluenceClient.with_access_token(user_confluence_access_token)
     cql_query = f"id in ({",".join(page_ids)})"
 
     try:
-        results = client.cql_search(cql=cql_query)
-        allowed_page_ids = {page["content"]["id"] for page in results}  # Use set for faster lookups
+        # Page through all results: ids left out of a truncated result would be cached as denied
+        allowed_page_ids = {
+            page["content"]["id"]
+            for chunk in client.cql_paginated_fetcher(cql_query, limit=len(page_ids))
+            for page in chunk
+        }
         logging.debug(
             "Pages filtered by access", extra={"slack_user_id": slack_user_id, "allowed_page_ids": allowed_page_ids}
         )
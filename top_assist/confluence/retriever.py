@@ -6,7 +6,7 @@ from datetime import datetime
 from atlassian.errors import ApiError, ApiPermissionError  # type: ignore[import-untyped]
 from bs4 import BeautifulSoup
 
-from top_assist.configuration import confluence_ignore_labels
+from top_assist.configuration import confluence_ignore_labels, confluence_space_workers_num
 from top_assist.models.page_data import PageDataDTO
 from top_assist.utils.tracer import ServiceNames, tracer
 
@@ -66,6 +66,18 @@ def retrieve_space_with_date(
     return pages
 
 
+@tracer.wrap(service=ServiceNames.confluence.value)
+def retrieve_pages(space_key: str, page_ids: list[str]) -> list[PageDataDTO | InaccessiblePage]:
+    """Retrieve the given pages of the space, e.g. a batch of a larger import."""
+    return __retrieve_pages(space_key, page_ids)
+
+
+@tracer.wrap(service=ServiceNames.confluence.value)
+def retrieve_page(space_key: str, page_id: str) -> PageDataDTO | InaccessiblePage:
+    """Retrieve a single page of the space, e.g. when Confluence notifies about a change."""
+    return __retrieve_page(page_id, space_key)
+
+
 def get_space_page_ids(space_key: str, status: str | None = None) -> list[str]:
     """Retrieves all page IDs in a given space, including child pages.
 
@@ -78,12 +90,11 @@ def get_space_page_ids(space_key: str, status: str | None = None) -> list[str]:
     """
     page_ids = []
     start = 0
-    limit = 50
+    limit = 250  # maximum page size of the content API, only ids are used so nothing is expanded
     client = Client().confluence
     while True:
         try:
-            chunk = client.get_all_pages_from_space(space_key, start=start, limit=limit, status=status)
-            start += limit
+            chunk = client.get_all_pages_from_space(space_key, start=start, limit=limit, status=status, expand=None)
 
         except ApiPermissionError as e:
             logging.exception("Permission error", extra={"space_key": space_key})
@@ -93,15 +104,29 @@ def get_space_page_ids(space_key: str, status: str | None = None) -> list[str]:
             logging.exception("Error fetching pages", extra={"space_key": space_key, "limit": limit, "start": start})
             raise
 
-        page_ids.extend([page["id"] for page in chunk])
-        if len(chunk) < limit:
+        # the API may cap the page size below the requested limit, so only an empty chunk means the end
+        if not chunk:
             break
+
+        page_ids.extend([page["id"] for page in chunk])
+        start += len(chunk)
     page_ids = list(set(page_ids))
     logging.info("Discovered pages for retrieval", extra={"space_key": space_key, "count": len(page_ids)})
 
     return page_ids
 
 
+def count_space_pages(space_key: str) -> int:
+    """Count the current pages in a given space with a single request, without listing them."""
+    try:
+        response = Client().confluence.cql(f'type=page and space="{space_key}"', limit=1)
+    except ApiPermissionError as e:
+        logging.exception("Permission error", extra={"space_key": space_key})
+        raise InaccessibleSpaceError from e
+
+    return response["totalSize"]
+
+
 def get_space_page_ids_by_label(space_key: str, labels: list[str]) -> list[str]:
     """Retrieves all page IDs in a given space, including child pages, that include the specified labels."""
     if not labels:
@@ -118,6 +143,15 @@ def get_space_page_ids_by_label(space_key: str, labels: list[str]) -> list[str]:
     return page_ids
 
 
+def is_page_labeled(space_key: str, page_id: str, labels: list[str]) -> bool:
+    """Check whether the page has any of the specified labels."""
+    if not labels:
+        raise MissingLabelsError
+
+    cql = f'type=page and id={page_id} and label in ({", ".join(labels)})'
+    return bool(__query_page_ids_with_cql(space_key, cql))
+
+
 def __get_space_updated_page_ids(
     space_key: str, updated_after: datetime, ignore_labels: list[str] = confluence_ignore_labels
 ) -> list[str]:
@@ -244,7 +278,7 @@ def __retrieve_pages(space_key: str, page_ids: list[str]) -> list[PageDataDTO |
     def worker(page_id: str) -> PageDataDTO | InaccessiblePage:
         return __retrieve_page(page_id, space_key)
 
-    with ThreadPoolExecutor(max_workers=10) as executor:
+    with ThreadPoolExecutor(max_workers=confluence_space_workers_num) as executor:
         pages = executor.map(worker, page_ids)
         return list(pages)
 
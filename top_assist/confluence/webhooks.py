@@ -0,0 +1,137 @@
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
+
+from top_assist.configuration import confluence_webhook_dedupe_seconds, confluence_webhook_secret
+
+
+class WebhookAction(str, Enum):
+    """What the knowledge base has to do for a Confluence webhook event."""
+
+    refresh_page = "refresh_page"
+    remove_page = "remove_page"
+    remove_space = "remove_space"
+
+
+_EVENT_ACTIONS = {
+    "page_created": WebhookAction.refresh_page,
+    "page_updated": WebhookAction.refresh_page,
+    "page_restored": WebhookAction.refresh_page,
+    "page_moved": WebhookAction.refresh_page,
+    "page_unarchived": WebhookAction.refresh_page,
+    # the page is re-checked for the ignore labels when refreshed
+    "label_added": WebhookAction.refresh_page,
+    "label_removed": WebhookAction.refresh_page,
+    "page_removed": WebhookAction.remove_page,
+    "page_trashed": WebhookAction.remove_page,
+    "page_archived": WebhookAction.remove_page,
+    "space_archived": WebhookAction.remove_space,
+    "space_removed": WebhookAction.remove_space,
+}
+
+
+class WebhookPage(BaseModel):  # noqa: D101
+    # Confluence sends page ids as numbers, they are strings everywhere else
+    model_config = ConfigDict(coerce_numbers_to_str=True)
+
+    id: str
+    space_key: str = Field(validation_alias=AliasChoices("spaceKey", "space_key"))
+    version: int | None = None
+    # Set for the labeled content of label events, which may also be a blog post or an attachment
+    content_type: str | None = Field(default=None, validation_alias=AliasChoices("contentType", "content_type"))
+
+
+class WebhookSpace(BaseModel):  # noqa: D101
+    key: str
+
+
+class WebhookEvent(BaseModel):
+    """Payload of a Confluence webhook, only the fields used by Top Assist.
+
+    Attr:
+        event: The name of the event, e.g. page_updated.
+        timestamp: Milliseconds since epoch when the event happened.
+        page: The page of page events, or the labeled content of label events (sent as "labeled").
+        space: The space of space events.
+    """
+
+    event: str = Field(validation_alias=AliasChoices("webhookEvent", "event"))
+    timestamp: int
+    page: WebhookPage | None = Field(default=None, validation_alias=AliasChoices("page", "labeled"))
+    space: WebhookSpace | None = None
+
+    @property
+    def action(self) -> WebhookAction | None:
+        action = _EVENT_ACTIONS.get(self.event)
+        if action == WebhookAction.remove_space:
+            return action if self.space else None
+
+        is_page = self.page is not None and self.page.content_type in (None, "page")
+        return action if is_page else None
+
+    @property
+    def dedupe_key(self) -> str:
+        if self.page:
+            return f"{self.event}:{self.page.id}:{self.page.version or self.timestamp}"
+
+        return f"{self.event}:{self.space.key if self.space else ""}:{self.timestamp}"
+
+
+def is_webhook_enabled() -> bool:
+    return bool(confluence_webhook_secret)
+
+
+def is_valid_signature(body: bytes, signature: str | None) -> bool:
+    """Check the `X-Hub-Signature: sha256=<hex>` header, the HMAC of the raw body with the shared webhook secret."""
+    if not signature or not confluence_webhook_secret:
+        return False
+
+    expected = hmac.new(confluence_webhook_secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(signature.removeprefix("sha256="), expected)
+
+
+def is_duplicate(event: WebhookEvent) -> bool:
+    """Confluence retries deliveries and sends several events for a single edit, each is processed once."""
+    return _recent_events.seen(event.dedupe_key)
+
+
+def mark_processed(event: WebhookEvent) -> None:
+    """Only a processed event is a duplicate, a delivery failed with an error is processed again on retry."""
+    _recent_events.add(event.dedupe_key)
+
+
+class _RecentEvents:
+    """Keys seen in the last `ttl_seconds`, bounded to `max_size` entries."""
+
+    def __init__(self, *, ttl_seconds: float, max_size: int) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._seen_at: OrderedDict[str, float] = OrderedDict()
+
+    def seen(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            return key in self._seen_at
+
+    def add(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            self._seen_at.pop(key, None)
+            self._seen_at[key] = now
+            if len(self._seen_at) > self._max_size:
+                self._seen_at.popitem(last=False)
+
+    def _expire(self, now: float) -> None:
+        while self._seen_at and next(iter(self._seen_at.values())) < now - self._ttl_seconds:
+            self._seen_at.popitem(last=False)
+
+
+_recent_events = _RecentEvents(ttl_seconds=confluence_webhook_dedupe_seconds, max_size=10_000)
@@ -0,0 +1,71 @@
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+
+from top_assist.configuration import page_cache_max_bytes
+from top_assist.models.page_data import PageDataDTO
+from top_assist.utils.metrics import PAGE_CACHE_BYTES_METRIC, PAGE_CACHE_LOOKUPS_METRIC
+
+# The last update of the page in Confluence and the content hash its digest was generated from
+PageVersion = tuple[datetime, str | None]
+
+
+class _PageCache:
+    """Process-local LRU cache of pages, bounded by the size of their compressed JSON.
+
+    Entries are keyed by page ID and hold the version of the page, a page updated or digested
+    since it was cached is a miss. The version is compared, as the other processes only update the database.
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[PageVersion, bytes]] = OrderedDict()
+        self._size = 0
+
+    def get(self, page_id: str, version: PageVersion) -> PageDataDTO | None:
+        with self._lock:
+            entry = self._entries.get(page_id)
+            if entry and entry[0] == version:
+                self._entries.move_to_end(page_id)
+            else:
+                entry = None
+
+        PAGE_CACHE_LOOKUPS_METRIC.labels(result="hit" if entry else "miss").inc()
+        return PageDataDTO.model_validate_json(zlib.decompress(entry[1])) if entry else None
+
+    def put(self, page: PageDataDTO, version: PageVersion) -> None:
+        data = zlib.compress(page.model_dump_json().encode())
+        if len(data) > self._max_bytes:
+            return
+
+        with self._lock:
+            self._remove(page.page_id)
+            self._entries[page.page_id] = (version, data)
+            self._size += len(data)
+            while self._size > self._max_bytes:
+                self._remove(next(iter(self._entries)))
+            PAGE_CACHE_BYTES_METRIC.set(self._size)
+
+    def invalidate(self, page_ids: list[str]) -> None:
+        with self._lock:
+            for page_id in page_ids:
+                self._remove(page_id)
+            PAGE_CACHE_BYTES_METRIC.set(self._size)
+
+    def reset_lock(self) -> None:
+        """The lock may be held by a thread of the parent process at fork, the cached pages themselves stay valid."""
+        self._lock = threading.Lock()
+
+    def _remove(self, page_id: str) -> None:
+        entry = self._entries.pop(page_id, None)
+        if entry:
+            self._size -= len(entry[1])
+
+
+page_cache = _PageCache(max_bytes=page_cache_max_bytes)
+
+
+os.register_at_fork(after_in_child=page_cache.reset_lock)
@@ -0,0 +1,32 @@
+from top_assist.utils.tracer import ServiceNames, tracer
+
+from .engine import delete_items, retrieve_neighbour_ids_by_embedding, upsert_embeddings
+
+_COLLECTION_NAME = "answers"
+
+
+@tracer.wrap(service=ServiceNames.vector_db.value, resource="vector.answers.importer.import_embedding")
+def import_embedding(answer_id: str, question_embedding: list[float]) -> None:
+    """Insert the embedding of an answered question into the vector database."""
+    upsert_embeddings(_COLLECTION_NAME, [(answer_id, question_embedding)])
+
+
+@tracer.wrap(service=ServiceNames.vector_db.value, resource="vector.answers.retriever.retrieve_similar_id")
+def retrieve_similar_id(question_embedding: list[float], certainty_threshold: float) -> str | None:
+    """Retrieve the ID of the answer to the question most similar to the given one, if similar enough.
+
+    The collection is created with the first cached answer, there is no similar answer until then.
+    """
+    ids = retrieve_neighbour_ids_by_embedding(
+        question_embedding,
+        collection_name=_COLLECTION_NAME,
+        count=1,
+        certainty_threshold=certainty_threshold,
+        missing_collection_ok=True,
+    )
+    return ids[0] if ids else None
+
+
+@tracer.wrap(service=ServiceNames.vector_db.value, resource="vector.answers.retriever.delete_embeddings")
+def delete_embeddings(answer_ids: list[str]) -> None:
+    delete_items(_COLLECTION_NAME, answer_ids)
@@ -16,6 +16,7 @@ from top_assist.open_ai.embeddings import embed_text
 
 if qdrant_url:
     TYPE = "qdrant"
+    from .engines.qdrant import CollectionDoesNotExistError
     from .engines.qdrant import all_embeddings as _all_embeddings
     from .engines.qdrant import count as _count
     from .engines.qdrant import delete_items as _delete_items
@@ -23,6 +24,7 @@ if qdrant_url:
     from .engines.qdrant import upsert as _upsert
 else:
     TYPE = "weaviate"
+    from .engines.weaviate import CollectionDoesNotExistError
     from .engines.weaviate import all_embeddings as _all_embeddings
     from .engines.weaviate import count as _count
     from .engines.weaviate import delete_items as _delete_items
@@ -61,17 +63,44 @@ def count(collection_name: str) -> int:
     return _count(collection_name)
 
 
-def retrieve_neighbour_ids(
-    query: str, *, collection_name: str, count: int, certainty_threshold: float = _DEFAULT_CERTAINTY_THRESHOLD
-) -> list[str]:
+def upsert_embeddings(collection_name: str, id_embedding_pairs: list[tuple[str, list[float]]]) -> None:
+    """Insert already generated embeddings."""
+    __insert_data(id_embedding_pairs, collection_name)
+
+
+def embed_query(query: str) -> list[float]:
     try:
-        query_embedding = embed_text(text=query, model=embedding_model_id)
+        return embed_text(text=query, model=embedding_model_id)
     except Exception:
-        logging.exception("Error generating query embedding", extra={"collection_name": collection_name})
+        logging.exception("Error generating query embedding")
         raise
 
+
+def retrieve_neighbour_ids(
+    query: str, *, collection_name: str, count: int, certainty_threshold: float = _DEFAULT_CERTAINTY_THRESHOLD
+) -> list[str]:
+    return retrieve_neighbour_ids_by_embedding(
+        embed_query(query), collection_name=collection_name, count=count, certainty_threshold=certainty_threshold
+    )
+
+
+def retrieve_neighbour_ids_by_embedding(
+    query_embedding: list[float],
+    *,
+    collection_name: str,
+    count: int,
+    certainty_threshold: float = _DEFAULT_CERTAINTY_THRESHOLD,
+    missing_collection_ok: bool = False,
+) -> list[str]:
+    """With `missing_collection_ok`, a collection not created yet has no neighbours instead of being an error."""
     try:
         item_ids = _retrieve_neighbour_ids(collection_name, query_embedding, count, certainty_threshold)
+    except CollectionDoesNotExistError:
+        if not missing_collection_ok:
+            logging.exception("Error retrieving relevant IDs", extra={"collection_name": collection_name})
+            raise
+
+        return []
     except Exception:
         logging.exception("Error retrieving relevant IDs", extra={"collection_name": collection_name})
         raise
@@ -84,6 +113,9 @@ __all__ = [
     "import_items",
     "all_embeddings",
     "retrieve_neighbour_ids",
+    "retrieve_neighbour_ids_by_embedding",
+    "embed_query",
+    "upsert_embeddings",
     "ItemToEmbed",
     "EmtpyEmbeddingError",
     "delete_items",
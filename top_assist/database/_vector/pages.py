@@ -2,7 +2,7 @@ from top_assist.configuration import pages_certainty_threshold
 from top_assist.models.page_data import PageDataDTO
 from top_assist.utils.tracer import ServiceNames, tracer
 
-from .engine import ItemToEmbed, delete_items, import_items, retrieve_neighbour_ids
+from .engine import ItemToEmbed, delete_items, import_items, retrieve_neighbour_ids_by_embedding
 from .engine import all_embeddings as _all_embeddings
 from .engine import count as _count
 
@@ -22,10 +22,10 @@ def import_data(pages: list[PageDataDTO]) -> None:
 
 
 @tracer.wrap(service=ServiceNames.vector_db.value, resource="vector.pages.retriever.retrieve_relevant_ids")
-def retrieve_relevant_ids(query: str, count: int) -> list[str]:
+def retrieve_relevant_ids(query_embedding: list[float], count: int) -> list[str]:
     """Retrieve page IDs most relevant to the query."""
-    return retrieve_neighbour_ids(
-        query, collection_name=_COLLECTION_NAME, count=count, certainty_threshold=pages_certainty_threshold
+    return retrieve_neighbour_ids_by_embedding(
+        query_embedding, collection_name=_COLLECTION_NAME, count=count, certainty_threshold=pages_certainty_threshold
     )
 
 
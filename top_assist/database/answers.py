@@ -0,0 +1,52 @@
+import logging
+from datetime import UTC, datetime
+
+from top_assist.models.cached_answer import CachedAnswerDTO, CachedAnswerORM
+from top_assist.models.page_data import PageDataDTO
+
+from ._vector import answers as vector_answers
+from .database import get_db_session
+
+
+def find_similar(question_embedding: list[float], *, certainty_threshold: float) -> CachedAnswerDTO | None:
+    """Find the answer to the question most similar to the given one, if similar enough."""
+    answer_id = vector_answers.retrieve_similar_id(question_embedding, certainty_threshold=certainty_threshold)
+    if answer_id is None:
+        return None
+
+    with get_db_session() as session:
+        record = session.query(CachedAnswerORM).filter_by(id=int(answer_id)).first()
+        return CachedAnswerDTO.from_orm(record) if record else None
+
+
+def store(
+    *, question: str, question_embedding: list[float], response: str, pages: list[PageDataDTO], answer_seconds: float
+) -> None:
+    with get_db_session() as session:
+        record = CachedAnswerORM(
+            question=question,
+            response=response,
+            page_versions={page.page_id: page.last_updated.isoformat() for page in pages},
+            answer_seconds=answer_seconds,
+        )
+        session.add(record)
+        session.flush()
+        answer_id = record.id
+
+    vector_answers.import_embedding(str(answer_id), question_embedding)
+    logging.info("Answer cached", extra={"answer_id": answer_id})
+
+
+def record_hit(answer: CachedAnswerDTO) -> None:
+    with get_db_session() as session:
+        session.query(CachedAnswerORM).filter_by(id=answer.id).update(
+            {CachedAnswerORM.hits: CachedAnswerORM.hits + 1, CachedAnswerORM.last_hit_at: datetime.now(UTC)},
+            synchronize_session=False,
+        )
+
+
+def delete(answer: CachedAnswerDTO) -> None:
+    with get_db_session() as session:
+        session.query(CachedAnswerORM).filter_by(id=answer.id).delete(synchronize_session=False)
+    vector_answers.delete_embeddings([str(answer.id)])
+    logging.info("Cached answer deleted", extra={"answer_id": answer.id})
@@ -0,0 +1,142 @@
+import logging
+from datetime import UTC, datetime
+
+from sqlalchemy import func
+
+from top_assist.models.import_run import (
+    ImportRunDTO,
+    ImportRunORM,
+    ImportRunPageORM,
+    ImportRunPageStatus,
+    ImportRunStatus,
+)
+
+from .database import Session, get_db_session
+
+
+class ImportRunNotFoundError(Exception):  # noqa: D101
+    def __init__(self, run_id: int):
+        super().__init__(f"Import run with id {run_id} not found in the database")
+
+
+def find_resumable(space_key: str) -> ImportRunDTO | None:
+    """Find the latest unfinished (in progress or failed) import run for the space."""
+    with get_db_session() as session:
+        record = (
+            session.query(ImportRunORM)
+            .filter(
+                ImportRunORM.space_key == space_key,
+                ImportRunORM.status != ImportRunStatus.completed.value,
+            )
+            .order_by(ImportRunORM.id.desc())
+            .first()
+        )
+        return ImportRunDTO.from_orm(record) if record else None
+
+
+def find_latest(space_key: str) -> ImportRunDTO | None:
+    with get_db_session() as session:
+        record = session.query(ImportRunORM).filter_by(space_key=space_key).order_by(ImportRunORM.id.desc()).first()
+        return ImportRunDTO.from_orm(record) if record else None
+
+
+def start(*, space_key: str, space_name: str, import_date: datetime) -> ImportRunDTO:
+    with get_db_session() as session:
+        record = ImportRunORM(
+            space_key=space_key,
+            space_name=space_name,
+            status=ImportRunStatus.in_progress.value,
+            import_date=import_date,
+            pages_discovered=False,
+        )
+        session.add(record)
+        session.flush()  # Flush to get the ID
+        logging.info("Import run started", extra={"space_key": space_key, "import_run_id": record.id})
+        return ImportRunDTO.from_orm(record)
+
+
+def resume(run: ImportRunDTO) -> None:
+    with get_db_session() as session:
+        record = __get_record(session, run.id)
+        record.status = ImportRunStatus.in_progress.value
+        record.error = None
+        run.status = record.status
+        logging.info("Import run resumed", extra={"space_key": run.space_key, "import_run_id": run.id})
+
+
+def register_pages(run: ImportRunDTO, page_ids: list[str]) -> None:
+    """Register the pages to import and mark the discovery step of the run as done."""
+    with get_db_session() as session:
+        record = __get_record(session, run.id)
+        session.add_all(
+            ImportRunPageORM(import_run_id=run.id, page_id=page_id, status=ImportRunPageStatus.pending.value)
+            for page_id in page_ids
+        )
+        record.pages_discovered = True
+        run.pages_discovered = True
+        logging.info(
+            "Import run pages registered",
+            extra={"space_key": run.space_key, "import_run_id": run.id, "count": len(page_ids)},
+        )
+
+
+def page_ids_with_status(run: ImportRunDTO, status: ImportRunPageStatus, *, limit: int) -> list[str]:
+    with get_db_session() as session:
+        records = (
+            session.query(ImportRunPageORM.page_id)
+            .filter_by(import_run_id=run.id, status=status.value)
+            .order_by(ImportRunPageORM.id)
+            .limit(limit)
+            .all()
+        )
+        return [record[0] for record in records]
+
+
+def mark_pages(run: ImportRunDTO, page_ids: list[str], status: ImportRunPageStatus) -> None:
+    if not page_ids:
+        return
+
+    with get_db_session() as session:
+        session.query(ImportRunPageORM).filter(
+            ImportRunPageORM.import_run_id == run.id,
+            ImportRunPageORM.page_id.in_(page_ids),
+        ).update({ImportRunPageORM.status: status.value}, synchronize_session=False)
+
+
+def count_pages_by_status(run: ImportRunDTO) -> dict[str, int]:
+    with get_db_session() as session:
+        rows = (
+            session.query(ImportRunPageORM.status, func.count(ImportRunPageORM.id))
+            .filter_by(import_run_id=run.id)
+            .group_by(ImportRunPageORM.status)
+            .all()
+        )
+        return {status: int(count) for status, count in rows}
+
+
+def complete(run: ImportRunDTO) -> None:
+    with get_db_session() as session:
+        record = __get_record(session, run.id)
+        record.status = ImportRunStatus.completed.value
+        record.finished_at = datetime.now(UTC)
+        run.status = record.status
+        logging.info("Import run completed", extra={"space_key": run.space_key, "import_run_id": run.id})
+
+
+def fail(run: ImportRunDTO, error: str) -> None:
+    with get_db_session() as session:
+        record = __get_record(session, run.id)
+        record.status = ImportRunStatus.failed.value
+        record.error = error
+        run.status = record.status
+        logging.warning(
+            "Import run failed", extra={"space_key": run.space_key, "import_run_id": run.id, "error": error}
+        )
+
+
+def __get_record(session: Session, run_id: int) -> ImportRunORM:
+    record = session.get(ImportRunORM, run_id)
+    if not record:
+        raise ImportRunNotFoundError(run_id)
+
+    return record
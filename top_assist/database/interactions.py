@@ -2,8 +2,10 @@ import json
 import logging
 from datetime import UTC, datetime
 
+from sqlalchemy.dialects.postgresql import insert
+
 from top_assist.models.base import int_pk
-from top_assist.models.qa_interaction import QAInteractionDTO, QAInteractionORM
+from top_assist.models.qa_interaction import AssistantThreadPageORM, QAInteractionDTO, QAInteractionORM
 
 from .database import get_db_session
 
@@ -164,3 +166,35 @@ def get_slack_channel_ids() -> list[str]:
     with get_db_session() as session:
         records = session.query(QAInteractionORM.channel_id).distinct().all()
         return [record[0] for record in records]
+
+
+def find_assistant_thread_pages(assistant_thread_id: str) -> dict[str, str]:
+    """Pages already sent as context to the assistant thread.
+
+    Returns:
+        dict[str, str]: Page ID -> the version of the page when it was sent.
+    """
+    with get_db_session() as session:
+        records = (
+            session.query(AssistantThreadPageORM.page_id, AssistantThreadPageORM.page_version)
+            .filter_by(assistant_thread_id=assistant_thread_id)
+            .all()
+        )
+        return {record.page_id: record.page_version for record in records}
+
+
+def add_assistant_thread_pages(assistant_thread_id: str, page_versions: dict[str, str]) -> None:
+    if not page_versions:
+        return
+
+    with get_db_session() as session:
+        statement = insert(AssistantThreadPageORM).values([
+            {"assistant_thread_id": assistant_thread_id, "page_id": page_id, "page_version": page_version}
+            for page_id, page_version in page_versions.items()
+        ])
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[AssistantThreadPageORM.assistant_thread_id, AssistantThreadPageORM.page_id],
+                set_={"page_version": statement.excluded.page_version},
+            )
+        )
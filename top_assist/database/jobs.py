@@ -0,0 +1,165 @@
+import logging
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import exists, or_, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from top_assist.models.job import JobDTO, JobORM, JobStatus
+
+from .database import Session, get_db_session
+
+
+def enqueue(
+    kind: str, payload: dict, *, dedupe_key: str | None, max_attempts: int, replace_queued: bool = False
+) -> int | None:
+    """Queue a job unless a job with the same dedupe key is already queued.
+
+    With `replace_queued`, the queued job gets the kind and payload of the new one instead,
+    e.g. when only the latest change of a page matters.
+
+    Returns:
+        int | None: The ID of the queued job, None if it was deduplicated.
+    """
+    statement = insert(JobORM).values(
+        kind=kind,
+        payload=payload,
+        dedupe_key=dedupe_key,
+        status=JobStatus.queued.value,
+        attempts=0,
+        max_attempts=max_attempts,
+        run_after=datetime.now(UTC),
+    )
+    is_queued = text(f"status = '{JobStatus.queued.value}'")
+    if replace_queued:
+        statement = statement.on_conflict_do_update(
+            index_elements=[JobORM.dedupe_key],
+            index_where=is_queued,
+            set_={"kind": statement.excluded.kind, "payload": statement.excluded.payload},
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=[JobORM.dedupe_key], index_where=is_queued)
+
+    with get_db_session() as session:
+        job_id = session.execute(statement.returning(JobORM.id)).scalar()
+
+        logging.info(
+            "Job queued" if job_id else "Job deduplicated",
+            extra={"job_id": job_id, "kind": kind, "dedupe_key": dedupe_key},
+        )
+        return job_id
+
+
+def claim_next(worker_id: str) -> JobDTO | None:
+    """Claim the next due job, skipping jobs locked by other workers and jobs whose dedupe key is already running."""
+    running = aliased(JobORM)
+    now = datetime.now(UTC)
+    with get_db_session() as session:
+        record = (
+            session.query(JobORM)
+            .filter(
+                JobORM.status == JobStatus.queued.value,
+                JobORM.run_after <= now,
+                ~exists().where(
+                    running.dedupe_key == JobORM.dedupe_key,
+                    running.status == JobStatus.running.value,
+                ),
+            )
+            .order_by(JobORM.run_after, JobORM.id)
+            .with_for_update(skip_locked=True, of=JobORM)
+            .first()
+        )
+        if not record:
+            return None
+
+        record.status = JobStatus.running.value
+        record.attempts += 1
+        record.worker_id = worker_id
+        record.started_at = now
+        record.heartbeat_at = now
+        record.error = None
+        return JobDTO.from_orm(record)
+
+
+def heartbeat(job_ids: list[int]) -> None:
+    if not job_ids:
+        return
+
+    with get_db_session() as session:
+        session.query(JobORM).filter(JobORM.id.in_(job_ids)).update(
+            {JobORM.heartbeat_at: datetime.now(UTC)}, synchronize_session=False
+        )
+
+
+def succeed(job: JobDTO) -> None:
+    with get_db_session() as session:
+        session.query(JobORM).filter_by(id=job.id).update(
+            {JobORM.status: JobStatus.succeeded.value, JobORM.finished_at: datetime.now(UTC)},
+            synchronize_session=False,
+        )
+
+
+def fail_attempt(job: JobDTO, error: str, *, retry_after: timedelta) -> None:
+    """Queue the job again after `retry_after`, or fail it if it has no attempts left.
+
+    A job already queued with the same dedupe key does the work of the retry, so the job is failed then as well.
+    """
+    now = datetime.now(UTC)
+    with get_db_session() as session:
+        retry = job.attempts < job.max_attempts and not __is_queued(session, job.dedupe_key)
+        session.query(JobORM).filter_by(id=job.id).update(
+            {
+                JobORM.status: JobStatus.queued.value if retry else JobStatus.failed.value,
+                JobORM.run_after: now + retry_after,
+                JobORM.finished_at: None if retry else now,
+                JobORM.error: error,
+            },
+            synchronize_session=False,
+        )
+
+
+def requeue_stale(stale_after: timedelta) -> int:
+    """Queue again the running jobs of workers which stopped reporting heartbeats (e.g. killed on redeploy).
+
+    Jobs without attempts left or with a queued duplicate are failed instead.
+
+    Returns:
+        int: The number of requeued jobs.
+    """
+    now = datetime.now(UTC)
+    queued = aliased(JobORM)
+    is_stale = (JobORM.status == JobStatus.running.value, JobORM.heartbeat_at < now - stale_after)
+    has_queued_duplicate = exists().where(
+        queued.dedupe_key == JobORM.dedupe_key,
+        queued.status == JobStatus.queued.value,
+    )
+    error = "Worker stopped responding"
+    with get_db_session() as session:
+        session.query(JobORM).filter(
+            *is_stale,
+            or_(JobORM.attempts >= JobORM.max_attempts, has_queued_duplicate),
+        ).update(
+            {JobORM.status: JobStatus.failed.value, JobORM.finished_at: now, JobORM.error: error},
+            synchronize_session=False,
+        )
+        count = (
+            session.query(JobORM)
+            .filter(*is_stale)
+            .update(
+                {JobORM.status: JobStatus.queued.value, JobORM.run_after: now, JobORM.error: error},
+                synchronize_session=False,
+            )
+        )
+        if count:
+            logging.warning("Stale jobs requeued", extra={"count": count})
+
+        return count
+
+
+def __is_queued(session: Session, dedupe_key: str | None) -> bool:
+    if dedupe_key is None:
+        return False
+
+    return session.query(
+        exists().where(JobORM.dedupe_key == dedupe_key, JobORM.status == JobStatus.queued.value)
+    ).scalar()
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects.postgresql import insert
+
+from top_assist.configuration import llm_cache_ttl_seconds
+from top_assist.models.llm_cache_entry import LLMCacheEntryORM
+from top_assist.utils.llm_cache import LLMCacheStorage
+
+from .database import get_db_session
+
+
+class LLMCacheDatabaseStorage(LLMCacheStorage):
+    """Storage implementation for the model responses cache shared between processes using a database."""
+
+    def read(self, key: str, *, stored_after: datetime) -> str | None:
+        with get_db_session() as session:
+            return (
+                session.query(LLMCacheEntryORM.value)
+                .filter(LLMCacheEntryORM.key == key, LLMCacheEntryORM.stored_at > stored_after)
+                .scalar()
+            )
+
+    def write(self, key: str, value: str, *, stored_at: datetime) -> None:
+        expired_before = stored_at - timedelta(seconds=llm_cache_ttl_seconds)
+        with get_db_session() as session:
+            session.query(LLMCacheEntryORM).filter(LLMCacheEntryORM.stored_at <= expired_before).delete(
+                synchronize_session=False
+            )
+
+            statement = insert(LLMCacheEntryORM).values(key=key, value=value, stored_at=stored_at)
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[LLMCacheEntryORM.key],
+                    set_={"value": statement.excluded.value, "stored_at": statement.excluded.stored_at},
+                )
+            )
+
+    def clear(self) -> None:
+        with get_db_session() as session:
+            session.query(LLMCacheEntryORM).delete(synchronize_session=False)
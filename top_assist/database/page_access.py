@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects.postgresql import insert
+
+from top_assist.configuration import page_access_cache_ttl_seconds
+from top_assist.models.page_access import PageAccessORM
+from top_assist.utils.page_access_cache import PageAccessCacheStorage
+
+from .database import get_db_session
+
+
+class PageAccessCacheDatabaseStorage(PageAccessCacheStorage):
+    """Storage implementation for the page access cache shared between processes using a database."""
+
+    def read(self, slack_user_id: str, page_ids: list[str], *, checked_after: datetime) -> dict[str, bool]:
+        with get_db_session() as session:
+            records = (
+                session.query(PageAccessORM.page_id, PageAccessORM.allowed)
+                .filter(
+                    PageAccessORM.slack_user_id == slack_user_id,
+                    PageAccessORM.page_id.in_(page_ids),
+                    PageAccessORM.checked_at > checked_after,
+                )
+                .all()
+            )
+            return {record.page_id: record.allowed for record in records}
+
+    def write(self, slack_user_id: str, access: dict[str, bool], *, checked_at: datetime) -> None:
+        expired_before = checked_at - timedelta(seconds=page_access_cache_ttl_seconds)
+        with get_db_session() as session:
+            session.query(PageAccessORM).filter(
+                PageAccessORM.slack_user_id == slack_user_id,
+                PageAccessORM.checked_at <= expired_before,
+            ).delete(synchronize_session=False)
+
+            statement = insert(PageAccessORM).values([
+                {"slack_user_id": slack_user_id, "page_id": page_id, "allowed": allowed, "checked_at": checked_at}
+                for page_id, allowed in access.items()
+            ])
+            session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[PageAccessORM.slack_user_id, PageAccessORM.page_id],
+                    set_={"allowed": statement.excluded.allowed, "checked_at": statement.excluded.checked_at},
+                )
+            )
+
+    def delete(self, slack_user_id: str) -> None:
+        with get_db_session() as session:
+            session.query(PageAccessORM).filter_by(slack_user_id=slack_user_id).delete(synchronize_session=False)
@@ -1,5 +1,6 @@
 import logging
 from dataclasses import dataclass
+from datetime import datetime
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
@@ -7,7 +8,9 @@ from sqlalchemy.orm import Session
 from top_assist.models.page_data import PageDataDTO, PageDataORM
 from top_assist.models.space import SpaceDTO
 
+from ._page_cache import page_cache
 from ._vector import pages as vector_pages
+from ._vector.engine import embed_query
 from .database import get_db_session
 
 
@@ -17,7 +20,17 @@ class RemovedPages:  # noqa: D101
 
 
 def upsert_many(space: SpaceDTO, pages: list[PageDataDTO]) -> None:
+    store_many(space, pages)
+    embed_many(pages)
+
+
+def store_many(space: SpaceDTO, pages: list[PageDataDTO]) -> None:
+    """Store pages in the database without (re-)generating their embeddings."""
     __upsert_records(space, pages)
+
+
+def embed_many(pages: list[PageDataDTO]) -> None:
+    """Generate embeddings for already stored pages and insert them into the vector database."""
     vector_pages.import_data(pages)
 
 
@@ -27,6 +40,7 @@ def delete_by_page_ids(page_ids: list[str]) -> RemovedPages:
         for page in pages:
             session.delete(page)
         vector_pages.delete_embeddings(page_ids)
+        page_cache.invalidate(page_ids)
         return RemovedPages(removed_count=len(page_ids))
 
 
@@ -37,10 +51,12 @@ def delete_by_space(session: Session, space: SpaceDTO) -> RemovedPages:
         for page in pages:
             session.delete(page)
         vector_pages.delete_embeddings(page_ids)
+        page_cache.invalidate(page_ids)
     return RemovedPages(removed_count=len(page_ids))
 
 
 def __upsert_records(space: SpaceDTO, pages: list[PageDataDTO]) -> None:
+    page_cache.invalidate([page.page_id for page in pages])
     with get_db_session() as session:
         for page in pages:
             if page.space_key != space.key:
@@ -53,6 +69,12 @@ def __upsert_records(space: SpaceDTO, pages: list[PageDataDTO]) -> None:
                 old_page.last_updated = page.last_updated
                 old_page.content = page.content
                 old_page.comments = page.comments
+                old_page.llm_text = page.format_for_llm()
+                old_page.llm_token_count = page.token_count()
+                if old_page.digest_content_hash != page.content_hash():
+                    # Pages without a digest are sent in full text until the digest is generated again
+                    old_page.digest = None
+                    old_page.digest_content_hash = None
                 old_page.space_id = space.id
                 old_page.space_key = space.key
                 logging.info("Update page record", extra={"space_key": old_page.space_key, "page_id": page_id})
@@ -67,29 +89,83 @@ def __upsert_records(space: SpaceDTO, pages: list[PageDataDTO]) -> None:
                     last_updated=page.last_updated,
                     content=page.content,
                     comments=page.comments,
+                    llm_text=page.format_for_llm(),
+                    llm_token_count=page.token_count(),
                 )
                 session.add(new_page)
                 logging.info("Add page record", extra={"space_key": space.key, "page_id": page_id})
 
 
+def find_digest_hashes(page_ids: list[str]) -> dict[str, str | None]:
+    """The content hashes of the pages their digests were generated from, None for pages without a digest."""
+    with get_db_session() as session:
+        records = (
+            session.query(PageDataORM.page_id, PageDataORM.digest_content_hash)
+            .filter(PageDataORM.page_id.in_(page_ids))
+            .all()
+        )
+        return {record.page_id: record.digest_content_hash for record in records}
+
+
+def find_last_updated(page_ids: list[str]) -> dict[str, datetime]:
+    """The last updates in Confluence of the stored pages, the pages not stored are missing."""
+    with get_db_session() as session:
+        records = (
+            session.query(PageDataORM.page_id, PageDataORM.last_updated).filter(PageDataORM.page_id.in_(page_ids)).all()
+        )
+        return {record.page_id: record.last_updated for record in records}
+
+
+def store_digest(page: PageDataDTO, digest: str) -> None:
+    """Store the digest generated from the page, unless the page was updated in the meantime."""
+    with get_db_session() as session:
+        session.query(PageDataORM).filter_by(page_id=page.page_id, last_updated=page.last_updated).update(
+            {PageDataORM.digest: digest, PageDataORM.digest_content_hash: page.content_hash()},
+            synchronize_session=False,
+        )
+    page_cache.invalidate([page.page_id])
+
+
 def retrieve_relevant(question: str, count: int) -> list[PageDataDTO]:
-    ids = vector_pages.retrieve_relevant_ids(question, count=count)
+    return find_many_by_ids(page_ids=retrieve_relevant_ids(embed_query(question), count=count))
+
+
+def retrieve_relevant_ids(question_embedding: list[float], count: int) -> list[str]:
+    ids = vector_pages.retrieve_relevant_ids(question_embedding, count=count)
     logging.info("Retrieved relevant page ids", extra={"ids": ids})
-    return find_many_by_ids(page_ids=ids)
+    return ids
 
 
 def find_many_by_ids(page_ids: list[str]) -> list[PageDataDTO]:
+    """Find pages by their IDs, only the pages missing in the page cache or changed since cached are loaded in full."""
     with get_db_session() as session:
-        records = session.query(PageDataORM).filter(PageDataORM.page_id.in_(page_ids)).all()
+        versions = (
+            session.query(PageDataORM.page_id, PageDataORM.last_updated, PageDataORM.digest_content_hash)
+            .filter(PageDataORM.page_id.in_(page_ids))
+            .all()
+        )
+        pages = {}
+        for version in versions:
+            cached_page = page_cache.get(version.page_id, (version.last_updated, version.digest_content_hash))
+            if cached_page:
+                pages[version.page_id] = cached_page
+
+        missing_ids = [version.page_id for version in versions if version.page_id not in pages]
+        if missing_ids:
+            records = session.query(PageDataORM).filter(PageDataORM.page_id.in_(missing_ids)).all()
+            for record in records:
+                page = PageDataDTO.from_orm(record)
+                page_cache.put(page, (record.last_updated, record.digest_content_hash))
+                pages[page.page_id] = page
+
         # return ids in the same order as requested
-        record_map = {record.page_id: PageDataDTO.from_orm(record) for record in records}
-        return [record_map[page_id] for page_id in page_ids if page_id in record_map]
+        return [pages[page_id] for page_id in page_ids if page_id in pages]
 
 
 def all_ids_by_space(space: SpaceDTO) -> list[str]:
     with get_db_session() as session:
-        records = session.query(PageDataORM).filter_by(space_id=space.id).all()
-        return [record.page_id for record in records]
+        records = session.query(PageDataORM.page_id).filter_by(space_id=space.id).all()
+        return [record[0] for record in records]
 
 
 def count_all_by_space(space: SpaceDTO) -> int:
@@ -0,0 +1,44 @@
+from sqlalchemy.dialects.postgresql import insert
+
+from top_assist.models.rate_limit_bucket import RateLimitBucketORM
+from top_assist.utils.rate_limiter import BucketTransition, RateLimitBucket, RateLimitStorage
+
+from .database import get_db_session
+
+
+class RateLimitDatabaseStorage(RateLimitStorage):
+    """Storage implementation for rate limit buckets shared between processes using a database."""
+
+    def update(self, bucket_key: str, transition: BucketTransition) -> float:
+        """Applies the transition to the bucket while holding a row lock on it.
+
+        Args:
+            bucket_key (str): The key of the rate limited service.
+            transition (BucketTransition): Computes the new bucket state and the seconds to wait.
+
+        Returns:
+            float: The seconds to wait computed by the transition.
+        """
+        with get_db_session() as session:
+            record = session.query(RateLimitBucketORM).filter_by(bucket_key=bucket_key).with_for_update().first()
+            if not record:
+                bucket, wait_seconds = transition(None)
+                # Another process may have created the bucket in the meantime, its state wins then
+                session.execute(
+                    insert(RateLimitBucketORM)
+                    .values(bucket_key=bucket_key, **bucket.model_dump())
+                    .on_conflict_do_nothing(index_elements=[RateLimitBucketORM.bucket_key])
+                )
+                return wait_seconds
+
+            bucket, wait_seconds = transition(
+                RateLimitBucket(
+                    tokens=record.tokens,
+                    refilled_at=record.refilled_at,
+                    paused_until=record.paused_until,
+                )
+            )
+            record.tokens = bucket.tokens
+            record.refilled_at = bucket.refilled_at
+            record.paused_until = bucket.paused_until
+            return wait_seconds
@@ -33,6 +33,12 @@ def find_or_create(*, space_key: str, space_name: str) -> SpaceDTO:
         return SpaceDTO.from_orm(new_space)
 
 
+def find_by_key(space_key: str) -> SpaceDTO | None:
+    with get_db_session() as session:
+        record = session.query(SpaceORM).filter_by(space_key=space_key).first()
+        return SpaceDTO.from_orm(record) if record else None
+
+
 def mark_imported(space: SpaceDTO, import_date: datetime) -> None:
     """Update last import timestamp for the space in the database."""
     with get_db_session() as session:
@@ -45,6 +51,41 @@ def mark_imported(space: SpaceDTO, import_date: datetime) -> None:
         logging.info("Space marked as imported", extra={"space_key": record.space_key, "import_date": import_date})
 
 
+def mark_pages_checked(space: SpaceDTO, *, pages_count: int, checked_at: datetime) -> None:
+    """Remember when all the space page ids were compared with Confluence and how many pages there were."""
+    with get_db_session() as session:
+        record = session.get(SpaceORM, space.id)
+        if not record:
+            raise SpaceNotFoundError(space.id)
+
+        record.pages_checked_at = checked_at
+        record.pages_count = pages_count
+        space.pages_checked_at = checked_at
+        space.pages_count = pages_count
+
+
+def record_sync(
+    space: SpaceDTO,
+    *,
+    changed_pages: int,
+    duration_seconds: float,
+    sync_interval_minutes: int,
+    next_sync_at: datetime,
+) -> None:
+    """Store the change statistics of the space sync and schedule the next one."""
+    with get_db_session() as session:
+        record = session.get(SpaceORM, space.id)
+        if not record:
+            raise SpaceNotFoundError(space.id)
+
+        record.last_sync_changed_pages = changed_pages
+        record.last_sync_duration_seconds = duration_seconds
+        record.sync_interval_minutes = sync_interval_minutes
+        record.next_sync_at = next_sync_at
+        space.sync_interval_minutes = sync_interval_minutes
+        space.next_sync_at = next_sync_at
+
+
 def all_spaces() -> list[SpaceDTO]:
     """Retrieve all spaces from the database."""
     with get_db_session() as session:
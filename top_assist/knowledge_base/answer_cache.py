@@ -0,0 +1,82 @@
+import logging
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import top_assist.database.answers as db_answers
+import top_assist.database.pages as db_pages
+from top_assist.configuration import answer_cache_certainty_threshold, answer_cache_max_age_hours
+from top_assist.confluence.policy import InvalidAuthError, PageAccessPolicy
+from top_assist.models.cached_answer import CachedAnswerDTO
+from top_assist.models.page_data import PageDataDTO
+from top_assist.utils.metrics import ANSWER_CACHE_LOOKUPS_METRIC, ANSWER_CACHE_SAVED_SECONDS_METRIC
+from top_assist.utils.tracer import ServiceNames, tracer
+
+
+@dataclass
+class ReusableAnswer:  # noqa: D101
+    answer: CachedAnswerDTO
+    pages: list[PageDataDTO]
+
+
+@tracer.wrap(service=ServiceNames.knowledge_base.value)
+def find_reusable_answer(question_embedding: list[float], access_policy: PageAccessPolicy) -> ReusableAnswer | None:
+    """Find the answer to a similar question, reusable if none of its pages changed and the user can access all of them.
+
+    Answers with changed pages are deleted. Errors of the cache are logged and treated as a miss.
+    """
+    try:
+        answer = db_answers.find_similar(question_embedding, certainty_threshold=answer_cache_certainty_threshold)
+        if answer is None:
+            ANSWER_CACHE_LOOKUPS_METRIC.labels(result="miss").inc()
+            return None
+
+        page_ids = list(answer.page_versions)
+        pages = db_pages.find_many_by_ids(page_ids)
+        if __is_stale(answer, pages):
+            logging.info("Cached answer is stale", extra={"answer_id": answer.id})
+            ANSWER_CACHE_LOOKUPS_METRIC.labels(result="stale").inc()
+            db_answers.delete(answer)
+            return None
+
+        if not set(page_ids) <= set(access_policy.accessible_pages(page_ids)):
+            ANSWER_CACHE_LOOKUPS_METRIC.labels(result="denied").inc()
+            return None
+
+        ANSWER_CACHE_LOOKUPS_METRIC.labels(result="hit").inc()
+        logging.info("Cached answer reused", extra={"answer_id": answer.id, "question": answer.question})
+        return ReusableAnswer(answer=answer, pages=pages)
+    except InvalidAuthError:
+        raise
+    except Exception:
+        logging.exception("Error looking up cached answer")
+        return None
+
+
+def record_reuse(reusable: ReusableAnswer, *, answer_seconds: float) -> None:
+    ANSWER_CACHE_SAVED_SECONDS_METRIC.inc(max(0.0, reusable.answer.answer_seconds - answer_seconds))
+    try:
+        db_answers.record_hit(reusable.answer)
+    except Exception:
+        logging.exception("Error recording cached answer hit", extra={"answer_id": reusable.answer.id})
+
+
+def cache_answer(
+    *, question: str, question_embedding: list[float], response: str, pages: list[PageDataDTO], answer_seconds: float
+) -> None:
+    try:
+        db_answers.store(
+            question=question,
+            question_embedding=question_embedding,
+            response=response,
+            pages=pages,
+            answer_seconds=answer_seconds,
+        )
+    except Exception:
+        logging.exception("Error caching answer")
+
+
+def __is_stale(answer: CachedAnswerDTO, pages: list[PageDataDTO]) -> bool:
+    if answer.created_at < datetime.now(UTC) - timedelta(hours=answer_cache_max_age_hours):
+        return True
+
+    return {page.page_id: page.last_updated.isoformat() for page in pages} != answer.page_versions
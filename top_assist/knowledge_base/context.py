@@ -0,0 +1,104 @@
+import re
+from dataclasses import dataclass
+
+from top_assist.models.page_data import PageDataDTO
+from top_assist.utils.tokenizer import count_tokens, truncate_to_tokens
+
+_TRUNCATION_LABEL = " [Content truncated due to size limit.]"
+# A truncated page is left out when its share of the budget is too small for a useful excerpt
+_MIN_EXCERPT_TOKENS = 50
+_SENTENCE_END = re.compile(r"[.!?](?=\s)|\n")
+_SECTION_SEPARATOR = "\n"
+
+
+@dataclass
+class PackedContext:
+    """Pages formatted as a context of a question.
+
+    Attr:
+        text: The formatted pages
+        token_count: The number of tokens of `text`
+        full_text_page_ids: The pages included whole, not truncated, left out or represented by their digests
+    """
+
+    text: str
+    token_count: int
+    full_text_page_ids: list[str]
+
+
+def pack_pages_context(
+    pages: list[PageDataDTO], *, token_budget: int, full_text_pages: int | None = None
+) -> PackedContext:
+    """Formats pages as a context of a question fitting the token budget.
+
+    Every page gets an equal share of the budget and the share left unused by shorter pages is split between
+    the longer ones. Pages over their share are truncated at a sentence boundary.
+    Token counts stored on import are used, only truncated pages and digests are tokenized.
+
+    With `full_text_pages`, the pages after the given number of the most relevant ones are represented
+    by their digests when they have one.
+    """
+    texts = [
+        __page_text(page, use_digest=full_text_pages is not None and index >= full_text_pages)
+        for index, page in enumerate(pages)
+    ]
+    headers = [f"Document Title: {page.title}\nSpace Key: {page.space_key}\n\n" for page in pages]
+    header_costs = [count_tokens(header) for header in headers]
+    costs = [header_cost + text_cost for header_cost, (_, text_cost, _) in zip(header_costs, texts, strict=True)]
+    # The separators are reserved for every page, even though the pages left out need none
+    separator_cost = count_tokens(_SECTION_SEPARATOR)
+    allocations = __allocate(costs, token_budget - separator_cost * max(len(pages) - 1, 0))
+
+    sections: list[str] = []
+    token_count = 0
+    full_text_page_ids: list[str] = []
+    for page, (text, _, is_full_text), header, header_cost, cost, allocation in zip(
+        pages, texts, headers, header_costs, costs, allocations, strict=True
+    ):
+        if allocation >= cost:
+            sections.append(header + text)
+            token_count += cost
+            if is_full_text:
+                full_text_page_ids.append(page.page_id)
+            continue
+
+        excerpt_budget = allocation - header_cost - count_tokens(_TRUNCATION_LABEL)
+        if excerpt_budget < _MIN_EXCERPT_TOKENS:
+            continue
+
+        excerpt = __truncate_at_sentence(text, excerpt_budget)
+        sections.append(header + excerpt + _TRUNCATION_LABEL)
+        token_count += allocation - excerpt_budget + count_tokens(excerpt)
+
+    token_count += separator_cost * max(len(sections) - 1, 0)
+    return PackedContext(
+        text=_SECTION_SEPARATOR.join(sections), token_count=token_count, full_text_page_ids=full_text_page_ids
+    )
+
+
+def __page_text(page: PageDataDTO, *, use_digest: bool) -> tuple[str, int, bool]:
+    """The text of the page with its token count, and whether it is the full text rather than the digest."""
+    digest = page.format_digest_for_llm() if use_digest else None
+    if digest is not None:
+        return digest, count_tokens(digest), False
+
+    return page.format_for_llm(), page.token_count(), True
+
+
+def __allocate(costs: list[int], token_budget: int) -> list[int]:
+    allocations = [0] * len(costs)
+    remaining = token_budget
+    cheapest_first = sorted(range(len(costs)), key=lambda index: costs[index])
+    for position, index in enumerate(cheapest_first):
+        share = remaining // (len(costs) - position)
+        allocations[index] = min(costs[index], share)
+        remaining -= allocations[index]
+
+    return allocations
+
+
+def __truncate_at_sentence(text: str, max_tokens: int) -> str:
+    prefix = truncate_to_tokens(text, max_tokens)
+    sentence_ends = [match.end() for match in _SENTENCE_END.finditer(prefix)]
+    # Falls back to the token boundary when there is no sentence end, e.g. in a long table row
+    return prefix[: sentence_ends[-1]] if sentence_ends else prefix
@@ -0,0 +1,93 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from pydantic import BaseModel
+
+import top_assist.database.pages as db_pages
+from top_assist.configuration import model_id_mini, page_digest_workers_num
+from top_assist.models.page_data import PageDataDTO
+from top_assist.open_ai.client import openai_client
+from top_assist.utils.metrics import PAGE_DIGESTS_METRIC
+from top_assist.utils.tokenizer import truncate_to_tokens
+from top_assist.utils.tracer import ServiceNames, tracer
+
+# Pages longer than this are summarized from their beginning only
+_MAX_SOURCE_TOKENS = 30_000
+
+_INSTRUCTIONS = """
+You write digests of Confluence pages, used instead of the full page to answer questions about it.
+- "digest": the facts, decisions, names, numbers, links and procedures of the page in a few dense sentences
+- "sections": for every section of the page its heading and a one or two sentence summary
+Do not add anything not stated on the page. Respond in JSON:
+{"digest": "...", "sections": [{"heading": "...", "summary": "..."}]}
+""".strip()
+
+
+class _SectionSummary(BaseModel):
+    heading: str
+    summary: str
+
+
+class _Digest(BaseModel):
+    digest: str
+    sections: list[_SectionSummary] = []
+
+    def format(self) -> str:
+        sections = "\n".join(f"- {section.heading}: {section.summary}" for section in self.sections)
+        return f"{self.digest}\nSections:\n{sections}" if sections else self.digest
+
+
+@tracer.wrap(service=ServiceNames.knowledge_base.value)
+def generate_digests(pages: list[PageDataDTO]) -> int:
+    """Generate the digests of stored pages, pages with a digest of their current content are skipped.
+
+    A page whose digest failed to generate is sent in full text and retried with its next import.
+
+    Returns:
+        int: The number of generated digests.
+    """
+    digest_hashes = db_pages.find_digest_hashes([page.page_id for page in pages])
+    outdated_pages = [page for page in pages if digest_hashes.get(page.page_id) != page.content_hash()]
+    PAGE_DIGESTS_METRIC.labels(result="skipped").inc(len(pages) - len(outdated_pages))
+    if not outdated_pages:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=page_digest_workers_num) as executor:
+        digests = list(executor.map(__generate_digest, outdated_pages))
+
+    generated_count = 0
+    for page, digest in zip(outdated_pages, digests, strict=True):
+        if digest:
+            db_pages.store_digest(page, digest)
+            generated_count += 1
+
+    logging.info(
+        "Page digests generated",
+        extra={
+            "count": generated_count,
+            "failed_count": len(outdated_pages) - generated_count,
+            "skipped_count": len(pages) - len(outdated_pages),
+        },
+    )
+    return generated_count
+
+
+def __generate_digest(page: PageDataDTO) -> str | None:
+    try:
+        response = openai_client().chat.completions.create(
+            model=model_id_mini,
+            messages=[
+                {"role": "system", "content": _INSTRUCTIONS},
+                {"role": "user", "content": truncate_to_tokens(page.format_for_llm(), _MAX_SOURCE_TOKENS)},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+        )
+        digest = _Digest.model_validate_json(response.choices[0].message.content or "")
+    except Exception:
+        logging.exception("Error generating page digest", extra={"page_id": page.page_id})
+        PAGE_DIGESTS_METRIC.labels(result="failed").inc()
+        return None
+
+    PAGE_DIGESTS_METRIC.labels(result="generated").inc()
+    return digest.format()
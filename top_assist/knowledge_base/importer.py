@@ -1,21 +1,38 @@
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import UTC, datetime, timedelta
 
+import top_assist.database.import_runs as db_import_runs
 import top_assist.database.pages as db_pages
 import top_assist.database.spaces as db_spaces
-from top_assist.configuration import confluence_ignore_labels
+from top_assist.configuration import (
+    confluence_ignore_labels,
+    import_batch_size,
+    page_digests_enabled,
+    space_pages_full_diff_interval_minutes,
+    space_sync_max_interval_minutes,
+    space_sync_min_interval_minutes,
+    sync_spaces_workers_num,
+)
 from top_assist.confluence.retriever import (
     InaccessiblePage,
     InaccessibleSpaceError,
+    count_space_pages,
     get_space_page_ids,
     get_space_page_ids_by_label,
-    retrieve_space,
+    is_page_labeled,
+    retrieve_page,
+    retrieve_pages,
     retrieve_space_with_date,
 )
 from top_assist.confluence.spaces import retrieve_space_list
+from top_assist.knowledge_base.digests import generate_digests
+from top_assist.models.import_run import ImportRunDTO, ImportRunPageStatus
 from top_assist.models.page_data import PageDataDTO
 from top_assist.models.space import SpaceDTO
-from top_assist.utils.sentry_notifier import sentry_notify_issue
+from top_assist.utils.metrics import SPACE_SYNC_LATENCY_HISTOGRAM_METRIC
+from top_assist.utils.sentry_notifier import sentry_notify_exception, sentry_notify_issue
 from top_assist.utils.tracer import ServiceNames, tracer
 
 _SPACE_STATUS_FOR_IMPORT = "current"
@@ -29,23 +46,32 @@ def import_confluence_space(
     space_name: str,
     ignore_labels: list[str] = confluence_ignore_labels,
 ) -> None:
-    import_date = datetime.now(UTC)
-    ignored_by_label_page_ids = set(get_space_page_ids_by_label(space_key, ignore_labels))
-    pages_data_raw = retrieve_space(
-        space_key,
-        page_status=_PAGE_STATUS_FOR_IMPORT,
-        ignored_page_ids=ignored_by_label_page_ids,
-    )
-    pages_data = __assert_all_pages_accessible(pages_data_raw)
+    """Import a Confluence space, resuming the last unfinished import run of the space if there is one.
+
+    Progress is checkpointed per page (stored, embedded), so a restarted import only processes the remaining pages.
+    """
+    run = __start_or_resume_import_run(space_key, space_name)
+
+    try:
+        if not run.pages_discovered:
+            __discover_pages_to_import(run, ignore_labels)
 
-    space = db_spaces.find_or_create(space_key=space_key, space_name=space_name)
-    db_pages.upsert_many(space, pages_data)
-    db_spaces.mark_imported(space, import_date=import_date)
+        space = db_spaces.find_or_create(space_key=space_key, space_name=space_name)
+        __embed_stored_pages(run)
+        __import_pending_pages(run, space)
+    except Exception as e:
+        db_import_runs.fail(run, str(e))
+        raise
+
+    __finish_import_run(run, space)
 
 
 @tracer.wrap(service=ServiceNames.knowledge_base.value)
-def pull_updates() -> None:
-    """Pull page updates in imported Confluence spaces that happened since last time."""
+def pull_updates(*, force: bool = False) -> None:
+    """Pull page updates in imported Confluence spaces that happened since last time.
+
+    Only spaces due for a sync are processed, unless forced (see `__schedule_next_sync`).
+    """
     spaces = db_spaces.all_spaces()
     archived_space_keys = [space.key for space in retrieve_space_list(status="archived")]
 
@@ -53,25 +79,73 @@ def pull_updates() -> None:
         logging.error("No spaces found in the database")
         return
 
+    now = datetime.now(UTC)
+    spaces_to_update = []
     for space in spaces:
         if space.key in archived_space_keys:
             __delete_space_and_related_pages(space)
-            continue
+        elif force or space.next_sync_at is None or space.next_sync_at <= now:
+            spaces_to_update.append(space)
+
+    logging.info(
+        "Spaces due for sync",
+        extra={"count": len(spaces_to_update), "skipped_count": len(spaces) - len(spaces_to_update), "force": force},
+    )
+
+    # Stalest spaces first, so that a slow space does not keep the others waiting for their turn
+    spaces_to_update.sort(key=lambda space: space.last_import_date or datetime.min.replace(tzinfo=UTC))
+
+    with ThreadPoolExecutor(max_workers=sync_spaces_workers_num) as executor:
+        futures = {executor.submit(__pull_space_updates, space): space for space in spaces_to_update}
+        for future in as_completed(futures):
+            space = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                logging.exception("Failed to pull space updates", extra={"space_key": space.key})
+                sentry_notify_exception(e, extra={"space_key": space.key})
 
+
+def __pull_space_updates(space: SpaceDTO) -> None:
+    start_time = time.monotonic()
+    status = "success"
+    with tracer.trace(
+        "knowledge_base.pull_space_updates", service=ServiceNames.knowledge_base.value, resource=space.key
+    ):
         try:
-            __remove_non_relevant_pages(space)
-            update_space(space)
+            removed_pages_count = __remove_non_relevant_pages(space)
+            updated_pages_count = update_space(space)
+            __schedule_next_sync(space, removed_pages_count + updated_pages_count, time.monotonic() - start_time)
 
         except InaccessibleSpaceError:
             logging.warning("Space is inaccessible -> removing", extra={"space_key": space.key})
             __delete_space_and_related_pages(space)
+            status = "removed"
+
+        except Exception:
+            status = "failure"
+            raise
 
+        finally:
+            duration = time.monotonic() - start_time
+            logging.info(
+                "Space updates pulled",
+                extra={"space_key": space.key, "status": status, "duration_seconds": duration},
+            )
+            SPACE_SYNC_LATENCY_HISTOGRAM_METRIC.labels(status=status).observe(duration)
 
-def update_space(space: SpaceDTO, ignore_labels: list[str] = confluence_ignore_labels) -> None:
+
+def update_space(space: SpaceDTO, ignore_labels: list[str] = confluence_ignore_labels) -> int:
+    """Pull the pages of the space updated since its last import.
+
+    Returns:
+        int: The number of pages updated or removed since the last import,
+            the pages pulled again only because of the overlap with the last import are not counted.
+    """
     if not space.last_import_date:
         logging.error("Space has no last import date, skipping", extra={"space_key": space.key})
         sentry_notify_issue("Space has no last import date", extra={"space_key": space.key})
-        return
+        return 0
 
     import_date = datetime.now(UTC)
     updated_pages_raw = retrieve_space_with_date(
@@ -82,32 +156,172 @@ def update_space(space: SpaceDTO, ignore_labels: list[str] = confluence_ignore_l
     )
     updated_pages = [page for page in updated_pages_raw if not isinstance(page, InaccessiblePage)]
     removed_page_ids = [page.page_id for page in updated_pages_raw if isinstance(page, InaccessiblePage)]
+    stored_last_updated = db_pages.find_last_updated([page.page_id for page in updated_pages_raw])
+    changed_pages_count = len([
+        page
+        for page in updated_pages
+        if page.page_id not in stored_last_updated or page.last_updated > stored_last_updated[page.page_id]
+    ]) + len([page_id for page_id in removed_page_ids if page_id in stored_last_updated])
 
     if updated_pages:
         db_pages.upsert_many(space, updated_pages)
+        __generate_digests(updated_pages)
 
     if removed_page_ids:
         db_pages.delete_by_page_ids(removed_page_ids)
 
     db_spaces.mark_imported(space, import_date)
+    return changed_pages_count
+
+
+def __schedule_next_sync(space: SpaceDTO, changed_pages: int, duration_seconds: float) -> None:
+    """Busy spaces are synced more often and dormant ones more rarely.
+
+    The interval is halved after a sync which found changes and doubled after one which did not,
+    within the configured bounds.
+    """
+    interval_minutes = space.sync_interval_minutes or space_sync_min_interval_minutes
+    interval_minutes = interval_minutes // 2 if changed_pages else interval_minutes * 2
+    interval_minutes = min(max(interval_minutes, space_sync_min_interval_minutes), space_sync_max_interval_minutes)
+
+    db_spaces.record_sync(
+        space,
+        changed_pages=changed_pages,
+        duration_seconds=duration_seconds,
+        sync_interval_minutes=interval_minutes,
+        next_sync_at=datetime.now(UTC) + timedelta(minutes=interval_minutes),
+    )
+    logging.info(
+        "Space next sync scheduled",
+        extra={"space_key": space.key, "changed_pages": changed_pages, "interval_minutes": interval_minutes},
+    )
+
+
+@tracer.wrap(service=ServiceNames.knowledge_base.value)
+def refresh_page(*, space_key: str, page_id: str, ignore_labels: list[str] = confluence_ignore_labels) -> None:
+    """Re-import a single page of an imported space, removing it if it is not accessible or ignored anymore."""
+    space = db_spaces.find_by_key(space_key)
+    if not space:
+        logging.info("Page of not imported space, skipping", extra={"space_key": space_key, "page_id": page_id})
+        return
+
+    page = retrieve_page(space_key, page_id)
+    if isinstance(page, InaccessiblePage) or (ignore_labels and is_page_labeled(space_key, page_id, ignore_labels)):
+        remove_page(page_id=page_id)
+        return
+
+    db_pages.upsert_many(space, [page])
+    __generate_digests([page])
+    logging.info("Page refreshed", extra={"space_key": space_key, "page_id": page_id})
+
+
+@tracer.wrap(service=ServiceNames.knowledge_base.value)
+def remove_page(*, page_id: str) -> None:
+    db_pages.delete_by_page_ids([page_id])
+    logging.info("Page removed", extra={"page_id": page_id})
+
+
+@tracer.wrap(service=ServiceNames.knowledge_base.value)
+def remove_space(*, space_key: str) -> None:
+    space = db_spaces.find_by_key(space_key)
+    if space:
+        __delete_space_and_related_pages(space)
+
+
+def __start_or_resume_import_run(space_key: str, space_name: str) -> ImportRunDTO:
+    run = db_import_runs.find_resumable(space_key)
+    if not run:
+        return db_import_runs.start(space_key=space_key, space_name=space_name, import_date=datetime.now(UTC))
+
+    db_import_runs.resume(run)
+    logging.info(
+        "Resuming space import",
+        extra={"space_key": space_key, "import_run_id": run.id, "pages": db_import_runs.count_pages_by_status(run)},
+    )
+    return run
+
+
+def __discover_pages_to_import(run: ImportRunDTO, ignore_labels: list[str]) -> None:
+    ignored_by_label_page_ids = set(get_space_page_ids_by_label(run.space_key, ignore_labels))
+    page_ids = set(get_space_page_ids(run.space_key, status=_PAGE_STATUS_FOR_IMPORT)) - ignored_by_label_page_ids
+
+    if ignored_by_label_page_ids:
+        logging.info("Ignoring pages", extra={"space_key": run.space_key, "page_ids": ignored_by_label_page_ids})
+
+    db_import_runs.register_pages(run, sorted(page_ids))
+
+
+def __embed_stored_pages(run: ImportRunDTO) -> None:
+    """Embed pages which were stored by an interrupted run but did not reach the vector database."""
+    while page_ids := db_import_runs.page_ids_with_status(run, ImportRunPageStatus.stored, limit=import_batch_size):
+        pages = db_pages.find_many_by_ids(page_ids)
+        if pages:
+            db_pages.embed_many(pages)
+            __generate_digests(pages)
+
+        db_import_runs.mark_pages(run, page_ids, ImportRunPageStatus.embedded)
+
+
+def __import_pending_pages(run: ImportRunDTO, space: SpaceDTO) -> None:
+    while page_ids := db_import_runs.page_ids_with_status(run, ImportRunPageStatus.pending, limit=import_batch_size):
+        pages_data = retrieve_pages(run.space_key, page_ids)
+        pages = __record_inaccessible_pages(run, pages_data)
+        if not pages:
+            continue
+
+        stored_page_ids = [page.page_id for page in pages]
+        db_pages.store_many(space, pages)
+        db_import_runs.mark_pages(run, stored_page_ids, ImportRunPageStatus.stored)
+
+        db_pages.embed_many(pages)
+        __generate_digests(pages)
+        db_import_runs.mark_pages(run, stored_page_ids, ImportRunPageStatus.embedded)
+
+        logging.info("Import batch processed", extra={"space_key": run.space_key, "count": len(stored_page_ids)})
 
 
-def __assert_all_pages_accessible(pages_data: list[PageDataDTO | InaccessiblePage]) -> list[PageDataDTO]:
-    inaccessible_pages = [page for page in pages_data if isinstance(page, InaccessiblePage)]
-    if inaccessible_pages:
-        page_ids = [page.page_id for page in inaccessible_pages]
-        logging.error("Inacessible pages in space", extra={"page_ids": page_ids})
-        raise AssertionError
+def __generate_digests(pages: list[PageDataDTO]) -> None:
+    if page_digests_enabled:
+        generate_digests(pages)
+
+
+def __record_inaccessible_pages(
+    run: ImportRunDTO, pages_data: list[PageDataDTO | InaccessiblePage]
+) -> list[PageDataDTO]:
+    inaccessible_page_ids = [page.page_id for page in pages_data if isinstance(page, InaccessiblePage)]
+    if inaccessible_page_ids:
+        logging.warning(
+            "Inaccessible pages in space", extra={"space_key": run.space_key, "page_ids": inaccessible_page_ids}
+        )
+        db_import_runs.mark_pages(run, inaccessible_page_ids, ImportRunPageStatus.inaccessible)
 
     return [page for page in pages_data if not isinstance(page, InaccessiblePage)]
 
 
+def __finish_import_run(run: ImportRunDTO, space: SpaceDTO) -> None:
+    pages_by_status = db_import_runs.count_pages_by_status(run)
+    inaccessible_count = pages_by_status.get(ImportRunPageStatus.inaccessible.value, 0)
+    if inaccessible_count:
+        sentry_notify_issue(
+            "Inaccessible pages during space import",
+            extra={"space_key": run.space_key, "import_run_id": run.id, "count": inaccessible_count},
+        )
+
+    # the run start date is used, so that pages updated while the import was running are pulled by the next update
+    db_spaces.mark_imported(space, import_date=run.import_date)
+    db_import_runs.complete(run)
+
+
 def __delete_space_and_related_pages(space: SpaceDTO) -> None:
     logging.info("Deleting space and related pages", extra={"space_key": space.key})
     db_spaces.delete_space_and_related_pages(space.id)
 
 
-def __remove_non_relevant_pages(space: SpaceDTO, labels: list[str] = confluence_ignore_labels) -> None:
+def __remove_non_relevant_pages(space: SpaceDTO, labels: list[str] = confluence_ignore_labels) -> int:
+    if not __pages_full_diff_due(space):
+        return 0
+
+    checked_at = datetime.now(UTC)
     ignored_by_label_page_ids = set(get_space_page_ids_by_label(space.key, labels))
     all_current_page_ids = set(get_space_page_ids(space.key, status=_PAGE_STATUS_FOR_IMPORT))
     relevant_page_ids = all_current_page_ids - ignored_by_label_page_ids
@@ -122,3 +336,29 @@ def __remove_non_relevant_pages(space: SpaceDTO, labels: list[str] = confluence_
             extra={"space_key": space.key, "page_ids": non_relevant_page_ids},
         )
         db_pages.delete_by_page_ids(non_relevant_page_ids)
+
+    db_spaces.mark_pages_checked(space, pages_count=len(all_current_page_ids), checked_at=checked_at)
+    return len(non_relevant_page_ids)
+
+
+def __pages_full_diff_due(space: SpaceDTO) -> bool:
+    """Listing all the page ids of a space is expensive, so it is done only when the space page count changed.
+
+    Changes which keep the count (e.g. a page removed and another one created, a label added) are picked up
+    by the periodic full diff.
+    """
+    if space.pages_checked_at is None or space.pages_count is None:
+        return True
+
+    if datetime.now(UTC) - space.pages_checked_at >= timedelta(minutes=space_pages_full_diff_interval_minutes):
+        return True
+
+    pages_count = count_space_pages(space.key)
+    if pages_count != space.pages_count:
+        logging.info(
+            "Space pages count changed",
+            extra={"space_key": space.key, "pages_count": pages_count, "previous_pages_count": space.pages_count},
+        )
+        return True
+
+    return False
@@ -1,13 +1,41 @@
 import json
 import logging
-from collections.abc import Callable
+import re
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+import top_assist.database.interactions as db_interactions
 import top_assist.database.pages as db_pages
-from top_assist.configuration import qa_assistant_id, question_context_pages_count
+from top_assist.configuration import (
+    answer_cache_enabled,
+    embedding_model_id,
+    knowledge_base_completion_backend,
+    page_digests_enabled,
+    qa_assistant_id,
+    question_context_full_text_pages,
+    question_context_overfetch_factor,
+    question_context_pages_count,
+    question_context_token_budget,
+)
 from top_assist.confluence.policy import PageAccessPolicy
+from top_assist.knowledge_base.answer_cache import ReusableAnswer, cache_answer, find_reusable_answer, record_reuse
+from top_assist.knowledge_base.context import PackedContext, pack_pages_context
 from top_assist.models.page_data import PageDataDTO
-from top_assist.open_ai.assistants.threads import add_user_message_and_complete
+from top_assist.open_ai.assistants.templates import qa_assistant_template
+from top_assist.open_ai.assistants.threads import (
+    ThreadCompletion,
+    add_user_message_and_complete,
+    create_answered_thread,
+    create_thread,
+)
+from top_assist.open_ai.chat import ChatMessage, CompletionBackend, complete_chat, is_chat_thread, new_chat_thread_id
+from top_assist.open_ai.embeddings import embed_text
+from top_assist.utils.metrics import (
+    QUESTION_CONTEXT_DENIED_RATIO_HISTOGRAM_METRIC,
+    QUESTION_CONTEXT_TOKENS_HISTOGRAM_METRIC,
+)
 from top_assist.utils.sentry_notifier import sentry_notify_issue
 from top_assist.utils.tracer import ServiceNames, tracer
 
@@ -20,32 +48,101 @@ class KnowledgeBaseAnswer:  # noqa: D101
     assistant_thread_id: str
 
 
+@dataclass
+class RetrievedContext:
+    """The pages retrieved for a question, which the user can access.
+
+    Attr:
+        question: str - The question the pages were retrieved for
+        question_embedding: list[float] - The embedding of the question
+        candidate_ids: list[str] - The IDs of the pages relevant to the question, before the access check
+        allowed_pages: list[PageDataDTO] - The most relevant pages the user can access
+    """
+
+    question: str
+    question_embedding: list[float]
+    candidate_ids: list[str]
+    allowed_pages: list[PageDataDTO]
+
+
 @tracer.wrap(service=ServiceNames.knowledge_base.value)
-def query_knowledge_base(
+def query_knowledge_base(  # noqa: PLR0913
     *,
     question: str,
     thread_id: str | None = None,
     access_policy: PageAccessPolicy,
     text_formatter: Callable[[str], str] = lambda text: text,
+    on_partial_answer: Callable[[str], None] | None = None,
+    history: Sequence[ChatMessage] = (),
+    question_embedding: list[float] | None = None,
+    retrieved_context: RetrievedContext | None = None,
 ) -> KnowledgeBaseAnswer:
-    """Ask assistant a question using documents related to context query as a context."""
+    """Ask assistant a question using documents related to context query as a context.
+
+    With `on_partial_answer` the answer is streamed, the callback receives the formatted answer generated so far.
+    The `history` of the conversation before the question is sent along by the chat completion backend,
+    the assistants backend keeps it in the assistant thread.
+    A `question_embedding` already computed for the question (e.g. to route it) is used instead of embedding it again,
+    and a `retrieved_context` (e.g. retrieved speculatively while routing) instead of retrieving the pages again.
+
+    Steps not depending on each other run concurrently: a new assistant thread is created during the retrieval,
+    the candidate pages are loaded from the database during the access check.
+    First questions reuse the answer to a similar question when its pages did not change.
+    Pages already sent to the assistant thread by previous questions are referenced instead of being sent again.
+    """
     log_page_ids = None
+    started_at = time.monotonic()
     try:
-        pages = db_pages.retrieve_relevant(question, count=question_context_pages_count)
-        log_page_ids = [page.page_id for page in pages]
-        logging.debug("Building context from pages", extra={"log_page_ids": log_page_ids})
-        allowed_pages = __filter_pages_by_access(pages, access_policy)
+        if retrieved_context:
+            question_embedding = retrieved_context.question_embedding
+        question_embedding = question_embedding or embed_text(text=question, model=embedding_model_id)
+        use_answer_cache = answer_cache_enabled and thread_id is None
+        reusable = find_reusable_answer(question_embedding, access_policy) if use_answer_cache else None
+        if reusable:
+            return __reuse_answer(question, reusable, text_formatter, started_at)
 
-        context = __format_pages_as_context(allowed_pages)
-        formatted_question = f"Here is the question and the context\n\n{question}\n\nContext:\n{context}"
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            new_thread_id = executor.submit(create_thread) if thread_id is None and not __is_chat_backend() else None
+            thread_pages = (
+                executor.submit(__find_thread_pages, thread_id)
+                if thread_id is not None and __tracks_thread_pages(thread_id)
+                else None
+            )
 
-        completion = add_user_message_and_complete(
-            formatted_question,
-            assistant_id=qa_assistant_id,
-            thread_id=thread_id,
-            response_format={"type": "json_object"},
+            context = retrieved_context or retrieve_context(
+                question, question_embedding=question_embedding, access_policy=access_policy
+            )
+            log_page_ids = context.candidate_ids
+            allowed_pages = context.allowed_pages
+            completion_thread_id = new_thread_id.result() if new_thread_id else thread_id
+            pages_in_thread = __pages_in_thread(allowed_pages, thread_pages.result() if thread_pages else {})
+            new_pages = [page for page in allowed_pages if page not in pages_in_thread]
+
+        packed_context = __pack_context(new_pages)
+        completion = __complete(
+            __format_question(question, packed_context, pages_in_thread),
+            thread_id=completion_thread_id,
+            history=history,
+            on_text_delta=(
+                _PartialAnswer(
+                    is_follow_up=thread_id is not None, text_formatter=text_formatter, callback=on_partial_answer
+                ).append
+                if on_partial_answer
+                else None
+            ),
         )
+        if not __is_chat_backend():
+            __add_thread_pages(completion.thread_id, __full_text_pages(new_pages, packed_context))
+
         formatted_message = __format_assistant_response(completion.message, allowed_pages, text_formatter, thread_id)
+        if use_answer_cache and allowed_pages and formatted_message != FAILED_TO_ANSWER_MSG:
+            cache_answer(
+                question=question,
+                question_embedding=question_embedding,
+                response=completion.message,
+                pages=allowed_pages,
+                answer_seconds=time.monotonic() - started_at,
+            )
 
         return KnowledgeBaseAnswer(
             message=formatted_message,
@@ -56,6 +153,133 @@ def query_knowledge_base(
         raise
 
 
+@tracer.wrap(service=ServiceNames.knowledge_base.value)
+def retrieve_context(
+    question: str, *, question_embedding: list[float], access_policy: PageAccessPolicy
+) -> RetrievedContext:
+    """Retrieve the pages most relevant to the question which the user can access.
+
+    The candidate pages are loaded from the database during the access check.
+    """
+    # Over-fetch so that pages the user cannot access are replaced by the next relevant ones
+    candidate_ids = db_pages.retrieve_relevant_ids(
+        question_embedding, count=question_context_pages_count * question_context_overfetch_factor
+    )
+    logging.debug("Building context from pages", extra={"log_page_ids": candidate_ids})
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        candidates = executor.submit(__load_pages, candidate_ids)
+        allowed_page_ids = __check_access(candidate_ids, access_policy)
+        allowed_pages = __filter_pages_by_access(candidates.result(), allowed_page_ids)
+
+    return RetrievedContext(
+        question=question,
+        question_embedding=question_embedding,
+        candidate_ids=candidate_ids,
+        allowed_pages=allowed_pages[:question_context_pages_count],
+    )
+
+
+def __reuse_answer(
+    question: str, reusable: ReusableAnswer, text_formatter: Callable[[str], str], started_at: float
+) -> KnowledgeBaseAnswer:
+    if __is_chat_backend():
+        # Follow-up questions continue from the conversation stored in the Slack thread
+        thread_id = new_chat_thread_id()
+    else:
+        # Follow-up questions continue in a thread holding the question with its context and the reused answer
+        packed_context = __pack_context(reusable.pages)
+        thread_id = create_answered_thread(__format_question(question, packed_context), reusable.answer.response)
+        __add_thread_pages(thread_id, __full_text_pages(reusable.pages, packed_context))
+    record_reuse(reusable, answer_seconds=time.monotonic() - started_at)
+    return KnowledgeBaseAnswer(
+        message=__format_assistant_response(reusable.answer.response, reusable.pages, text_formatter, None),
+        assistant_thread_id=thread_id,
+    )
+
+
+def __is_chat_backend() -> bool:
+    return knowledge_base_completion_backend == CompletionBackend.chat
+
+
+def __complete(
+    user_message: str,
+    *,
+    thread_id: str | None,
+    history: Sequence[ChatMessage],
+    on_text_delta: Callable[[str], None] | None,
+) -> ThreadCompletion:
+    if __is_chat_backend():
+        return complete_chat(
+            user_message,
+            template=qa_assistant_template,
+            history=history,
+            thread_id=thread_id,
+            response_format="json_object",
+            on_text_delta=on_text_delta,
+        )
+
+    if thread_id and is_chat_thread(thread_id):
+        # The conversation was started by the chat backend, it continues in a new assistant thread
+        thread_id = None
+
+    return add_user_message_and_complete(
+        user_message,
+        assistant_id=qa_assistant_id,
+        thread_id=thread_id,
+        response_format={"type": "json_object"},
+        on_text_delta=on_text_delta,
+    )
+
+
+def __pack_context(pages: list[PageDataDTO]) -> PackedContext:
+    context = pack_pages_context(
+        pages,
+        token_budget=question_context_token_budget,
+        full_text_pages=question_context_full_text_pages if page_digests_enabled else None,
+    )
+    QUESTION_CONTEXT_TOKENS_HISTOGRAM_METRIC.observe(context.token_count)
+    return context
+
+
+def __format_question(question: str, context: PackedContext, pages_in_thread: Sequence[PageDataDTO] = ()) -> str:
+    message = f"Here is the question and the context\n\n{question}\n\nContext:\n{context.text}"
+    if pages_in_thread:
+        references = "\n".join(f"pageId: {page.page_id}, title: {page.title}" for page in pages_in_thread)
+        message += f"\n\nDocuments given in the context of the previous questions, also relevant:\n{references}"
+    return message
+
+
+def __tracks_thread_pages(thread_id: str) -> bool:
+    # The chat backend sends no previous contexts, only the questions and answers
+    return not is_chat_thread(thread_id) and not __is_chat_backend()
+
+
+def __find_thread_pages(thread_id: str) -> dict[str, str]:
+    return db_interactions.find_assistant_thread_pages(thread_id)
+
+
+def __pages_in_thread(pages: list[PageDataDTO], thread_pages: dict[str, str]) -> list[PageDataDTO]:
+    """Pages sent to the thread before, a page updated since then is sent again."""
+    return [page for page in pages if thread_pages.get(page.page_id) == __page_version(page)]
+
+
+def __full_text_pages(pages: list[PageDataDTO], context: PackedContext) -> list[PageDataDTO]:
+    """Pages sent to the thread in full, the truncated, digested or left out pages are sent again when relevant."""
+    return [page for page in pages if page.page_id in context.full_text_page_ids]
+
+
+def __add_thread_pages(thread_id: str, pages: list[PageDataDTO]) -> None:
+    try:
+        db_interactions.add_assistant_thread_pages(thread_id, {page.page_id: __page_version(page) for page in pages})
+    except Exception:
+        # The pages are sent again with the next question then
+        logging.exception("Error tracking assistant thread pages", extra={"thread_id": thread_id})
+
+
+def __page_version(page: PageDataDTO) -> str:
+    return page.last_updated.isoformat()
+
+
 def __add_pages_links(allowed_pages: list[PageDataDTO], used_pages: list[str]) -> str:
     if not used_pages:
         return ""
@@ -68,33 +292,6 @@ def __add_pages_links(allowed_pages: list[PageDataDTO], used_pages: list[str]) -
     return links
 
 
-def __format_pages_as_context(
-    pages: list[PageDataDTO],
-    max_length: int = 30000,
-    truncation_label: str = " [Content truncated due to size limit.]",
-) -> str:
-    """Formats specified files as a context string for referencing in responses.
-
-    Ensuring the total context length does not exceed the specified maximum length.
-    """
-    context: list[str] = []
-    for page in pages:
-        title = page.title
-        space_key = page.space_key
-        file_content = page.format_for_llm()
-        page_data = f"Document Title: {title}\nSpace Key: {space_key}\n\n{file_content}"
-
-        # Truncate and stop if the total length exceeds the maximum allowed
-        if len(context) + len(page_data) > max_length:
-            available_space = max_length - len(context) - len(truncation_label)
-            truncated_data = page_data[:available_space] + truncation_label
-            context.append(truncated_data)
-            break
-
-        context.append(page_data)
-    return "\n".join(context)
-
-
 def __format_assistant_response(
     response: str, allowed_pages: list[PageDataDTO], text_formatter: Callable[[str], str], thread_id: str | None
 ) -> str:
@@ -130,9 +327,60 @@ def __format_assistant_response(
     return message
 
 
-def __filter_pages_by_access(pages: list[PageDataDTO], access_policy: PageAccessPolicy) -> list[PageDataDTO]:
-    page_ids = [page.page_id for page in pages]
+class _PartialAnswer:
+    """Formats the answer from its JSON response while it is streamed, without the links to the pages."""
+
+    def __init__(
+        self, *, is_follow_up: bool, text_formatter: Callable[[str], str], callback: Callable[[str], None]
+    ) -> None:
+        self._is_follow_up = is_follow_up
+        self._text_formatter = text_formatter
+        self._callback = callback
+        self._response = ""
+
+    def append(self, text_delta: str) -> None:
+        self._response += text_delta
+        summary = self._string_field_prefix("summary")
+        comprehensive_answer = self._string_field_prefix("comprehensive_answer")
+
+        if self._is_follow_up:
+            message = self._text_formatter(comprehensive_answer or summary)
+        else:
+            message = f"*Summary*\n{self._text_formatter(summary)}\n\n" if summary else ""
+            if comprehensive_answer:
+                message += f"*Comprehensive Answer*\n{self._text_formatter(comprehensive_answer)}"
+
+        if message:
+            self._callback(message)
+
+    def _string_field_prefix(self, field: str) -> str:
+        """The part of a string field of the JSON response received so far."""
+        match = re.search(rf'"{field}"\s*:\s*"((?:[^"\\]|\\.)*)', self._response)
+        if not match:
+            return ""
+
+        # An escape sequence may be cut at the end of the received part
+        value = re.sub(r"\\(u[0-9a-fA-F]{0,3})?$", "", match.group(1))
+        try:
+            return json.loads(f'"{value}"')
+        except json.JSONDecodeError:
+            return value
+
+
+@tracer.wrap(service=ServiceNames.knowledge_base.value, resource="knowledge_base.query.load_pages")
+def __load_pages(page_ids: list[str]) -> list[PageDataDTO]:
+    return db_pages.find_many_by_ids(page_ids)
+
+
+@tracer.wrap(service=ServiceNames.knowledge_base.value, resource="knowledge_base.query.check_access")
+def __check_access(page_ids: list[str], access_policy: PageAccessPolicy) -> set[str]:
     allowed_page_ids = access_policy.accessible_pages(page_ids)
-    allowed_pages = [page for page in pages if page.page_id in allowed_page_ids]
     logging.info("Allowed pages", extra={"allowed_page_ids": allowed_page_ids})
+    return allowed_page_ids
+
+
+def __filter_pages_by_access(pages: list[PageDataDTO], allowed_page_ids: set[str]) -> list[PageDataDTO]:
+    allowed_pages = [page for page in pages if page.page_id in allowed_page_ids]
+    if pages:
+        QUESTION_CONTEXT_DENIED_RATIO_HISTOGRAM_METRIC.observe(1 - len(allowed_pages) / len(pages))
     return allowed_pages
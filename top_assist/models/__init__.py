@@ -1,8 +1,14 @@
 # Import all models here to make them available for Alembic migrations --autogenerate
 from .base import Base
+from .cached_answer import CachedAnswerORM
 from .channel import ChannelORM
+from .import_run import ImportRunORM, ImportRunPageORM
+from .job import JobORM
+from .llm_cache_entry import LLMCacheEntryORM
+from .page_access import PageAccessORM
 from .page_data import PageDataORM
-from .qa_interaction import QAInteractionORM
+from .qa_interaction import AssistantThreadPageORM, QAInteractionORM
+from .rate_limit_bucket import RateLimitBucketORM
 from .service_cooldown import ServiceCooldownORM
 from .space import SpaceORM
 from .user_auth import UserAuthORM
@@ -17,4 +23,12 @@ __all__ = [
     "UserFeedbackScoreORM",
     "ChannelORM",
     "UserAuthORM",
+    "ImportRunORM",
+    "ImportRunPageORM",
+    "RateLimitBucketORM",
+    "JobORM",
+    "PageAccessORM",
+    "CachedAnswerORM",
+    "AssistantThreadPageORM",
+    "LLMCacheEntryORM",
 ]
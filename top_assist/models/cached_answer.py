@@ -0,0 +1,66 @@
+import typing
+from datetime import datetime
+
+from pydantic import BaseModel
+from sqlalchemy import JSON
+
+from .base import Base, Mapped, Optional, int_pk, mapped_column, timestamp
+
+
+class CachedAnswerORM(Base):
+    """SQLAlchemy model for storing answers reused for semantically similar questions.
+
+    The embedding of the question is stored in the "answers" collection of the vector database.
+
+    Attr:
+        id: The primary key of the answer, also the ID of the question embedding.
+        question: The question the answer was generated for.
+        response: The raw assistant response (JSON with summary, comprehensive answer and page IDs).
+        page_versions: The pages in the context of the answer, page ID -> last update in Confluence (ISO format).
+        answer_seconds: The time it took to generate the answer.
+        hits: The number of times the answer was reused.
+        last_hit_at: The timestamp the answer was reused last.
+    """
+
+    __tablename__ = "cached_answers"
+
+    id: Mapped[int_pk]
+    question: Mapped[str]
+    response: Mapped[str]
+    page_versions: Mapped[dict] = mapped_column(JSON)
+    answer_seconds: Mapped[float]
+    hits: Mapped[int] = mapped_column(default=0)
+    last_hit_at: Mapped[Optional[timestamp]]
+
+    repr_cols = ("question",)
+
+
+class CachedAnswerDTO(BaseModel):
+    """Data transfer object for CachedAnswerORM.
+
+    Attr:
+        id: The primary key of the answer.
+        question: The question the answer was generated for.
+        response: The raw assistant response.
+        page_versions: The pages in the context of the answer, page ID -> last update in Confluence (ISO format).
+        answer_seconds: The time it took to generate the answer.
+        created_at: The timestamp the answer was generated at.
+    """
+
+    id: int
+    question: str
+    response: str
+    page_versions: dict[str, str]
+    answer_seconds: float
+    created_at: datetime
+
+    @classmethod
+    def from_orm(cls, model: CachedAnswerORM) -> typing.Self:
+        return cls(
+            id=model.id,
+            question=model.question,
+            response=model.response,
+            page_versions=model.page_versions,
+            answer_seconds=model.answer_seconds,
+            created_at=model.created_at,
+        )
@@ -0,0 +1,117 @@
+import typing
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+from sqlalchemy import UniqueConstraint
+
+from .base import Base, ForeignKey, Index, Mapped, Optional, int_pk, mapped_column, timestamp
+
+
+class ImportRunStatus(str, Enum):
+    """Lifecycle of a space import run."""
+
+    in_progress = "in_progress"
+    failed = "failed"
+    completed = "completed"
+
+
+class ImportRunPageStatus(str, Enum):
+    """Checkpoints of a single page within an import run.
+
+    pending: discovered in Confluence, not fetched yet
+    stored: fetched from Confluence and stored in the database, not embedded yet
+    embedded: stored and embedded in the vector database (done)
+    inaccessible: Confluence reported the page as not found or not accessible (done)
+    """
+
+    pending = "pending"
+    stored = "stored"
+    embedded = "embedded"
+    inaccessible = "inaccessible"
+
+
+class ImportRunORM(Base):
+    """SQLAlchemy model for storing Confluence space import runs.
+
+    Attr:
+        id: The primary key of the import run.
+        space_key: Confluence space key.
+        space_name: Confluence space name.
+        status: The status of the run (in_progress, failed, completed).
+        import_date: The timestamp the run was started at, used as the space import date once completed.
+        pages_discovered: Whether the list of pages to import has been registered for the run.
+        finished_at: The timestamp when the run was completed.
+        error: The last error which interrupted the run.
+    """
+
+    __tablename__ = "import_runs"
+
+    id: Mapped[int_pk]
+    space_key: Mapped[str]
+    space_name: Mapped[str]
+    status: Mapped[str]
+    import_date: Mapped[timestamp]
+    pages_discovered: Mapped[bool] = mapped_column(default=False)
+    finished_at: Mapped[Optional[timestamp]]
+    error: Mapped[Optional[str]]
+
+    repr_cols = ("space_key", "status")
+
+    __table_args__ = (Index("ix_import_runs_space_key_status", "space_key", "status"),)
+
+
+class ImportRunPageORM(Base):
+    """SQLAlchemy model for storing per-page checkpoints of an import run.
+
+    Attr:
+        id: The primary key of the record.
+        import_run_id: The primary key of the import run.
+        page_id: Confluence page ID.
+        status: The checkpoint reached by the page (pending, stored, embedded, inaccessible).
+    """
+
+    __tablename__ = "import_run_pages"
+
+    id: Mapped[int_pk]
+    import_run_id: Mapped[int] = mapped_column(ForeignKey("import_runs.id", ondelete="CASCADE"))
+    page_id: Mapped[str]
+    status: Mapped[str]
+
+    repr_cols = ("page_id", "status")
+
+    __table_args__ = (
+        UniqueConstraint("import_run_id", "page_id"),
+        Index("ix_import_run_pages_import_run_id_status", "import_run_id", "status"),
+    )
+
+
+class ImportRunDTO(BaseModel):
+    """Data transfer object for ImportRunORM.
+
+    Attr:
+        id: The primary key of the import run.
+        space_key: Confluence space key.
+        space_name: Confluence space name.
+        status: The status of the run.
+        import_date: The timestamp the run was started at.
+        pages_discovered: Whether the list of pages to import has been registered for the run.
+    """
+
+    id: int_pk
+    space_key: str
+    space_name: str
+    status: str
+    import_date: datetime
+    pages_discovered: bool
+
+    @classmethod
+    def from_orm(cls, model: ImportRunORM) -> typing.Self:
+        return cls(
+            id=model.id,
+            space_key=model.space_key,
+            space_name=model.space_name,
+            status=model.status,
+            import_date=model.import_date,
+            pages_discovered=model.pages_discovered,
+        )
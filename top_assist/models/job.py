@@ -0,0 +1,101 @@
+import typing
+from enum import Enum
+
+from pydantic import BaseModel
+from sqlalchemy import JSON, text
+
+from .base import Base, Index, Mapped, Optional, int_pk, mapped_column, timestamp
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background job.
+
+    queued: waiting for a worker (first run or retry after `run_after`)
+    running: claimed by a worker
+    succeeded: done
+    failed: the last attempt failed and no attempts are left
+    """
+
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class JobORM(Base):
+    """SQLAlchemy model for storing background jobs processed by the worker.
+
+    Attr:
+        id: The primary key of the job.
+        kind: The kind of the job, defines the function running it.
+        payload: Keyword arguments of the function.
+        dedupe_key: Only one job with the key can be queued and only one can be running at the same time.
+        status: The status of the job (queued, running, succeeded, failed).
+        attempts: The number of times the job was claimed by a worker.
+        max_attempts: The number of attempts after which the job is failed.
+        run_after: The job is not claimed before this timestamp (retry backoff).
+        worker_id: The worker which claimed the job last.
+        heartbeat_at: The timestamp the worker reported the running job as alive last.
+        started_at: The timestamp the last attempt was started at.
+        finished_at: The timestamp the job succeeded or failed at.
+        error: The error of the last failed attempt.
+    """
+
+    __tablename__ = "jobs"
+
+    id: Mapped[int_pk]
+    kind: Mapped[str]
+    payload: Mapped[dict] = mapped_column(JSON, default=dict)
+    dedupe_key: Mapped[Optional[str]]
+    status: Mapped[str]
+    attempts: Mapped[int] = mapped_column(default=0)
+    max_attempts: Mapped[int]
+    run_after: Mapped[timestamp]
+    worker_id: Mapped[Optional[str]]
+    heartbeat_at: Mapped[Optional[timestamp]]
+    started_at: Mapped[Optional[timestamp]]
+    finished_at: Mapped[Optional[timestamp]]
+    error: Mapped[Optional[str]]
+
+    repr_cols = ("kind", "status")
+
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+        Index(
+            "ix_jobs_queued_dedupe_key",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text(f"status = '{JobStatus.queued.value}'"),
+        ),
+    )
+
+
+class JobDTO(BaseModel):
+    """Data transfer object for JobORM.
+
+    Attr:
+        id: The primary key of the job.
+        kind: The kind of the job.
+        payload: Keyword arguments of the function running the job.
+        dedupe_key: The deduplication key of the job.
+        attempts: The number of times the job was claimed by a worker.
+        max_attempts: The number of attempts after which the job is failed.
+    """
+
+    id: int
+    kind: str
+    payload: dict
+    dedupe_key: Optional[str]
+    attempts: int
+    max_attempts: int
+
+    @classmethod
+    def from_orm(cls, model: JobORM) -> typing.Self:
+        return cls(
+            id=model.id,
+            kind=model.kind,
+            payload=model.payload,
+            dedupe_key=model.dedupe_key,
+            attempts=model.attempts,
+            max_attempts=model.max_attempts,
+        )
@@ -0,0 +1,23 @@
+from .base import Base, Index, Mapped, int_pk, timestamp, unique_string
+
+
+class LLMCacheEntryORM(Base):
+    """SQLAlchemy model for caching the responses of the routing model calls.
+
+    Attr:
+        id: The primary key of the entry.
+        key: Hash of the model with its parameters and of the prompt.
+        value: The serialized response of the model.
+        stored_at: The timestamp the response was stored at.
+    """
+
+    __tablename__ = "llm_cache_entries"
+
+    id: Mapped[int_pk]
+    key: Mapped[unique_string]
+    value: Mapped[str]
+    stored_at: Mapped[timestamp]
+
+    repr_cols = ("stored_at",)
+
+    __table_args__ = (Index("ix_llm_cache_entries_stored_at", "stored_at"),)
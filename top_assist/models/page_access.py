@@ -0,0 +1,25 @@
+from .base import Base, Index, Mapped, int_pk, timestamp
+
+
+class PageAccessORM(Base):
+    """SQLAlchemy model for caching the access of Slack users to Confluence pages.
+
+    Attr:
+        id: The primary key of the entry.
+        slack_user_id: The Slack user whose Confluence token was used for the check.
+        page_id: The Confluence page ID.
+        allowed: Whether the page was visible to the user.
+        checked_at: The timestamp of the check in Confluence.
+    """
+
+    __tablename__ = "page_access"
+
+    id: Mapped[int_pk]
+    slack_user_id: Mapped[str]
+    page_id: Mapped[str]
+    allowed: Mapped[bool]
+    checked_at: Mapped[timestamp]
+
+    repr_cols = ("page_id", "allowed")
+
+    __table_args__ = (Index("ix_page_access_slack_user_id_page_id", "slack_user_id", "page_id", unique=True),)
@@ -1,3 +1,4 @@
+import hashlib
 import typing
 from datetime import datetime
 from typing import TYPE_CHECKING
@@ -7,6 +8,7 @@ from sqlalchemy.orm import validates
 from starlette.requests import Request
 
 from top_assist.configuration import confluence_base_url
+from top_assist.utils.tokenizer import count_tokens
 
 from .base import (
     Base,
@@ -14,6 +16,7 @@ from .base import (
     Index,
     Integer,
     Mapped,
+    Optional,
     int_pk,
     mapped_column,
     relationship,
@@ -40,6 +43,10 @@ class PageDataORM(Base):
         content: Page content.
         comments: Page comments.
         content_length: The length of the page content in bytes.
+        llm_text: The page formatted for use with the LLM, computed on import.
+        llm_token_count: The number of tokens of `llm_text` for the configured chat model.
+        digest: Dense summary of the page with summaries of its sections, generated on import when enabled.
+        digest_content_hash: The content hash of the page the digest was generated from.
     """
 
     __tablename__ = "page_data"
@@ -55,6 +62,10 @@ class PageDataORM(Base):
     content: Mapped[str]
     comments: Mapped[str]
     content_length: Mapped[int] = mapped_column(Integer, default=0)
+    llm_text: Mapped[Optional[str]]
+    llm_token_count: Mapped[Optional[int]]
+    digest: Mapped[Optional[str]]
+    digest_content_hash: Mapped[Optional[str]]
 
     space: Mapped["SpaceORM"] = relationship(back_populates="pages")
 
@@ -81,6 +92,9 @@ class PageDataDTO(BaseModel):
         created_date: The timestamp when the page was created in Confluence.
         last_updated: The timestamp of the last update in Confluence.
         content_length: The length of the page content in bytes.
+        llm_text: The page formatted for use with the LLM, None until formatted.
+        llm_token_count: The number of tokens of `llm_text`, None until counted.
+        digest: Dense summary of the page with summaries of its sections, None until generated.
     """
 
     page_id: str
@@ -92,6 +106,9 @@ class PageDataDTO(BaseModel):
     created_date: datetime
     last_updated: datetime
     content_length: int
+    llm_text: Optional[str] = None
+    llm_token_count: Optional[int] = None
+    digest: Optional[str] = None
 
     @classmethod
     def from_orm(cls, model: PageDataORM) -> typing.Self:
@@ -105,10 +122,43 @@ class PageDataDTO(BaseModel):
             created_date=model.created_date,
             last_updated=model.last_updated,
             content_length=model.content_length,
+            llm_text=model.llm_text,
+            llm_token_count=model.llm_token_count,
+            digest=model.digest,
         )
 
     def format_for_llm(self) -> str:
-        """Format a page for use with the LLM."""
+        """Format a page for use with the LLM, the text stored on import is reused."""
+        if self.llm_text is None:
+            self.llm_text = self._render_for_llm()
+
+        return self.llm_text
+
+    def token_count(self) -> int:
+        """The number of tokens of the page formatted for use with the LLM, the count stored on import is reused."""
+        if self.llm_token_count is None:
+            self.llm_token_count = count_tokens(self.format_for_llm())
+
+        return self.llm_token_count
+
+    def format_digest_for_llm(self) -> str | None:
+        """Format the digest of a page for use with the LLM instead of its full text, None without a digest."""
+        if self.digest is None:
+            return None
+
+        return "\n".join([
+            f"spaceKey: {self.space_key}",
+            f"pageId: {self.page_id}",
+            f"title: {self.title}",
+            f"last_updated: {self.last_updated.isoformat()}",
+            f"digest: {self.digest}",
+        ])
+
+    def content_hash(self) -> str:
+        """Hash of the page parts summarized by its digest, the digest is outdated when it changes."""
+        return hashlib.sha256(f"{self.title}\n{self.content}\n{self.comments}".encode()).hexdigest()
+
+    def _render_for_llm(self) -> str:
         return "\n".join([
             f"spaceKey: {self.space_key}",
             f"pageId: {self.page_id}",
@@ -41,6 +41,30 @@ class QAInteractionORM(Base):
     __table_args__ = (Index("ix_qa_interactions_thread_id", "thread_id"),)
 
 
+class AssistantThreadPageORM(Base):
+    """SQLAlchemy model for tracking the Confluence pages already sent as context to an assistant thread.
+
+    Attr:
+        id: The primary key of the entry.
+        assistant_thread_id: ChatGPT assistant thread ID of the QA interaction.
+        page_id: The Confluence page ID.
+        page_version: The last update of the page in Confluence when it was sent (ISO format).
+    """
+
+    __tablename__ = "assistant_thread_pages"
+
+    id: Mapped[int_pk]
+    assistant_thread_id: Mapped[str]
+    page_id: Mapped[str]
+    page_version: Mapped[str]
+
+    repr_cols = ("assistant_thread_id", "page_id")
+
+    __table_args__ = (
+        Index("ix_assistant_thread_pages_thread_id_page_id", "assistant_thread_id", "page_id", unique=True),
+    )
+
+
 class QAInteractionDTO(BaseModel):
     """Data transfer object for QAInteractionORM.
 
@@ -0,0 +1,23 @@
+from .base import Base, Mapped, Optional, int_pk, timestamp, unique_string
+
+
+class RateLimitBucketORM(Base):
+    """SQLAlchemy model for storing token buckets of rate limited external services.
+
+    Attr:
+        id: The primary key of the bucket.
+        bucket_key: The key of the rate limited service.
+        tokens: The number of tokens left in the bucket at `refilled_at`.
+        refilled_at: The timestamp the tokens were last refilled at.
+        paused_until: The timestamp until which the service asked to stop sending requests (Retry-After).
+    """
+
+    __tablename__ = "rate_limit_buckets"
+
+    id: Mapped[int_pk]
+    bucket_key: Mapped[unique_string]
+    tokens: Mapped[float]
+    refilled_at: Mapped[timestamp]
+    paused_until: Mapped[Optional[timestamp]]
+
+    repr_cols_num = 3
@@ -18,6 +18,12 @@ class SpaceORM(Base):
         space_key: Confluence space key.
         space_name: Confluence space name.
         last_import_date: The timestamp of the last space import
+        pages_checked_at: The timestamp of the last comparison of all the space page ids with Confluence.
+        pages_count: The number of current pages in Confluence at the last comparison, used to detect changes.
+        sync_interval_minutes: The current interval between syncs of the space, adapted to its change rate.
+        next_sync_at: The timestamp after which the space is due for the next sync.
+        last_sync_changed_pages: The number of pages updated or removed by the last sync.
+        last_sync_duration_seconds: The duration of the last sync.
     """
 
     __tablename__ = "spaces"
@@ -26,6 +32,12 @@ class SpaceORM(Base):
     space_key: Mapped[unique_string]
     space_name: Mapped[unique_string]
     last_import_date: Mapped[Optional[timestamp]]
+    pages_checked_at: Mapped[Optional[timestamp]]
+    pages_count: Mapped[Optional[int]]
+    sync_interval_minutes: Mapped[Optional[int]]
+    next_sync_at: Mapped[Optional[timestamp]]
+    last_sync_changed_pages: Mapped[Optional[int]]
+    last_sync_duration_seconds: Mapped[Optional[float]]
 
     pages: Mapped[list["PageDataORM"]] = relationship(back_populates="space")
 
@@ -40,12 +52,20 @@ class SpaceDTO(BaseModel):
         key: Confluence space key.
         name: Confluence space name.
         last_import_date: The timestamp of the last space import.
+        pages_checked_at: The timestamp of the last comparison of all the space page ids with Confluence.
+        pages_count: The number of current pages in Confluence at the last comparison.
+        sync_interval_minutes: The current interval between syncs of the space.
+        next_sync_at: The timestamp after which the space is due for the next sync.
     """
 
     id: int_pk
     key: str
     name: str
     last_import_date: Optional[datetime]
+    pages_checked_at: Optional[datetime] = None
+    pages_count: Optional[int] = None
+    sync_interval_minutes: Optional[int] = None
+    next_sync_at: Optional[datetime] = None
 
     @classmethod
     def from_orm(cls, model: SpaceORM) -> typing.Self:
@@ -54,4 +74,8 @@ class SpaceDTO(BaseModel):
             key=model.space_key,
             name=model.space_name,
             last_import_date=model.last_import_date,
+            pages_checked_at=model.pages_checked_at,
+            pages_count=model.pages_count,
+            sync_interval_minutes=model.sync_interval_minutes,
+            next_sync_at=model.next_sync_at,
         )
@@ -1,6 +1,7 @@
 import logging
 import time
 import typing
+from collections.abc import Callable
 from dataclasses import dataclass
 
 import backoff
@@ -9,7 +10,9 @@ from openai import OpenAI
 from openai.types.beta import AssistantResponseFormatOptionParam
 from openai.types.beta.threads import ImageFileContentBlock, ImageURLContentBlock, Message, RefusalContentBlock
 
-from top_assist.configuration import open_ai_api_key
+from top_assist.configuration import open_ai_run_timeout_seconds
+from top_assist.open_ai.client import openai_client
+from top_assist.utils.metrics import ASSISTANT_RUN_POLLS_HISTOGRAM_METRIC, ASSISTANT_RUN_WAIT_HISTOGRAM_METRIC
 from top_assist.utils.service_cooldown import with_service_cooldown
 from top_assist.utils.tracer import ServiceNames, tracer
 
@@ -48,6 +51,10 @@ class RefusalContentBlockError(Exception):  # noqa: D101
     pass
 
 
+class RunTimeoutError(Exception):  # noqa: D101
+    pass
+
+
 @tracer.wrap(service=ServiceNames.open_ai.value)
 def add_user_message_and_complete(
     user_message: str,
@@ -55,11 +62,37 @@ def add_user_message_and_complete(
     assistant_id: str,
     thread_id: str | None = None,
     response_format: AssistantResponseFormatOptionParam = "auto",
+    on_text_delta: Callable[[str], None] | None = None,
 ) -> ThreadCompletion:
-    client = OpenAI(api_key=open_ai_api_key)
+    """Add the message to the thread (a new one if not given) and wait for the assistant to answer it.
+
+    With `on_text_delta` the run is streamed and the callback receives the answer text as it is generated.
+    """
+    client = openai_client()
     thread_id = __ensure_thread_exists(thread_id, client)
     __add_user_message(user_message, thread_id, client)
-    return __run(client, assistant_id, thread_id, response_format)
+    return __run(client, assistant_id, thread_id, response_format, on_text_delta)
+
+
+@tracer.wrap(service=ServiceNames.open_ai.value)
+def create_thread() -> str:
+    """Create an empty assistant thread, e.g. while the context of the first message is being prepared."""
+    client = openai_client()
+    return __ensure_thread_exists(None, client)
+
+
+@tracer.wrap(service=ServiceNames.open_ai.value)
+def create_answered_thread(user_message: str, assistant_message: str) -> str:
+    """Create an assistant thread with an already answered user message, follow-up questions continue from it."""
+    client = openai_client()
+    thread_id = client.beta.threads.create(
+        messages=[
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": assistant_message},
+        ]
+    ).id
+    logging.info("New answered assistant thread created", extra={"thread_id": thread_id})
+    return thread_id
 
 
 def __ensure_thread_exists(thread_id: str | None, client: OpenAI) -> str:
@@ -91,13 +124,25 @@ def __add_user_message(user_message: str, thread_id: str, client: OpenAI) -> Non
 )
 @backoff.on_exception(backoff.constant, RunExpiredError, max_tries=2)
 def __run(
-    client: OpenAI, assistant_id: str, thread_id: str, response_format: AssistantResponseFormatOptionParam
+    client: OpenAI,
+    assistant_id: str,
+    thread_id: str,
+    response_format: AssistantResponseFormatOptionParam,
+    on_text_delta: Callable[[str], None] | None,
 ) -> ThreadCompletion:
-    run = _Run.start(client, assistant_id, thread_id, response_format)
+    if on_text_delta:
+        run = _Run.stream(client, assistant_id, thread_id, response_format, on_text_delta)
+    else:
+        run = _Run.start(client, assistant_id, thread_id, response_format)
     return run.wait()
 
 
 class _Run:
+    # Most runs finish in a few seconds, the status is checked often first and less often for long runs
+    POLL_INITIAL_INTERVAL_SECONDS = 0.25
+    POLL_MAX_INTERVAL_SECONDS = 2.0
+    POLL_INTERVAL_MULTIPLIER = 1.5
+
     @classmethod
     def start(
         cls,
@@ -115,6 +160,58 @@ class _Run:
         logging.debug("Assistant thread run started", extra=instance.log_extra)
         return instance
 
+    @classmethod
+    def stream(  # noqa: PLR0913
+        cls,
+        client: OpenAI,
+        assistant_id: str,
+        thread_id: str,
+        response_format: AssistantResponseFormatOptionParam,
+        on_text_delta: Callable[[str], None],
+        timeout_seconds: float = open_ai_run_timeout_seconds,
+    ) -> typing.Self:
+        """Start the run and stream its text until it ends, cancel the run after the timeout.
+
+        The deadline is checked as the text arrives, the read timeout of the request covers a stream gone silent.
+        Waiting for a streamed run afterwards only checks its final status.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        with client.beta.threads.runs.stream(
+            thread_id=thread_id,
+            assistant_id=assistant_id,
+            response_format=response_format,
+            timeout=timeout_seconds,
+        ) as stream:
+            try:
+                cls._forward_text_deltas(stream.text_deltas, on_text_delta, deadline)
+            except (RunTimeoutError, openai.APITimeoutError) as e:
+                if stream.current_run is not None:
+                    cls(client, assistant_id, thread_id, stream.current_run.id).cancel()
+                raise RunTimeoutError from e
+
+            run_id = stream.get_final_run().id
+
+        instance = cls(client, assistant_id, thread_id, run_id)
+        logging.debug("Assistant thread run streamed", extra=instance.log_extra)
+        return instance
+
+    @classmethod
+    def _forward_text_deltas(
+        cls, text_deltas: typing.Iterable[str], on_text_delta: Callable[[str], None], deadline: float
+    ) -> None:
+        for text_delta in text_deltas:
+            cls._forward_text_delta(on_text_delta, text_delta)
+            if time.monotonic() >= deadline:
+                raise RunTimeoutError
+
+    @staticmethod
+    def _forward_text_delta(on_text_delta: Callable[[str], None], text_delta: str) -> None:
+        # The streamed text is a preview only, the completion is returned from the final messages
+        try:
+            on_text_delta(text_delta)
+        except Exception:
+            logging.exception("Error handling assistant text delta")
+
     def __init__(self, client: OpenAI, assistant_id: str, thread_id: str, run_id: str):
         self.client = client
         self.assistant_id = assistant_id
@@ -126,18 +223,49 @@ class _Run:
             "run_id": run_id,
         }
 
-    def wait(self) -> ThreadCompletion:
+    def wait(self, timeout_seconds: float = open_ai_run_timeout_seconds) -> ThreadCompletion:
+        """Poll the run status with growing intervals until it finishes, cancel the run after the timeout."""
+        started_at = time.monotonic()
+        deadline = started_at + timeout_seconds
+        interval = self.POLL_INITIAL_INTERVAL_SECONDS
+        polls = 0
+        outcome = "error"
         try:
             while True:
+                polls += 1
                 completion = self.__check_completion()
                 if completion is not None:
+                    outcome = "finished"
                     return completion
 
-                logging.info("Waiting for run to complete...", extra=self.log_extra)
-                time.sleep(2)
+                self.__sleep_before_next_poll(interval, deadline)
+                interval = min(interval * self.POLL_INTERVAL_MULTIPLIER, self.POLL_MAX_INTERVAL_SECONDS)
+        except RunTimeoutError:
+            outcome = "timeout"
+            raise
         except Exception:
             logging.exception("Error waiting for assistant thread run completion", extra=self.log_extra)
             raise
+        finally:
+            ASSISTANT_RUN_POLLS_HISTOGRAM_METRIC.labels(outcome=outcome).observe(polls)
+            ASSISTANT_RUN_WAIT_HISTOGRAM_METRIC.labels(outcome=outcome).observe(time.monotonic() - started_at)
+
+    def __sleep_before_next_poll(self, interval: float, deadline: float) -> None:
+        remaining_seconds = deadline - time.monotonic()
+        if remaining_seconds <= 0:
+            self.cancel()
+            raise RunTimeoutError
+
+        logging.debug("Waiting for run to complete...", extra={**self.log_extra, "interval": interval})
+        time.sleep(min(interval, remaining_seconds))
+
+    def cancel(self) -> None:
+        logging.warning("Assistant thread run timed out, cancelling", extra=self.log_extra)
+        try:
+            self.client.beta.threads.runs.cancel(thread_id=self.thread_id, run_id=self.run_id)
+        except openai.OpenAIError:
+            # The run may have finished or expired in the meantime
+            logging.exception("Failed to cancel assistant thread run", extra=self.log_extra)
 
     def __check_completion(self) -> ThreadCompletion | None:
         run_status = self.client.beta.threads.runs.retrieve(
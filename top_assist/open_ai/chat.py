@@ -0,0 +1,104 @@
+import logging
+import typing
+import uuid
+from collections.abc import Callable, Sequence
+from enum import Enum
+from typing import Literal, TypedDict
+
+import openai
+from openai.types.chat import ChatCompletionMessageParam
+from openai.types.chat.completion_create_params import ResponseFormat
+
+from top_assist.configuration import open_ai_run_timeout_seconds
+from top_assist.open_ai.assistants.templates import AssistantTemplate
+from top_assist.open_ai.assistants.threads import ThreadCompletion
+from top_assist.open_ai.client import openai_client
+from top_assist.utils.service_cooldown import with_service_cooldown
+from top_assist.utils.tracer import ServiceNames, tracer
+
+# The conversation of the chat backend is stored by Top Assist, its thread ID only marks the conversation as started
+CHAT_THREAD_ID_PREFIX = "chat_"
+
+
+class CompletionBackend(str, Enum):
+    """Where the conversation answered by an OpenAI model is kept.
+
+    assistants: in an OpenAI Assistants thread, answered by a run of the assistant configured on OpenAI
+    chat: by Top Assist, sent with the local assistant instructions in a single streamed Chat Completions request
+    """
+
+    assistants = "assistants"
+    chat = "chat"
+
+
+class ChatMessage(TypedDict):
+    """A previous message of the conversation, e.g. restored from the Slack thread."""
+
+    role: Literal["user", "assistant", "system"]
+    content: str
+
+
+def is_chat_thread(thread_id: str) -> bool:
+    return thread_id.startswith(CHAT_THREAD_ID_PREFIX)
+
+
+def new_chat_thread_id() -> str:
+    return f"{CHAT_THREAD_ID_PREFIX}{uuid.uuid4().hex}"
+
+
+@tracer.wrap(service=ServiceNames.open_ai.value)
+@with_service_cooldown(
+    service_key="openai_chat",
+    is_rate_limit_error=lambda e: isinstance(e, openai.RateLimitError),
+)
+def complete_chat(  # noqa: PLR0913
+    user_message: str,
+    *,
+    template: AssistantTemplate,
+    history: Sequence[ChatMessage] = (),
+    thread_id: str | None = None,
+    response_format: Literal["text", "json_object"] = "text",
+    on_text_delta: Callable[[str], None] | None = None,
+) -> ThreadCompletion:
+    """Answer the message following the history of the conversation with the model and instructions of the template.
+
+    The completion is streamed, `on_text_delta` receives the answer text as it is generated.
+
+    Returns:
+        ThreadCompletion: The answer with the given thread ID, or a new chat thread ID for the first message.
+    """
+    client = openai_client()
+    messages = [
+        {"role": "system", "content": template.instructions},
+        *({"role": message["role"], "content": message["content"]} for message in history),
+        {"role": "user", "content": user_message},
+    ]
+    stream = client.chat.completions.create(
+        model=template.model,
+        messages=typing.cast(list[ChatCompletionMessageParam], messages),
+        response_format=typing.cast(ResponseFormat, {"type": response_format}),
+        stream=True,
+        timeout=open_ai_run_timeout_seconds,
+    )
+
+    text_deltas: list[str] = []
+    for chunk in stream:
+        text_delta = chunk.choices[0].delta.content if chunk.choices else None
+        if not text_delta:
+            continue
+
+        text_deltas.append(text_delta)
+        if on_text_delta:
+            __forward_text_delta(on_text_delta, text_delta)
+
+    thread_id = thread_id or new_chat_thread_id()
+    logging.info("Chat completion received", extra={"thread_id": thread_id, "history_length": len(history)})
+    return ThreadCompletion("".join(text_deltas), thread_id)
+
+
+def __forward_text_delta(on_text_delta: Callable[[str], None], text_delta: str) -> None:
+    # The streamed text is a preview only, the completion is returned when the stream ends
+    try:
+        on_text_delta(text_delta)
+    except Exception:
+        logging.exception("Error handling chat completion text delta")
@@ -0,0 +1,72 @@
+import os
+from typing import Any
+
+import httpx
+from openai import DefaultHttpxClient, OpenAI
+
+from top_assist.configuration import open_ai_api_key, open_ai_keepalive_expiry_seconds, open_ai_max_connections
+from top_assist.utils.metrics import OPENAI_HTTP_REQUESTS_METRIC
+
+
+class _ProcessTransport(httpx.BaseTransport):
+    """Connection pool of the current process, a forked worker process opens its own connections.
+
+    Requests are counted by whether they opened a new connection or reused a kept-alive one.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._transport = httpx.HTTPTransport(
+            # HTTP/2 multiplexes the concurrent requests over a single connection
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=open_ai_max_connections,
+                max_keepalive_connections=open_ai_max_connections,
+                keepalive_expiry=open_ai_keepalive_expiry_seconds,
+            ),
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        new_connection = False
+        parent_trace = request.extensions.get("trace")
+
+        def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal new_connection
+            if event_name == "connection.connect_tcp.complete":
+                new_connection = True
+            if parent_trace:
+                parent_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        response = self._transport.handle_request(request)
+        OPENAI_HTTP_REQUESTS_METRIC.labels(connection="new" if new_connection else "reused").inc()
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+_transport = _ProcessTransport()
+# OpenAI defaults (timeouts, redirects), the connections are held by the transport
+_http_client = DefaultHttpxClient(transport=_transport)
+_client = OpenAI(api_key=open_ai_api_key, http_client=_http_client)
+
+
+def openai_client() -> OpenAI:
+    """OpenAI client shared by all requests of the process, so that the connections to the API are reused."""
+    return _client
+
+
+def openai_http_client() -> httpx.Client:
+    """HTTP client of the shared OpenAI client, e.g. for the langchain integrations."""
+    return _http_client
+
+
+def __reset_after_fork() -> None:
+    """Connections inherited from the parent must not be shared by a forked worker process."""
+    _transport.reset()
+
+
+os.register_at_fork(after_in_child=__reset_after_fork)
@@ -1,10 +1,10 @@
 import backoff
 import openai
 
-from top_assist.configuration import open_ai_api_key
+from top_assist.open_ai.client import openai_client
 from top_assist.utils.tracer import ServiceNames, tracer
 
-client = openai.OpenAI(api_key=open_ai_api_key)
+client = openai_client()
 
 
 @tracer.wrap(service=ServiceNames.open_ai.value)
@@ -22,3 +22,11 @@ def embed_text(text: str, model: str) -> list[float]:
     response = client.embeddings.create(input=text, model=model)
     embedding_vector = response.data[0].embedding
     return embedding_vector
+
+
+@tracer.wrap(service=ServiceNames.open_ai.value)
+@backoff.on_exception(backoff.expo, openai.RateLimitError, max_tries=3)
+def embed_texts(texts: list[str], model: str) -> list[list[float]]:
+    """Embed the given texts with a single request, the embeddings are in the order of the texts."""
+    response = client.embeddings.create(input=texts, model=model)
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
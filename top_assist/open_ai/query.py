@@ -1,9 +1,11 @@
 import logging
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
 
-from top_assist.configuration import base_assistant_id
+from top_assist.configuration import base_assistant_id, chatgpt_completion_backend
+from top_assist.open_ai.assistants.templates import base_assistant_template
 from top_assist.open_ai.assistants.threads import add_user_message_and_complete
+from top_assist.open_ai.chat import ChatMessage, CompletionBackend, complete_chat
 
 
 @dataclass
@@ -16,12 +18,21 @@ def query_chatgpt(
     question: str,
     assistant_thread_id: str | None = None,
     text_formatter: Callable[[str], str] = lambda text: text,
+    history: Sequence[ChatMessage] = (),
 ) -> ChatGPTAnswer:
     logging.debug("Querying ChatGPT directly", extra={"question": question})
-    completion = add_user_message_and_complete(
-        question,
-        assistant_id=base_assistant_id,
-        thread_id=assistant_thread_id,
-    )
+    if chatgpt_completion_backend == CompletionBackend.chat:
+        completion = complete_chat(
+            question,
+            template=base_assistant_template,
+            history=history,
+            thread_id=assistant_thread_id,
+        )
+    else:
+        completion = add_user_message_and_complete(
+            question,
+            assistant_id=base_assistant_id,
+            thread_id=assistant_thread_id,
+        )
     completion.message = text_formatter(completion.message)
     return ChatGPTAnswer(message=completion.message, assistant_thread_id=completion.thread_id)
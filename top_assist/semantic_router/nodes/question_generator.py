@@ -1,21 +1,53 @@
 import logging
-from typing import cast
+from typing import Literal, cast
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel
 
-from top_assist.configuration import model_id_mini
+from top_assist.configuration import (
+    llm_cache_question_generator_enabled,
+    llm_cache_question_generator_with_tool_choice_enabled,
+    model_id_mini,
+)
+from top_assist.open_ai.client import openai_http_client
+from top_assist.semantic_router.nodes.tool_choice_agent import run_tool_choice_agent
+from top_assist.semantic_router.tools import tools
 from top_assist.semantic_router.types import HistoryEntry, RouterState
-
-llm = ChatOpenAI(model=model_id_mini, max_retries=2)
+from top_assist.utils.llm_cache import LLMResponseCache
+
+llm = ChatOpenAI(
+    model=model_id_mini,
+    max_retries=2,
+    http_client=openai_http_client(),
+    cache=LLMResponseCache(node="question_generator") if llm_cache_question_generator_enabled else None,
+)
+llm_with_tool_choice = ChatOpenAI(
+    model=model_id_mini,
+    temperature=0,
+    max_retries=2,
+    http_client=openai_http_client(),
+    cache=(
+        LLMResponseCache(node="question_generator_with_tool_choice")
+        if llm_cache_question_generator_with_tool_choice_enabled
+        else None
+    ),
+)
+
+# Names of the tools in `tools`, constraining the tool chosen in the structured output schema
+ToolName = Literal["web_search", "query_chatgpt", "query_prompt_optimizer", "query_knowledge_base"]
 
 
 class PreparedQuestion(BaseModel):  # noqa: D101
     prepared_question: str
 
 
+class PreparedQuestionWithTool(BaseModel):  # noqa: D101
+    prepared_question: str
+    tool_name: ToolName | None
+
+
 SYSTEM_PROMPT = (
     """
         You are an assistant specializing in the analysis and editing of user messages within a conversation thread. Your task is as follows:
@@ -49,6 +81,14 @@ SYSTEM_PROMPT = (
 ).strip()
 
 
+TOOL_CHOICE_PROMPT = (
+    SYSTEM_PROMPT
+    + "\n\nChoose also the best tool for the prepared message, only one of the following tools:\n"
+    + "\n".join(f"- {tool.name}: {tool.description}" for tool in tools)
+    + '\nReturn the name of the chosen tool as "tool_name", or null if none of the tools fits the message.'
+)
+
+
 def run_question_generator(state: RouterState) -> dict:
     """Prepare the user question based on the conversation history."""
     logging.debug("Current state in the question generator", extra={"state": state})
@@ -74,6 +114,41 @@ def run_question_generator(state: RouterState) -> dict:
     return {"prepared_question": prepared_question}
 
 
+def run_question_generator_with_tool_choice(state: RouterState) -> dict:
+    """Prepare the user question based on the conversation history and choose the tool for it in a single model call.
+
+    Replaces the question generator followed by the tool choice agent, the first question of a thread
+    is not prepared and only the tool is chosen for it.
+    """
+    logging.debug("Current state in the question generator with tool choice", extra={"state": state})
+
+    if len(state["history"]) == 1:
+        prepared_question = state["history"][0]["content"]
+        logging.info("Prepared question (skipped)", extra={"prepared_question": prepared_question})
+        state_with_question = state.copy()
+        state_with_question["prepared_question"] = prepared_question
+        return {"prepared_question": prepared_question, **run_tool_choice_agent(state_with_question)}
+
+    messages: list[BaseMessage] = [SystemMessage(content=TOOL_CHOICE_PROMPT)]
+    messages.extend(__parse_history_for_langchain(state["history"]))
+
+    prompt_template = ChatPromptTemplate.from_messages(messages)
+    prepared_prompt = prompt_template.invoke(input={})
+
+    llm_with_schema = llm_with_tool_choice.with_structured_output(method="json_schema", schema=PreparedQuestionWithTool)
+    response = cast(PreparedQuestionWithTool, llm_with_schema.invoke(prepared_prompt))
+    # No tool is left to the tool executor, like a tool choice without a tool call
+    tool_call = (
+        {"name": response.tool_name, "args": {}, "id": None, "type": "tool_call"} if response.tool_name else None
+    )
+
+    logging.info(
+        "Prepared question and chose a tool",
+        extra={"prepared_question": response.prepared_question, "tool": response.tool_name},
+    )
+    return {"prepared_question": response.prepared_question, "tool_call": tool_call}
+
+
 def __parse_history_for_langchain(history: list[HistoryEntry]) -> list[BaseMessage]:
     messages: list[BaseMessage] = []
     for entry in history:
@@ -3,14 +3,20 @@ import logging
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai.chat_models import ChatOpenAI
 
-from top_assist.configuration import model_id_mini
+from top_assist.configuration import llm_cache_tool_choice_enabled, model_id_mini, tool_router_enabled
+from top_assist.open_ai.client import openai_http_client
+from top_assist.semantic_router.tool_classifier import ToolClassification, classify_tool
 from top_assist.semantic_router.tools import tools
 from top_assist.semantic_router.types import RouterState
+from top_assist.utils.llm_cache import LLMResponseCache
+from top_assist.utils.metrics import TOOL_ROUTER_DECISIONS_METRIC
 
 llm = ChatOpenAI(
     model=model_id_mini,
     temperature=0,
     max_retries=2,
+    http_client=openai_http_client(),
+    cache=LLMResponseCache(node="tool_choice_agent") if llm_cache_tool_choice_enabled else None,
 )
 
 prompt_template = ChatPromptTemplate.from_messages([
@@ -25,10 +31,26 @@ prompt_template = ChatPromptTemplate.from_messages([
 
 
 def run_tool_choice_agent(state: RouterState) -> dict:
-    """Choose the best tool for the user's question."""
+    """Choose the best tool for the user's question.
+
+    The tool is chosen by the local classifier when it is confident, the model is asked otherwise.
+    """
     logging.debug("Current state in the tool choice agent", extra={"state": state})
+    question = state["prepared_question"]
+    speculative_retrieval = state["speculative_retrieval"]
+    speculative_embedding = speculative_retrieval.embedding(question) if speculative_retrieval and question else None
+    classification = __classify(question, speculative_embedding) if tool_router_enabled and question else None
+    # The speculative embedding is kept when the classifier is disabled or failed
+    question_embedding = (classification.question_embedding if classification else None) or speculative_embedding
+    if classification and classification.tool_name:
+        __log_decision(classification.tool_name, classification.method, classification)
+        return {
+            "tool_call": {"name": classification.tool_name, "args": {}, "id": None, "type": "tool_call"},
+            "question_embedding": question_embedding,
+        }
+
     prompt = prompt_template.invoke({
-        "input": state["prepared_question"],
+        "input": question,
     })
 
     model = llm.bind_tools(tools)
@@ -37,5 +59,28 @@ def run_tool_choice_agent(state: RouterState) -> dict:
     logging.info("Model chose a tool", extra={"response": response})
 
     tool_call = response.tool_calls[0] if hasattr(response, "tool_calls") and response.tool_calls else None
+    __log_decision(tool_call["name"] if tool_call else None, "llm", classification)
+
+    return {"messages": [response], "tool_call": tool_call, "question_embedding": question_embedding}
+
 
-    return {"messages": [response], "tool_call": tool_call}
+def __classify(question: str, question_embedding: list[float] | None) -> ToolClassification | None:
+    try:
+        return classify_tool(question, question_embedding=question_embedding)
+    except Exception:
+        logging.exception("Error classifying the question, the model chooses the tool")
+        return None
+
+
+def __log_decision(tool_name: str | None, method: str, classification: ToolClassification | None) -> None:
+    # The classifier scores are logged also for the model choices, to calibrate the confidence margin
+    logging.info(
+        "Tool chosen",
+        extra={
+            "tool": tool_name,
+            "method": method,
+            "confidence": classification.confidence if classification else None,
+            "scores": classification.scores if classification else None,
+        },
+    )
+    TOOL_ROUTER_DECISIONS_METRIC.labels(tool=tool_name or "none", method=method).inc()
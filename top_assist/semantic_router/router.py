@@ -1,13 +1,22 @@
+import functools
 import logging
 import re
+import time
+from collections.abc import Callable
 
 from langgraph.graph import StateGraph
 
+from top_assist.configuration import router_single_call_enabled, speculative_retrieval_enabled
 from top_assist.confluence.policy import PageAccessPolicy
-from top_assist.semantic_router.nodes.question_generator import run_question_generator
+from top_assist.semantic_router.nodes.question_generator import (
+    run_question_generator,
+    run_question_generator_with_tool_choice,
+)
 from top_assist.semantic_router.nodes.tool_choice_agent import run_tool_choice_agent
 from top_assist.semantic_router.nodes.tool_executor import run_tool_executor
+from top_assist.semantic_router.speculation import SpeculativeRetrieval
 from top_assist.semantic_router.types import HistoryEntry, RouterState, SemanticRouterResponse
+from top_assist.utils.metrics import ROUTER_NODE_LATENCY_HISTOGRAM_METRIC
 from top_assist.utils.sentry_notifier import sentry_notify_exception
 
 FALLBACK_MSG = "I'm sorry! Something went wrong. Please try again later."
@@ -15,22 +24,50 @@ FALLBACK_MSG = "I'm sorry! Something went wrong. Please try again later."
 TOOL_CHOICE_AGENT = "tool_choice_agent"
 TOOL_EXECUTOR = "tools"
 QUESTION_GENERATOR = "question_generator"
+QUESTION_GENERATOR_WITH_TOOL_CHOICE = "question_generator_with_tool_choice"
+
+
+def __measured(node_name: str, node: Callable[[RouterState], dict]) -> Callable[[RouterState], dict]:
+    @functools.wraps(node)
+    def measured_node(state: RouterState) -> dict:
+        started_at = time.monotonic()
+        try:
+            return node(state)
+        finally:
+            ROUTER_NODE_LATENCY_HISTOGRAM_METRIC.labels(node=node_name).observe(time.monotonic() - started_at)
+
+    return measured_node
+
 
 #  Please see LangGraph documentation for more information:
 #  https://langchain-ai.github.io/langgraph/tutorials/
 main_flow = StateGraph(RouterState)
 main_flow.set_entry_point(QUESTION_GENERATOR)
 
-main_flow.add_node(QUESTION_GENERATOR, run_question_generator)
-main_flow.add_node(TOOL_CHOICE_AGENT, run_tool_choice_agent)
-main_flow.add_node(TOOL_EXECUTOR, run_tool_executor)
+main_flow.add_node(QUESTION_GENERATOR, __measured(QUESTION_GENERATOR, run_question_generator))
+main_flow.add_node(TOOL_CHOICE_AGENT, __measured(TOOL_CHOICE_AGENT, run_tool_choice_agent))
+main_flow.add_node(TOOL_EXECUTOR, __measured(TOOL_EXECUTOR, run_tool_executor))
 
 main_flow.add_edge(QUESTION_GENERATOR, TOOL_CHOICE_AGENT)
 main_flow.add_edge(TOOL_CHOICE_AGENT, TOOL_EXECUTOR)
 
 main_flow.set_finish_point(TOOL_EXECUTOR)
 
-main_graph = main_flow.compile()
+# The question is prepared and its tool chosen by a single model call, saving a model round trip for follow-ups
+single_call_flow = StateGraph(RouterState)
+single_call_flow.set_entry_point(QUESTION_GENERATOR_WITH_TOOL_CHOICE)
+
+single_call_flow.add_node(
+    QUESTION_GENERATOR_WITH_TOOL_CHOICE,
+    __measured(QUESTION_GENERATOR_WITH_TOOL_CHOICE, run_question_generator_with_tool_choice),
+)
+single_call_flow.add_node(TOOL_EXECUTOR, __measured(TOOL_EXECUTOR, run_tool_executor))
+
+single_call_flow.add_edge(QUESTION_GENERATOR_WITH_TOOL_CHOICE, TOOL_EXECUTOR)
+
+single_call_flow.set_finish_point(TOOL_EXECUTOR)
+
+main_graph = (single_call_flow if router_single_call_enabled else main_flow).compile()
 # main_graph.get_graph().draw_mermaid_png(output_file_path="./top_assist/semantic_router/graph.png")  # Draw the graph to a file
 
 
@@ -38,6 +75,7 @@ def route(
     history: list[HistoryEntry],
     policy: PageAccessPolicy,
     assistant_thread_id: str | None = None,
+    on_partial_answer: Callable[[str], None] | None = None,
 ) -> SemanticRouterResponse:
     """Route the user input to the appropriate tool and return the response message.
 
@@ -45,10 +83,17 @@ def route(
         history: The history of the current Slack thread
         policy: The access policy to Confluence pages
         assistant_thread_id: The thread ID of the AI assistant if it is created during the current thread
+        on_partial_answer: Receives the formatted answer while it is generated, if the chosen tool streams it
 
     Returns:
         SemanticRouterResponse: The response message and the assistant thread ID
     """
+    # The first question of a thread is not prepared, its retrieval can start before its tool is chosen
+    speculative_retrieval = (
+        SpeculativeRetrieval(history[0]["content"], policy)
+        if speculative_retrieval_enabled and len(history) == 1
+        else None
+    )
     initial_state = RouterState(
         prepared_question="",
         tool_call=None,
@@ -57,6 +102,9 @@ def route(
         policy=policy,
         assistant_thread_id=assistant_thread_id,
         text_formatter=__format_as_slack_markup,
+        on_partial_answer=on_partial_answer,
+        question_embedding=None,
+        speculative_retrieval=speculative_retrieval,
     )
 
     try:
@@ -72,6 +120,9 @@ def route(
         # Always return a message to the user
         message = FALLBACK_MSG
         assistant_thread_id = None
+    finally:
+        if speculative_retrieval:
+            speculative_retrieval.finish()
 
     return SemanticRouterResponse(message=message, assistant_thread_id=assistant_thread_id)
 
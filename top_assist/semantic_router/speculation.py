@@ -0,0 +1,73 @@
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from top_assist.configuration import embedding_model_id
+from top_assist.confluence.policy import PageAccessPolicy
+from top_assist.knowledge_base.query import RetrievedContext, retrieve_context
+from top_assist.open_ai.embeddings import embed_text
+from top_assist.utils.metrics import SPECULATIVE_RETRIEVAL_SAVED_SECONDS_METRIC, SPECULATIVE_RETRIEVALS_METRIC
+
+
+class SpeculativeRetrieval:
+    """Knowledge base retrieval for a first question, started while its tool is being chosen.
+
+    The knowledge base is chosen for most questions, the retrieved pages are discarded if another tool is chosen.
+    """
+
+    def __init__(self, question: str, policy: PageAccessPolicy) -> None:
+        self._question = question
+        self._policy = policy
+        self._started_at = time.monotonic()
+        self._finished_at: float | None = None
+        self._used = False
+        self._embedding: Future[list[float]] = Future()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._context = self._executor.submit(self._retrieve)
+
+    def embedding(self, question: str) -> list[float] | None:
+        """The embedding of the question, if it is the speculated one, e.g. to choose its tool."""
+        if question != self._question:
+            return None
+
+        try:
+            return self._embedding.result()
+        except Exception:
+            # Logged by the retrieval
+            return None
+
+    def take(self, question: str) -> RetrievedContext | None:
+        """The retrieved context if the question is the speculated one, waiting for the retrieval to finish."""
+        if question != self._question:
+            return None
+
+        taken_at = time.monotonic()
+        try:
+            context = self._context.result()
+        except Exception:
+            # Logged by the retrieval, the pages are retrieved again
+            return None
+
+        self._used = True
+        saved_seconds = min(self._finished_at or taken_at, taken_at) - self._started_at
+        SPECULATIVE_RETRIEVAL_SAVED_SECONDS_METRIC.inc(saved_seconds)
+        logging.info("Speculative retrieval used", extra={"saved_seconds": saved_seconds})
+        return context
+
+    def finish(self) -> None:
+        """Discard the retrieval if it was not used, without waiting for it."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        SPECULATIVE_RETRIEVALS_METRIC.labels(result="hit" if self._used else "miss").inc()
+
+    def _retrieve(self) -> RetrievedContext:
+        try:
+            question_embedding = embed_text(text=self._question, model=embedding_model_id)
+            self._embedding.set_result(question_embedding)
+            return retrieve_context(self._question, question_embedding=question_embedding, access_policy=self._policy)
+        except Exception as e:
+            logging.exception("Speculative retrieval failed", extra={"question": self._question})
+            if not self._embedding.done():
+                self._embedding.set_exception(e)
+            raise
+        finally:
+            self._finished_at = time.monotonic()
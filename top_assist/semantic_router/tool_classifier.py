@@ -0,0 +1,118 @@
+import functools
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Literal
+
+from top_assist.configuration import embedding_model_id, tool_router_min_margin
+from top_assist.open_ai.embeddings import embed_text, embed_texts
+from top_assist.semantic_router.tools import query_chatgpt, query_knowledge_base, query_prompt_optimizer, web_search
+
+# Explicit triggers of the tools, as asked for in the tool descriptions. Only a prefix of the question followed
+# by a colon is a trigger, the same words within a question are often about the company, e.g. "our contract with OpenAI"
+_KEYWORD_PATTERNS = {
+    query_chatgpt.name: re.compile(
+        r"^\W*(ask\s+|chat\s+with\s+)?(chat\s*gpt|gpt|open\s*ai|chat(bot)?)\s*:",
+        re.IGNORECASE,
+    ),
+    web_search.name: re.compile(
+        r"^\W*((web|internet)\s+search|search\s+(on\s+)?the\s+(web|internet)|google\s+it)\s*:",
+        re.IGNORECASE,
+    ),
+    query_prompt_optimizer.name: re.compile(
+        r"^\W*((optimi[sz]e|improve)\s+((the|this|my)\s+)?prompt|prompt\s+optimi[sz]ation|optimi[sz]e\s+with\s+dify)\s*:",
+        re.IGNORECASE,
+    ),
+}
+
+_TOOL_EXAMPLES = {
+    query_knowledge_base.name: [
+        "How do I request vacation days?",
+        "What is the on-call process of the platform team?",
+        "Where can I find the GraphQL schema of the billing service?",
+        "Who owns the payments project?",
+        "What is the expense reimbursement policy?",
+        "How do I set up the development environment for the web app?",
+        "What does the acronym SLA mean in our engineering handbook?",
+    ],
+    query_chatgpt.name: [
+        "ChatGPT: write a haiku about autumn",
+        "Ask gpt: what is the capital of Australia?",
+        "Chat with GPT about the history of the Roman Empire",
+        "Find the answer using OpenAI: how does TCP congestion control work?",
+        "Chat: translate this sentence to Spanish",
+    ],
+    web_search.name: [
+        "Web search: latest Python release",
+        "Search the Internet to find today's weather in Lisbon",
+        "Google it: best practices for Kubernetes autoscaling",
+        "Search on the web for the current price of Bitcoin",
+    ],
+    query_prompt_optimizer.name: [
+        "Optimize the prompt: summarize the following text",
+        "Prompt optimization: generate a product description for {product}",
+        "Improve the prompt: write a cover letter for {job_title}",
+        "Optimize with Dify: classify the sentiment of {review}",
+    ],
+}
+
+
+@dataclass
+class ToolClassification:
+    """The tool chosen for a question without a call to the tool choice model.
+
+    Attr:
+        tool_name: str | None - The chosen tool, None when the classifier is not confident
+        method: Literal["keyword", "embedding"] - How the tool was chosen
+        confidence: float - 1 for a keyword match, the similarity margin of the best tool over the next one otherwise
+        scores: dict[str, float] - The similarity of the question to the examples of each tool
+        question_embedding: list[float] | None - The embedding of the question, reused for the retrieval
+    """
+
+    tool_name: str | None
+    method: Literal["keyword", "embedding"]
+    confidence: float
+    scores: dict[str, float] = field(default_factory=dict)
+    question_embedding: list[float] | None = None
+
+
+def classify_tool(question: str, *, question_embedding: list[float] | None = None) -> ToolClassification:
+    """Choose the tool for the question by its explicit triggers, or by its similarity to the examples of the tools.
+
+    The question is embedded unless its `question_embedding` is given.
+    """
+    matched_tool = next(
+        (tool_name for tool_name, pattern in _KEYWORD_PATTERNS.items() if pattern.match(question)), None
+    )
+    if matched_tool:
+        return ToolClassification(tool_name=matched_tool, method="keyword", confidence=1.0)
+
+    question_embedding = question_embedding or embed_text(text=question, model=embedding_model_id)
+    scores = {
+        tool_name: max(__similarity(question_embedding, example) for example in examples)
+        for tool_name, examples in __example_embeddings().items()
+    }
+    best_score, next_score = sorted(scores.values(), reverse=True)[:2]
+    confidence = best_score - next_score
+    is_confident = confidence >= tool_router_min_margin
+    return ToolClassification(
+        tool_name=max(scores, key=scores.__getitem__) if is_confident else None,
+        method="embedding",
+        confidence=confidence,
+        scores=scores,
+        question_embedding=question_embedding,
+    )
+
+
+@functools.cache
+def __example_embeddings() -> dict[str, list[list[float]]]:
+    """Embedded once per process, on the first question."""
+    texts = [example for examples in _TOOL_EXAMPLES.values() for example in examples]
+    embeddings = iter(embed_texts(texts, model=embedding_model_id))
+    logging.info("Tool examples embedded", extra={"count": len(texts)})
+    return {tool_name: [next(embeddings) for _ in examples] for tool_name, examples in _TOOL_EXAMPLES.items()}
+
+
+def __similarity(embedding: list[float], other: list[float]) -> float:
+    # OpenAI embeddings are normalized to length 1, their dot product is the cosine similarity
+    return sum(a * b for a, b in zip(embedding, other, strict=True))
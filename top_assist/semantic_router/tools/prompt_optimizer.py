@@ -9,7 +9,14 @@ from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import InjectedState
 from pydantic import BaseModel
 
-from top_assist.configuration import dify_api_endpoint, dify_prompt_optimizer_api_key, model_id_mini
+from top_assist.configuration import (
+    dify_api_endpoint,
+    dify_prompt_optimizer_api_key,
+    llm_cache_prompt_optimizer_enabled,
+    model_id_mini,
+)
+from top_assist.open_ai.client import openai_http_client
+from top_assist.utils.llm_cache import LLMResponseCache
 from top_assist.utils.sentry_notifier import sentry_notify_exception
 
 FALLBACK_MSG = "I'm sorry! Something went wrong with prompt optimizer. Please try again later."
@@ -32,7 +39,12 @@ class PreparedTask(BaseModel):
     variables: str
 
 
-llm = ChatOpenAI(model=model_id_mini, temperature=0)
+llm = ChatOpenAI(
+    model=model_id_mini,
+    temperature=0,
+    http_client=openai_http_client(),
+    cache=LLMResponseCache(node="prompt_optimizer") if llm_cache_prompt_optimizer_enabled else None,
+)
 SYSTEM_PROMPT = (
     """
     You are a question analyzer assistant.
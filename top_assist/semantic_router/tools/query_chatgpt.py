@@ -24,7 +24,12 @@ def query_chatgpt(state: Annotated[dict, InjectedState]) -> AIMessage:
         - "Chat: ..."
     """
     logging.debug("Current state in the ChatGPT tool", extra={"state": state})
-    answer = query_chatgpt_with_openai(question=state["prepared_question"], text_formatter=state["text_formatter"])
+    answer = query_chatgpt_with_openai(
+        question=state["prepared_question"],
+        text_formatter=state["text_formatter"],
+        # The last history entry is the question itself
+        history=state["history"][:-1],
+    )
     logging.debug("ChatGPT answer", extra={"answer": answer})
 
     return AIMessage(
@@ -16,11 +16,17 @@ def query_knowledge_base(state: Annotated[dict, InjectedState]) -> AIMessage:
     The Knowledge Base is part of TopTal internal Confluence system, containing articles and documents about the company's products, services, policies, and procedures.
     """
     logging.debug("Current state in the Knowledge Base tool", extra={"state": state})
+    speculative_retrieval = state["speculative_retrieval"]
     answer = query_confluence_knowledge_base(
         question=state["prepared_question"],
         thread_id=state["assistant_thread_id"],
         access_policy=state["policy"],
         text_formatter=state["text_formatter"],
+        on_partial_answer=state["on_partial_answer"],
+        question_embedding=state["question_embedding"],
+        retrieved_context=speculative_retrieval.take(state["prepared_question"]) if speculative_retrieval else None,
+        # The last history entry is the question itself
+        history=state["history"][:-1],
     )
     logging.debug("Knowledge base answer", extra={"answer": answer})
 
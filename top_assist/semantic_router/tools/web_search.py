@@ -10,6 +10,7 @@ from langchain_openai import ChatOpenAI
 from langgraph.prebuilt import InjectedState
 
 from top_assist.configuration import model_id
+from top_assist.open_ai.client import openai_http_client
 from top_assist.utils.sentry_notifier import sentry_notify_exception
 
 FALLBACK_MSG = "I'm sorry! Something went wrong with web search. Please try again later."
@@ -32,7 +33,7 @@ def __create_agent(llm: ChatOpenAI, web_search_tools: list, prompt_template: Cha
     )
 
 
-llm = ChatOpenAI(model=model_id)
+llm = ChatOpenAI(model=model_id, http_client=openai_http_client())
 web_search_tools = [StructuredTool.from_function(ddg_search)]
 prompt_template = ChatPromptTemplate.from_messages([
     (
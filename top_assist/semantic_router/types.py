@@ -5,6 +5,7 @@ from typing import Literal, TypedDict
 from langgraph.graph import MessagesState
 
 from top_assist.confluence.policy import PageAccessPolicy
+from top_assist.semantic_router.speculation import SpeculativeRetrieval
 
 
 class HistoryEntry(TypedDict):
@@ -24,6 +25,9 @@ class RouterState(MessagesState):
         policy: PageAccessPolicy | None - The access policy to Confluence pages
         assistant_thread_id: str | None - The thread ID of the AI assistant if it is created during current thread
         text_formatter: Callable[[str], str] - The text formatter for preparing the final response message
+        on_partial_answer: Callable[[str], None] | None - Receives the answer while it is generated by streaming tools
+        question_embedding: list[float] | None - The embedding of the prepared question if computed to choose the tool
+        speculative_retrieval: SpeculativeRetrieval | None - The knowledge base retrieval started for a first question
     """
 
     prepared_question: str | None
@@ -32,6 +36,9 @@ class RouterState(MessagesState):
     policy: PageAccessPolicy | None
     assistant_thread_id: str | None
     text_formatter: Callable[[str], str]
+    on_partial_answer: Callable[[str], None] | None
+    question_embedding: list[float] | None
+    speculative_retrieval: SpeculativeRetrieval | None
 
 
 @dataclass
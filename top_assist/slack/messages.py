@@ -1,8 +1,10 @@
 import logging
+import time
 from typing import Any
 
 from slack_sdk.errors import SlackApiError
 
+from top_assist.configuration import slack_stream_update_interval_seconds
 from top_assist.slack.bot_runner import SlackBotBlockActionTriggered
 from top_assist.utils.tracer import ServiceNames, tracer
 
@@ -23,6 +25,55 @@ def post_answer_on_slack(
     return result
 
 
+class StreamedAnswer:
+    """Answer message updated on Slack while the answer is generated.
+
+    A placeholder is posted on start, the updates are throttled and failed updates are skipped,
+    the message is updated with the final answer on finish or deleted when no answer is produced.
+    """
+
+    PLACEHOLDER = "_Thinking..._"
+
+    @classmethod
+    @tracer.wrap(service=ServiceNames.slack.value)
+    def start(cls, *, channel: str, thread_ts: str) -> "StreamedAnswer":
+        web_client = WebClient.default()
+        message = web_client.post_message(channel=channel, text=cls.PLACEHOLDER, thread_ts=thread_ts)
+        return cls(web_client, channel=channel, message=message)
+
+    def __init__(self, web_client: WebClient, *, channel: str, message: PostedSlackMessage) -> None:
+        self._web_client = web_client
+        self._channel = channel
+        self._message = message
+        self._updated_at = time.monotonic()
+        self._text = self.PLACEHOLDER
+
+    def update(self, text: str) -> None:
+        now = time.monotonic()
+        if not text or text == self._text or now - self._updated_at < slack_stream_update_interval_seconds:
+            return
+
+        self._updated_at = now
+        try:
+            self._web_client.update_message(channel=self._channel, ts=self._message.ts, text=text)
+            self._text = text
+        except Exception as e:
+            # The final answer is posted on finish anyway
+            logging.warning("Failed to update streamed answer", extra={"ts": self._message.ts, "error": str(e)})
+
+    @tracer.wrap(service=ServiceNames.slack.value)
+    def finish(self, text: str) -> PostedSlackMessage:
+        if text != self._text:
+            self._web_client.update_message(channel=self._channel, ts=self._message.ts, text=text)
+            self._text = text
+
+        return self._message
+
+    @tracer.wrap(service=ServiceNames.slack.value)
+    def discard(self) -> None:
+        self._web_client.delete_message(channel=self._channel, ts=self._message.ts)
+
+
 def post_channel_is_not_enabled(channel: str, thread_ts: str) -> None:
     WebClient.default().post_message(
         channel=channel, thread_ts=thread_ts, text="I'm not enabled for channels ATM, please ping me on DM"
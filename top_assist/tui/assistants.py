@@ -1,21 +1,18 @@
 import json
 import logging
 
-from openai import OpenAI
-
-from top_assist.configuration import open_ai_api_key
 from top_assist.open_ai.assistants.manager import Assistant, AssistantManager
 from top_assist.open_ai.assistants.templates import (
     base_assistant_template,
     qa_assistant_template,
 )
 from top_assist.open_ai.assistants.threads import add_user_message_and_complete
+from top_assist.open_ai.client import openai_client
 
 
 def tui_assistants_menu() -> None:
     """Provides interactive user interface for managing assistants."""
-    client = OpenAI(api_key=open_ai_api_key)
-    manager = AssistantManager(client)
+    manager = AssistantManager(openai_client())
     while True:
         print("\nUser Interaction Menu:")
         print("--------------------------------")
@@ -26,7 +26,7 @@ def main_menu() -> None:
 
         elif choice == "3":
             print("Update changed on Confluence pages since last import.")
-            pull_updates()
+            pull_updates(force=True)
 
         elif choice == "0":
             print("Exiting program.")
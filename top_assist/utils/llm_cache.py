@@ -0,0 +1,118 @@
+import abc
+import hashlib
+import json
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from top_assist.configuration import llm_cache_ttl_seconds
+from top_assist.utils.metrics import LLM_CACHE_LOOKUPS_METRIC
+
+# Representations of the not serializable attributes of a model (e.g. its HTTP client) hold their memory address
+_MEMORY_ADDRESS_PATTERN = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+class LLMCacheStorage(abc.ABC):  # noqa: D101
+    @abc.abstractmethod
+    def read(self, key: str, *, stored_after: datetime) -> str | None:
+        """The response stored for the key after the given time."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write(self, key: str, value: str, *, stored_at: datetime) -> None:
+        """Store the response for the key and drop the responses expired by `stored_at`."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+def configure_llm_cache(storage: LLMCacheStorage) -> None:
+    _config.storage = storage
+
+
+class LLMResponseCache(BaseCache):
+    """Cache of the responses of a langchain chat model to identical prompts, for the `cache` of the model.
+
+    Responses are keyed by the model with its parameters (incl. bound tools and the response schema) and the prompt,
+    and reused within the TTL. Errors of the cache are logged and treated as a miss.
+    """
+
+    def __init__(self, *, node: str) -> None:
+        self._node = node
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        if llm_cache_ttl_seconds <= 0:
+            return None
+
+        try:
+            stored_after = datetime.now(UTC) - timedelta(seconds=llm_cache_ttl_seconds)
+            value = _config.storage.read(self.__key(prompt, llm_string), stored_after=stored_after)
+        except Exception:
+            logging.exception("Error looking up cached LLM response", extra={"node": self._node})
+            LLM_CACHE_LOOKUPS_METRIC.labels(node=self._node, result="error").inc()
+            return None
+
+        LLM_CACHE_LOOKUPS_METRIC.labels(node=self._node, result="hit" if value else "miss").inc()
+        return [loads(generation) for generation in json.loads(value)] if value else None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if llm_cache_ttl_seconds <= 0:
+            return
+
+        try:
+            value = json.dumps([dumps(generation) for generation in return_val])
+            _config.storage.write(self.__key(prompt, llm_string), value, stored_at=datetime.now(UTC))
+        except Exception:
+            logging.exception("Error caching LLM response", extra={"node": self._node})
+
+    def clear(self, **_kwargs: Any) -> None:  # noqa: ANN401
+        _config.storage.clear()
+
+    def __key(self, prompt: str, llm_string: str) -> str:
+        llm_string = _MEMORY_ADDRESS_PATTERN.sub("", llm_string)
+        return hashlib.sha256(f"{self._node}\n{llm_string}\n{prompt}".encode()).hexdigest()
+
+
+class _LocalLLMCacheStorage(LLMCacheStorage):
+    """Responses shared by the threads of the current process only."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._responses: dict[str, tuple[str, datetime]] = {}
+
+    def read(self, key: str, *, stored_after: datetime) -> str | None:
+        with self._lock:
+            value, stored_at = self._responses.get(key, (None, None))
+            return value if stored_at and stored_at > stored_after else None
+
+    def write(self, key: str, value: str, *, stored_at: datetime) -> None:
+        expired_before = stored_at - timedelta(seconds=llm_cache_ttl_seconds)
+        with self._lock:
+            expired_keys = [
+                entry_key
+                for entry_key, (_, entry_stored_at) in self._responses.items()
+                if entry_stored_at <= expired_before
+            ]
+            for expired_key in expired_keys:
+                del self._responses[expired_key]
+            self._responses[key] = (value, stored_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+
+@dataclass
+class _Config:
+    storage: LLMCacheStorage
+
+
+_config = _Config(_LocalLLMCacheStorage())
@@ -2,7 +2,7 @@ import logging
 import socket
 from contextlib import closing
 
-from prometheus_client import CollectorRegistry, Counter, Histogram, Summary, start_http_server
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, Summary, start_http_server
 from prometheus_client import multiprocess as prometheus_multiprocess
 
 from top_assist.configuration import metrics_port, metrics_port_auto_increment
@@ -50,6 +50,115 @@ EVENT_LATENCY_HISTOGRAM_METRIC = Histogram(
     unit="seconds",
     buckets=[0.25, 0.5, 0.75, 1, 2, 3, 5, 10, 15, 20, 30, 60, 120, 300, float("inf")],
 )
+QUESTION_CONTEXT_TOKENS_HISTOGRAM_METRIC = Histogram(
+    name="top_assist_question_context_tokens_hist",
+    documentation="Tokens of the pages packed into the context of a question",
+    unit="tokens",
+    buckets=[250, 500, 1000, 2000, 4000, 6000, 8000, 12000, 16000, 32000, float("inf")],
+)
+QUESTION_CONTEXT_DENIED_RATIO_HISTOGRAM_METRIC = Histogram(
+    name="top_assist_question_context_denied_ratio_hist",
+    documentation="Share of the retrieved candidate pages the asking user cannot access",
+    buckets=[0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1],
+)
+ANSWER_CACHE_LOOKUPS_METRIC = Counter(
+    name="top_assist_answer_cache_lookups",
+    documentation="Semantic answer cache lookups of first questions (hit, miss, stale, denied)",
+    labelnames=["result"],
+)
+ANSWER_CACHE_SAVED_SECONDS_METRIC = Counter(
+    name="top_assist_answer_cache_saved",
+    documentation="Answer generation time saved by reusing cached answers (seconds)",
+    unit="seconds",
+)
+
+SPACE_SYNC_LATENCY_HISTOGRAM_METRIC = Histogram(
+    name="top_assist_space_sync_latency_hist",
+    # Per space durations are logged, a space label would add a series per space and bucket
+    documentation="Duration of pulling updates for a single Confluence space (seconds)",
+    labelnames=["status"],
+    unit="seconds",
+    buckets=[1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, float("inf")],
+)
+JOB_LATENCY_HISTOGRAM_METRIC = Histogram(
+    name="top_assist_job_latency_hist",
+    documentation="Duration of a background job attempt (seconds)",
+    labelnames=["kind", "status"],
+    unit="seconds",
+    buckets=[1, 5, 10, 30, 60, 300, 600, 1800, 3600, 7200, 14400, float("inf")],
+)
+RATE_LIMIT_WAIT_HISTOGRAM_METRIC = Histogram(
+    name="top_assist_rate_limit_wait_hist",
+    documentation="Time spent waiting for a rate limit token before calling an external service (seconds)",
+    labelnames=["bucket", "priority"],
+    unit="seconds",
+    buckets=[0.01, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120, float("inf")],
+)
+ASSISTANT_RUN_POLLS_HISTOGRAM_METRIC = Histogram(
+    name="top_assist_assistant_run_polls_hist",
+    documentation="Status checks of an OpenAI assistant run until it finished",
+    labelnames=["outcome"],
+    buckets=[1, 2, 3, 5, 8, 13, 20, 30, 50, 100, float("inf")],
+)
+ASSISTANT_RUN_WAIT_HISTOGRAM_METRIC = Histogram(
+    name="top_assist_assistant_run_wait_hist",
+    documentation="Time spent waiting for an OpenAI assistant run to finish (seconds)",
+    labelnames=["outcome"],
+    unit="seconds",
+    buckets=[0.5, 1, 2, 3, 5, 8, 10, 15, 20, 30, 60, 120, float("inf")],
+)
+PAGE_CACHE_LOOKUPS_METRIC = Counter(
+    name="top_assist_page_cache_lookups",
+    documentation="Lookups of pages in the process-local page cache",
+    labelnames=["result"],
+)
+PAGE_CACHE_BYTES_METRIC = Gauge(
+    name="top_assist_page_cache_bytes",
+    documentation="Size of the compressed pages held in the process-local page cache",
+    unit="bytes",
+    multiprocess_mode="livesum",
+)
+ROUTER_NODE_LATENCY_HISTOGRAM_METRIC = Histogram(
+    name="top_assist_router_node_latency",
+    documentation="Latency of the nodes of the semantic router graph in seconds",
+    labelnames=["node"],
+    buckets=[0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120],
+)
+SPECULATIVE_RETRIEVALS_METRIC = Counter(
+    name="top_assist_speculative_retrievals",
+    documentation="Knowledge base retrievals started while routing first questions, by whether they were used",
+    labelnames=["result"],
+)
+SPECULATIVE_RETRIEVAL_SAVED_SECONDS_METRIC = Counter(
+    name="top_assist_speculative_retrieval_saved",
+    documentation="Retrieval time taken off the critical path of answers by speculative retrievals (seconds)",
+    unit="seconds",
+)
+LLM_CACHE_LOOKUPS_METRIC = Counter(
+    name="top_assist_llm_cache_lookups",
+    documentation="Lookups of cached model responses by router node and result (hit, miss or error)",
+    labelnames=["node", "result"],
+)
+TOOL_ROUTER_DECISIONS_METRIC = Counter(
+    name="top_assist_tool_router_decisions",
+    documentation="Tools chosen for questions by the method of the choice (keyword, embedding or llm)",
+    labelnames=["tool", "method"],
+)
+PAGE_DIGESTS_METRIC = Counter(
+    name="top_assist_page_digests",
+    documentation="Page digests by the result of their generation on import",
+    labelnames=["result"],
+)
+OPENAI_HTTP_REQUESTS_METRIC = Counter(
+    name="top_assist_openai_http_requests",
+    documentation="HTTP requests to OpenAI by whether they opened a new connection or reused a kept-alive one",
+    labelnames=["connection"],
+)
+RATE_LIMITED_RESPONSES_METRIC = Counter(
+    name="top_assist_rate_limited_responses",
+    documentation="Responses rejected by an external service because of rate limiting (HTTP 429)",
+    labelnames=["bucket"],
+)
 
 
 def start_metrics_server(
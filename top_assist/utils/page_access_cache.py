@@ -0,0 +1,84 @@
+import abc
+import threading
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from top_assist.configuration import page_access_cache_ttl_seconds
+
+
+class PageAccessCacheStorage(abc.ABC):  # noqa: D101
+    @abc.abstractmethod
+    def read(self, slack_user_id: str, page_ids: list[str], *, checked_after: datetime) -> dict[str, bool]:
+        """Access of the user to the pages checked after the given time, pages without such a check are missing."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write(self, slack_user_id: str, access: dict[str, bool], *, checked_at: datetime) -> None:
+        """Store the access of the user to the pages and drop the entries of the user expired by `checked_at`."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, slack_user_id: str) -> None:
+        raise NotImplementedError
+
+
+def configure_page_access_cache(storage: PageAccessCacheStorage) -> None:
+    _config.storage = storage
+
+
+def cached_page_access(slack_user_id: str, page_ids: list[str]) -> dict[str, bool]:
+    """Access of the user to the pages (allowed or denied) checked within the TTL."""
+    if page_access_cache_ttl_seconds <= 0 or not page_ids:
+        return {}
+
+    checked_after = datetime.now(UTC) - timedelta(seconds=page_access_cache_ttl_seconds)
+    return _config.storage.read(slack_user_id, page_ids, checked_after=checked_after)
+
+
+def cache_page_access(slack_user_id: str, access: dict[str, bool]) -> None:
+    if page_access_cache_ttl_seconds <= 0 or not access:
+        return
+
+    _config.storage.write(slack_user_id, access, checked_at=datetime.now(UTC))
+
+
+def invalidate_page_access(slack_user_id: str) -> None:
+    """Forget the access of the user, e.g. when the Confluence token is revoked or replaced."""
+    _config.storage.delete(slack_user_id)
+
+
+class _LocalPageAccessCacheStorage(PageAccessCacheStorage):
+    """Access shared by the threads of the current process only."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._access: dict[str, dict[str, tuple[bool, datetime]]] = {}
+
+    def read(self, slack_user_id: str, page_ids: list[str], *, checked_after: datetime) -> dict[str, bool]:
+        with self._lock:
+            user_access = self._access.get(slack_user_id, {})
+            entries = {page_id: user_access[page_id] for page_id in page_ids if page_id in user_access}
+            return {
+                page_id: allowed for page_id, (allowed, checked_at) in entries.items() if checked_at > checked_after
+            }
+
+    def write(self, slack_user_id: str, access: dict[str, bool], *, checked_at: datetime) -> None:
+        expired_before = checked_at - timedelta(seconds=page_access_cache_ttl_seconds)
+        with self._lock:
+            user_access = self._access.setdefault(slack_user_id, {})
+            for page_id, (_allowed, entry_checked_at) in list(user_access.items()):
+                if entry_checked_at <= expired_before:
+                    del user_access[page_id]
+            user_access.update({page_id: (allowed, checked_at) for page_id, allowed in access.items()})
+
+    def delete(self, slack_user_id: str) -> None:
+        with self._lock:
+            self._access.pop(slack_user_id, None)
+
+
+@dataclass
+class _Config:
+    storage: PageAccessCacheStorage
+
+
+_config = _Config(_LocalPageAccessCacheStorage())
@@ -0,0 +1,204 @@
+import abc
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+
+from pydantic import BaseModel
+
+from top_assist.utils.metrics import RATE_LIMIT_WAIT_HISTOGRAM_METRIC
+
+
+class RateLimitPriority(str, Enum):
+    """Interactive requests may use the whole bucket, bulk requests leave the interactive reserve untouched."""
+
+    interactive = "interactive"
+    bulk = "bulk"
+
+
+# Tokens taken from the shared bucket in a batch are used by the process within this time, or dropped
+_LEASE_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Token bucket parameters, bulk requests take `batch_size` tokens from the shared bucket at once."""
+
+    per_second: float
+    burst: float
+    interactive_reserve: float = 0
+    batch_size: int = 1
+
+
+class RateLimitBucket(BaseModel):  # noqa: D101
+    tokens: float
+    refilled_at: datetime
+    paused_until: datetime | None = None
+
+
+BucketTransition = Callable[[RateLimitBucket | None], tuple[RateLimitBucket, float]]
+
+
+class RateLimitStorage(abc.ABC):  # noqa: D101
+    @abc.abstractmethod
+    def update(self, bucket_key: str, transition: BucketTransition) -> float:
+        """Atomically apply the transition to the stored bucket and return the seconds to wait it computed."""
+        raise NotImplementedError
+
+
+def configure_rate_limiter(storage: RateLimitStorage) -> None:
+    _config.storage = storage
+
+
+def acquire_rate_limit(bucket_key: str, limit: RateLimit, priority: RateLimitPriority) -> None:
+    """Block until a token is taken from the bucket.
+
+    Bulk requests take a batch of tokens and lease the rest to the next bulk requests of the process, so that
+    concurrent imports do not update the shared bucket for every request. Interactive requests take single tokens,
+    the interactive reserve is not held by a single process then.
+    """
+    batch_size = limit.batch_size if priority == RateLimitPriority.bulk else 1
+    if batch_size > 1 and _leases.take(bucket_key, datetime.now(UTC)):
+        RATE_LIMIT_WAIT_HISTOGRAM_METRIC.labels(bucket=bucket_key, priority=priority.value).observe(0)
+        return
+
+    taken_tokens = 0
+
+    def take_tokens(bucket: RateLimitBucket | None) -> tuple[RateLimitBucket, float]:
+        nonlocal taken_tokens
+        bucket, wait_seconds, taken_tokens = __take_tokens(bucket, limit, priority, datetime.now(UTC), batch_size)
+        return bucket, wait_seconds
+
+    waited_seconds = 0.0
+    while True:
+        wait_seconds = _config.storage.update(bucket_key, take_tokens)
+        if wait_seconds <= 0:
+            break
+
+        time.sleep(wait_seconds)
+        waited_seconds += wait_seconds
+
+    if taken_tokens > 1:
+        _leases.add(bucket_key, taken_tokens - 1, datetime.now(UTC))
+
+    if waited_seconds > 0:
+        logging.debug(
+            "Rate limit wait",
+            extra={"bucket_key": bucket_key, "priority": priority.value, "seconds": waited_seconds},
+        )
+    RATE_LIMIT_WAIT_HISTOGRAM_METRIC.labels(bucket=bucket_key, priority=priority.value).observe(waited_seconds)
+
+
+def pause_rate_limit(bucket_key: str, limit: RateLimit, seconds: float) -> None:
+    """Stop handing out tokens of the bucket for the given time, e.g. when the service responds with Retry-After."""
+    logging.warning("Rate limit pause", extra={"bucket_key": bucket_key, "seconds": seconds})
+    _leases.clear(bucket_key)
+    _config.storage.update(bucket_key, lambda bucket: __pause(bucket, limit, datetime.now(UTC), seconds))
+
+
+def __take_tokens(
+    bucket: RateLimitBucket | None, limit: RateLimit, priority: RateLimitPriority, now: datetime, count: int
+) -> tuple[RateLimitBucket, float, int]:
+    """Take up to `count` tokens, at least one.
+
+    Returns:
+        tuple[RateLimitBucket, float, int]: The new bucket, the seconds to wait when no token was taken,
+            and the number of taken tokens.
+    """
+    bucket = __refill(bucket, limit, now)
+
+    if bucket.paused_until and bucket.paused_until > now:
+        return bucket, (bucket.paused_until - now).total_seconds(), 0
+
+    reserve = limit.interactive_reserve if priority == RateLimitPriority.bulk else 0
+    if bucket.tokens >= reserve + 1:
+        taken_tokens = min(count, int(bucket.tokens - reserve))
+        bucket.tokens -= taken_tokens
+        return bucket, 0, taken_tokens
+
+    return bucket, (reserve + 1 - bucket.tokens) / limit.per_second, 0
+
+
+def __pause(
+    bucket: RateLimitBucket | None, limit: RateLimit, now: datetime, seconds: float
+) -> tuple[RateLimitBucket, float]:
+    bucket = __refill(bucket, limit, now)
+    paused_until = now + timedelta(seconds=seconds)
+    bucket.paused_until = max(paused_until, bucket.paused_until) if bucket.paused_until else paused_until
+    # Start from an empty bucket after the pause, so that waiting requests do not hit the service all at once
+    bucket.tokens = 0
+    bucket.refilled_at = bucket.paused_until
+    return bucket, seconds
+
+
+def __refill(bucket: RateLimitBucket | None, limit: RateLimit, now: datetime) -> RateLimitBucket:
+    if bucket is None:
+        return RateLimitBucket(tokens=limit.burst, refilled_at=now)
+
+    # refilled_at may be ahead of the local clock (paused bucket, clocks of other hosts)
+    seconds_passed = max((now - bucket.refilled_at).total_seconds(), 0)
+    return RateLimitBucket(
+        tokens=min(limit.burst, bucket.tokens + seconds_passed * limit.per_second),
+        refilled_at=max(now, bucket.refilled_at),
+        paused_until=bucket.paused_until,
+    )
+
+
+class _LocalRateLimitStorage(RateLimitStorage):
+    """Buckets shared by the threads of the current process only."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: dict[str, RateLimitBucket] = {}
+
+    def update(self, bucket_key: str, transition: BucketTransition) -> float:
+        with self._lock:
+            self._buckets[bucket_key], wait_seconds = transition(self._buckets.get(bucket_key))
+            return wait_seconds
+
+
+class _TokenLeases:
+    """Tokens taken from the shared buckets in batches, left for the next requests of the current process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._leases: dict[str, tuple[int, datetime]] = {}
+
+    def take(self, bucket_key: str, now: datetime) -> bool:
+        with self._lock:
+            tokens, expires_at = self._leases.get(bucket_key, (0, now))
+            if tokens <= 0 or expires_at <= now:
+                self._leases.pop(bucket_key, None)
+                return False
+
+            self._leases[bucket_key] = (tokens - 1, expires_at)
+            return True
+
+    def add(self, bucket_key: str, tokens: int, now: datetime) -> None:
+        with self._lock:
+            self._leases[bucket_key] = (tokens, now + timedelta(seconds=_LEASE_SECONDS))
+
+    def clear(self, bucket_key: str) -> None:
+        with self._lock:
+            self._leases.pop(bucket_key, None)
+
+    def reset(self) -> None:
+        """Leased tokens and the lock are not inherited by a forked worker process."""
+        self._lock = threading.Lock()
+        self._leases = {}
+
+
+@dataclass
+class _Config:
+    storage: RateLimitStorage
+
+
+_config = _Config(_LocalRateLimitStorage())
+_leases = _TokenLeases()
+
+
+os.register_at_fork(after_in_child=_leases.reset)
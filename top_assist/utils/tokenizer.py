@@ -0,0 +1,43 @@
+import functools
+import logging
+import math
+
+import tiktoken
+
+from top_assist.configuration import model_id
+
+# Rough length of a token of English text, used when the tokenizer cannot be loaded
+_CHARS_PER_TOKEN = 4
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens of the text with the tokenizer of the configured chat model, or estimate them without it."""
+    encoding = __encoding()
+    if encoding is None:
+        return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+    # Confluence pages may contain literal special tokens like <|endoftext|>, they are counted as plain text
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """The longest prefix of the text with at most `max_tokens` tokens."""
+    encoding = __encoding()
+    if encoding is None:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+
+    return encoding.decode(tokens[:max_tokens])
+
+
+@functools.cache
+def __encoding() -> tiktoken.Encoding | None:
+    """The encoding is downloaded on first use unless found in `TIKTOKEN_CACHE_DIR`, e.g. baked into the image."""
+    try:
+        return tiktoken.encoding_for_model(model_id)
+    except Exception:
+        logging.exception("Error loading the tokenizer, token counts are estimated from the text length")
+        return None
@@ -13,6 +13,7 @@ class ServiceNames(str, Enum):
     main_menu = "top-assist-main_menu"
     chat_bot = "top-assist-chat-bot"
     web = "top-assist-web"  # not used explicitly, configured in DD_SERVICE_MAPPING env
+    worker = "top-assist-worker"
 
     # Others
     slack = "top-assist-slack"
@@ -15,6 +15,7 @@ from top_assist.configuration import admin_extra_links, admin_password, admin_se
 from top_assist.database.database import engine
 from top_assist.web.admin.channel import channel_view
 from top_assist.web.admin.home import HomeAdmin
+from top_assist.web.admin.job import job_view
 from top_assist.web.admin.page_data import page_data_view
 from top_assist.web.admin.qa_interaction import qa_interaction_view
 from top_assist.web.admin.router import router as admin_router
@@ -93,6 +94,7 @@ def setup_admin_panel(app: FastAPI) -> None:
     admin.add_view(user_auth_view)
     admin.add_view(qa_interaction_view)
     admin.add_view(channel_view)
+    admin.add_view(job_view)
 
     link_views = []
 
@@ -0,0 +1,70 @@
+from collections.abc import Sequence
+
+from starlette.requests import Request
+from starlette_admin import BaseField, DateTimeField, IntegerField, JSONField, StringField
+from starlette_admin.contrib.sqla import ModelView
+
+import top_assist.database.import_runs as db_import_runs
+from top_assist.models import JobORM
+from top_assist.models.import_run import ImportRunPageStatus
+from top_assist.web.admin.mixins import ForbiddenActionsMixin
+from top_assist.worker.jobs import JobKind
+
+
+class ImportProgressField(StringField):
+    """Custom field to display the progress of the latest import run of the space imported by the job."""
+
+    async def parse_obj(self, _request: Request, obj: JobORM) -> str:
+        """Return number of processed pages out of all pages of the import run."""
+        if obj.kind != JobKind.import_space.value:
+            return ""
+
+        run = db_import_runs.find_latest(obj.payload["space_key"])
+        if not run:
+            return ""
+
+        pages_by_status = db_import_runs.count_pages_by_status(run)
+        done_count = pages_by_status.get(ImportRunPageStatus.embedded.value, 0) + pages_by_status.get(
+            ImportRunPageStatus.inaccessible.value, 0
+        )
+        return f"{done_count}/{sum(pages_by_status.values())} pages ({run.status})"
+
+
+class JobAdmin(ForbiddenActionsMixin, ModelView):
+    """Admin view for background jobs processed by the worker."""
+
+    page_size = 100
+
+    fields: Sequence[BaseField] = [
+        StringField("id"),
+        StringField("kind"),
+        JSONField("payload"),
+        StringField("status"),
+        ImportProgressField("import_progress", label="Progress"),
+        IntegerField("attempts"),
+        IntegerField("max_attempts"),
+        DateTimeField("created_at"),
+        DateTimeField("run_after"),
+        DateTimeField("started_at"),
+        DateTimeField("heartbeat_at"),
+        DateTimeField("finished_at"),
+        StringField("worker_id"),
+        StringField("error"),
+    ]
+
+    exclude_fields_from_list: Sequence[str] = ["heartbeat_at", "worker_id", "max_attempts"]
+
+    searchable_fields: Sequence[str] = ["kind", "status", "dedupe_key"]
+
+    sortable_fields: Sequence[str] = ["id", "kind", "status", "created_at", "finished_at"]
+
+    fields_default_sort: Sequence[tuple[str, bool]] = [("id", True)]
+
+
+job_view = JobAdmin(
+    JobORM,
+    label="Jobs",
+    name="Jobs",
+    identity="jobs",
+    icon="fa fa-gears",
+)
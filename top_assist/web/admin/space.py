@@ -2,7 +2,7 @@ from collections.abc import Sequence
 
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
-from starlette_admin import BaseField, DateTimeField, StringField, action, row_action
+from starlette_admin import BaseField, DateTimeField, IntegerField, StringField, action, row_action
 from starlette_admin.contrib.sqla import ModelView
 
 import top_assist.database.spaces as db_spaces
@@ -32,11 +32,22 @@ class SpaceAdmin(ForbiddenActionsMixin, ModelView):
         StringField("space_name"),
         PagesCounterField("pages_counter", label="Number of Pages"),
         DateTimeField("last_import_date"),
+        IntegerField("sync_interval_minutes", label="Sync interval (minutes)"),
+        DateTimeField("next_sync_at"),
+        IntegerField("last_sync_changed_pages", label="Pages changed in last sync"),
     ]
 
     searchable_fields: Sequence[str] = ["space_key", "space_name"]
 
-    sortable_fields: Sequence[str] = ["id", "space_key", "space_name", "page_count", "last_import_date"]
+    sortable_fields: Sequence[str] = [
+        "id",
+        "space_key",
+        "space_name",
+        "page_count",
+        "last_import_date",
+        "next_sync_at",
+        "last_sync_changed_pages",
+    ]
 
     row_actions: Sequence[str] = ["view", "delete_space"]
 
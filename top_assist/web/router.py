@@ -1,8 +1,11 @@
 import logging
+from typing import Annotated
 
-from fastapi import APIRouter, BackgroundTasks, Request, Response
+from fastapi import APIRouter, BackgroundTasks, Header, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from pydantic import ValidationError
 
 from top_assist.auth.sign_in_flow import (
     AlreadySignedIn,
@@ -13,8 +16,17 @@ from top_assist.auth.sign_in_flow import (
     process_confluence_oauth_callback,
     start_sign_in_flow,
 )
+from top_assist.confluence.webhooks import (
+    WebhookAction,
+    WebhookEvent,
+    is_duplicate,
+    is_valid_signature,
+    is_webhook_enabled,
+    mark_processed,
+)
 from top_assist.utils.metrics import TEST_METRIC
 from top_assist.utils.sentry_notifier import sentry_notify_exception, sentry_notify_issue
+from top_assist.worker.jobs import enqueue_refresh_page, enqueue_remove_page, enqueue_remove_space
 
 router = APIRouter()
 templates = Jinja2Templates(directory="top_assist/web/html_templates")
@@ -69,6 +81,44 @@ def confluence_oauth_callback(
     )
 
 
+@router.post("/confluence/webhook")
+async def confluence_webhook(
+    request: Request,
+    x_hub_signature: Annotated[str | None, Header()] = None,
+) -> dict[str, str]:
+    if not is_webhook_enabled():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    body = await request.body()
+    if not is_valid_signature(body, x_hub_signature):
+        logging.warning("Invalid Confluence webhook signature")
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    try:
+        event = WebhookEvent.model_validate_json(body)
+    except ValidationError:
+        logging.warning("Malformed Confluence webhook payload", extra={"body": body[:1000]})
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+
+    action = event.action
+    if action is None or is_duplicate(event):
+        logging.debug("Confluence webhook ignored", extra={"event": event.event, "dedupe_key": event.dedupe_key})
+        return {"status": "ignored"}
+
+    logging.info("Confluence webhook accepted", extra={"event": event.event, "dedupe_key": event.dedupe_key})
+    # The action is only set for events with a page, or a space for space events
+    match action:
+        case WebhookAction.refresh_page if event.page:
+            await run_in_threadpool(enqueue_refresh_page, space_key=event.page.space_key, page_id=event.page.id)
+        case WebhookAction.remove_page if event.page:
+            await run_in_threadpool(enqueue_remove_page, page_id=event.page.id)
+        case WebhookAction.remove_space if event.space:
+            await run_in_threadpool(enqueue_remove_space, space_key=event.space.key)
+
+    mark_processed(event)
+    return {"status": "accepted"}
+
+
 def _confluence_oauth_callback(
     background_tasks: BackgroundTasks, request: Request, state: str, code: str
 ) -> Response | None:
@@ -0,0 +1,3 @@
+from .runner import run_worker
+
+run_worker()
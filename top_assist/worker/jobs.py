@@ -0,0 +1,69 @@
+from collections.abc import Callable
+from enum import Enum
+
+import top_assist.database.jobs as db_jobs
+from top_assist.configuration import job_max_attempts
+from top_assist.knowledge_base.importer import (
+    import_confluence_space,
+    pull_updates,
+    refresh_page,
+    remove_page,
+    remove_space,
+)
+from top_assist.models.job import JobDTO
+
+
+class JobKind(str, Enum):
+    """Kinds of the jobs processed by the worker (`bin/worker`)."""
+
+    import_space = "import_space"
+    pull_updates = "pull_updates"
+    refresh_page = "refresh_page"
+    remove_page = "remove_page"
+    remove_space = "remove_space"
+
+
+_HANDLERS: dict[JobKind, Callable[..., None]] = {
+    JobKind.import_space: import_confluence_space,
+    JobKind.pull_updates: pull_updates,
+    JobKind.refresh_page: refresh_page,
+    JobKind.remove_page: remove_page,
+    JobKind.remove_space: remove_space,
+}
+
+
+def enqueue_import_space(*, space_key: str, space_name: str) -> None:
+    __enqueue(JobKind.import_space, {"space_key": space_key, "space_name": space_name}, dedupe_id=space_key)
+
+
+def enqueue_pull_updates(*, force: bool = False) -> None:
+    # A forced pull covers also the spaces not due for a sync, it is not deduplicated with the scheduled pulls
+    __enqueue(JobKind.pull_updates, {"force": force}, dedupe_id="all:forced" if force else "all")
+
+
+def enqueue_refresh_page(*, space_key: str, page_id: str) -> None:
+    __enqueue_page_job(JobKind.refresh_page, {"space_key": space_key, "page_id": page_id}, page_id=page_id)
+
+
+def enqueue_remove_page(*, page_id: str) -> None:
+    __enqueue_page_job(JobKind.remove_page, {"page_id": page_id}, page_id=page_id)
+
+
+def enqueue_remove_space(*, space_key: str) -> None:
+    __enqueue(JobKind.remove_space, {"space_key": space_key}, dedupe_id=space_key)
+
+
+def run_job(job: JobDTO) -> None:
+    _HANDLERS[JobKind(job.kind)](**job.payload)
+
+
+def __enqueue(kind: JobKind, payload: dict, *, dedupe_id: str) -> None:
+    db_jobs.enqueue(kind.value, payload, dedupe_key=f"{kind.value}:{dedupe_id}", max_attempts=job_max_attempts)
+
+
+def __enqueue_page_job(kind: JobKind, payload: dict, *, page_id: str) -> None:
+    # The refreshes and removals of a page share the key, so they never run at the same time
+    # and the queued job is replaced by the latest change of the page, e.g. a page trashed and restored
+    db_jobs.enqueue(
+        kind.value, payload, dedupe_key=f"page:{page_id}", max_attempts=job_max_attempts, replace_queued=True
+    )
@@ -0,0 +1,81 @@
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+
+import top_assist.database.jobs as db_jobs
+from top_assist.configuration import (
+    job_retry_backoff_seconds,
+    job_stale_seconds,
+    worker_concurrency,
+    worker_poll_seconds,
+)
+from top_assist.models.job import JobDTO
+from top_assist.utils.metrics import JOB_LATENCY_HISTOGRAM_METRIC, start_metrics_server
+from top_assist.utils.sentry_notifier import sentry_notify_exception
+from top_assist.utils.tracer import ServiceNames, tracer
+
+from .jobs import run_job
+
+
+def run_worker(concurrency: int = worker_concurrency) -> None:
+    """Process queued jobs until SIGTERM/SIGINT, then wait for the running ones to finish.
+
+    Running jobs are kept alive with heartbeats, jobs of workers which were killed are queued again.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: stop.set())
+    signal.signal(signal.SIGINT, lambda _signum, _frame: stop.set())
+
+    start_metrics_server(multiprocess=True)
+    logging.info("Worker started", extra={"worker_id": worker_id, "concurrency": concurrency})
+
+    running: dict[int, Future] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        while not stop.is_set():
+            running = __keep_running_alive(running)
+            db_jobs.requeue_stale(timedelta(seconds=job_stale_seconds))
+
+            while len(running) < concurrency and (job := db_jobs.claim_next(worker_id)):
+                running[job.id] = executor.submit(__run_job, job)
+
+            stop.wait(worker_poll_seconds)
+
+        logging.info("Worker stopping", extra={"worker_id": worker_id, "running_jobs": list(running)})
+        while running := __keep_running_alive(running):
+            time.sleep(worker_poll_seconds)
+
+    logging.info("Worker stopped", extra={"worker_id": worker_id})
+
+
+def __keep_running_alive(running: dict[int, Future]) -> dict[int, Future]:
+    running = {job_id: future for job_id, future in running.items() if not future.done()}
+    db_jobs.heartbeat(list(running))
+    return running
+
+
+def __run_job(job: JobDTO) -> None:
+    log_extra = {"job_id": job.id, "kind": job.kind, "attempt": job.attempts}
+    start_time = time.monotonic()
+    with tracer.trace("worker.run_job", service=ServiceNames.worker.value, resource=job.kind):
+        try:
+            logging.info("Job started", extra=log_extra)
+            run_job(job)
+        except Exception as e:
+            status = "failure"
+            logging.exception("Job failed", extra=log_extra)
+            sentry_notify_exception(e, extra=log_extra)
+            retry_after = timedelta(seconds=job_retry_backoff_seconds * 2 ** (job.attempts - 1))
+            db_jobs.fail_attempt(job, str(e), retry_after=retry_after)
+        else:
+            status = "success"
+            db_jobs.succeed(job)
+        finally:
+            duration = time.monotonic() - start_time
+            logging.info("Job finished", extra={**log_extra, "status": status, "duration_seconds": duration})
+            JOB_LATENCY_HISTOGRAM_METRIC.labels(kind=job.kind, status=status).observe(duration)